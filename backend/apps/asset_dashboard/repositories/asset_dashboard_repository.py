@@ -6,11 +6,12 @@ from datetime import date
 from decimal import Decimal
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import Sum
+from django.db.models import Q
 
 from apps.core.constants import get_expense_filter, get_income_filter, get_investment_filter
 from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
 from apps.transaction.models import Transaction
+from apps.transaction.services.monthly_rollup import aggregate_amounts, aggregate_buckets
 
 
 class AssetDashboardRepository:
@@ -33,16 +34,7 @@ class AssetDashboardRepository:
 
     def get_income_sum_by_date_range(self, user, start_date: date, end_date: date) -> Decimal:
         """Get sum of income for a date range (based on category.type='income')."""
-        result = (
-            Transaction.objects.filter(
-                user=user,
-                date__gte=start_date,
-                date__lte=end_date,
-            )
-            .filter(self._get_income_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        return self._sum_by_date_range(user, start_date, end_date, self._get_income_filter())
 
     # Expense queries (based on category.is_expense or debit transactions)
     def get_earliest_expense_date(self, user) -> date | None:
@@ -52,29 +44,31 @@ class AssetDashboardRepository:
 
     def get_expense_sum_by_date_range(self, user, start_date: date, end_date: date) -> Decimal:
         """Get sum of expenses for a date range (based on category.type='expense')."""
-        result = (
-            Transaction.objects.filter(
-                user=user,
-                date__gte=start_date,
-                date__lte=end_date,
-            )
-            .filter(self._get_expense_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        return self._sum_by_date_range(user, start_date, end_date, self._get_expense_filter())
 
     def get_investment_sum_by_date_range(self, user, start_date: date, end_date: date) -> Decimal:
         """Get sum of investment transactions for a date range."""
-        result = (
-            Transaction.objects.filter(
-                user=user,
-                date__gte=start_date,
-                date__lte=end_date,
-            )
-            .filter(self._get_investment_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        return self._sum_by_date_range(user, start_date, end_date, self._get_investment_filter())
+
+    def _sum_by_date_range(self, user, start_date: date, end_date: date, filter_q) -> Decimal:
+        """Sum matching amounts, reading whole months from the monthly rollup table."""
+        total, _ = aggregate_amounts(Q(user=user), start_date, end_date, filter_q)[()]
+        return total
+
+    def get_monthly_cash_flow(self, user, start_date: date, end_date: date) -> dict[date, dict[str, Decimal]]:
+        """Get income, expense and investment totals per month from the monthly rollup table.
+
+        Returns:
+            Dict keyed by first day of month, each with "income", "expense" and
+            "investment" totals. Months without transactions are omitted.
+        """
+        buckets = {
+            "income": self._get_income_filter(),
+            "expense": self._get_expense_filter(),
+            "investment": self._get_investment_filter(),
+        }
+        rows = aggregate_buckets(Q(user=user), start_date, end_date, buckets, group_by=("month",))
+        return {month: totals for (month,), totals in sorted(rows.items())}
 
     # Account queries
     def get_user_accounts(self, user):
@@ -4,7 +4,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import Sum
+from django.db.models import Q
 
 
 class AssetDashboardService:
@@ -147,31 +147,20 @@ class AssetDashboardService:
         end_date = date.today()
         start_date = end_date - relativedelta(months=6)
 
-        labels = []
+        labels, income_data, expense_data, _ = self._calculate_monthly_cash_flow(user, start_date, end_date)
+
         total_savings = []
         monthly_savings = []
         running_total = 0
 
-        current_date = start_date.replace(day=1)
-
-        while current_date <= end_date:
-            labels.append(current_date.strftime("%b"))
-
-            month_end = current_date + relativedelta(months=1) - timedelta(days=1)
-
-            # Get monthly income and expenses
-            monthly_income = self.repo.get_income_sum_by_date_range(user, current_date, month_end)
-            monthly_expense = self.repo.get_expense_sum_by_date_range(user, current_date, month_end)
-
+        for monthly_income, monthly_expense in zip(income_data, expense_data, strict=True):
             # Business rule: Savings = Income - Expenses
-            monthly_saving = float(monthly_income - monthly_expense)
+            monthly_saving = monthly_income - monthly_expense
             running_total += monthly_saving
 
             monthly_savings.append(monthly_saving)
             total_savings.append(running_total)
 
-            current_date += relativedelta(months=1)
-
         return {
             "labels": labels,
             "datasets": [
@@ -273,7 +262,7 @@ class AssetDashboardService:
         """Aggregate dashboard metrics across multiple household members' shared accounts."""
         from apps.core.constants import get_expense_filter, get_income_filter, get_investment_filter
         from apps.financial_account.models import FinancialAccount
-        from apps.transaction.models import Transaction
+        from apps.transaction.services.monthly_rollup import aggregate_buckets
 
         shared_accounts = FinancialAccount.objects.filter(
             user_id__in=user_ids,
@@ -288,15 +277,15 @@ class AssetDashboardService:
         start_date, end_date = self._resolve_date_range(period)
         shared_account_ids = list(shared_accounts.values_list("id", flat=True))
 
-        base_qs = Transaction.objects.filter(
-            account_id__in=shared_account_ids,
-            date__gte=start_date,
-            date__lte=end_date,
-        )
-
-        income = (base_qs.filter(get_income_filter()).aggregate(total=Sum("amount"))["total"]) or Decimal("0")
-        expenses = (base_qs.filter(get_expense_filter()).aggregate(total=Sum("amount"))["total"]) or Decimal("0")
-        investments = (base_qs.filter(get_investment_filter()).aggregate(total=Sum("amount"))["total"]) or Decimal("0")
+        buckets = {
+            "income": get_income_filter(),
+            "expense": get_expense_filter(),
+            "investment": get_investment_filter(),
+        }
+        totals = aggregate_buckets(Q(account_id__in=shared_account_ids), start_date, end_date, buckets).get((), {})
+        income = totals.get("income", Decimal("0"))
+        expenses = totals.get("expense", Decimal("0"))
+        investments = totals.get("investment", Decimal("0"))
 
         cashflow = self._compute_cashflow_metrics(income, expenses, investments)
 
@@ -343,7 +332,8 @@ class AssetDashboardService:
         """
         Calculate monthly income, expenses, and net cash flow.
 
-        Business logic: Iterates through months and aggregates data.
+        Business logic: Fetches all monthly totals in one grouped query, then
+        fills in every month of the range (months without data are zero).
 
         Returns:
             Tuple of (labels, income_data, expense_data, net_cash_flow)
@@ -353,25 +343,23 @@ class AssetDashboardService:
         expense_data = []
         net_cash_flow = []
 
-        current_date = start_date.replace(day=1)
-        month_count = 0
-
-        while current_date <= end_date:
-            labels.append(current_date.strftime("%b"))
+        month_start = start_date.replace(day=1)
+        last_month_end = end_date.replace(day=1) + relativedelta(months=1) - timedelta(days=1)
+        monthly_totals = self.repo.get_monthly_cash_flow(user, month_start, last_month_end)
+        zero = {"income": Decimal("0"), "expense": Decimal("0")}
 
-            month_start = start_date.replace(day=1) + relativedelta(months=month_count)
-            month_end = month_start + relativedelta(months=1) - timedelta(days=1)
+        while month_start <= end_date:
+            labels.append(month_start.strftime("%b"))
 
-            # Get monthly totals via repository
-            monthly_income = self.repo.get_income_sum_by_date_range(user, month_start, month_end)
-            monthly_expense = self.repo.get_expense_sum_by_date_range(user, month_start, month_end)
+            totals = monthly_totals.get(month_start, zero)
+            monthly_income = totals["income"]
+            monthly_expense = totals["expense"]
 
             income_data.append(float(monthly_income))
             expense_data.append(float(monthly_expense))
             net_cash_flow.append(float(monthly_income - monthly_expense))
 
-            current_date += relativedelta(months=1)
-            month_count += 1
+            month_start += relativedelta(months=1)
 
         return labels, income_data, expense_data, net_cash_flow
 
@@ -36,8 +36,7 @@ class TestAssetDashboardService:
     def test_get_cash_flow_data_6m(self, service, mock_repo, mock_user):
         """Test cash flow data generation for 6 months."""
         # Setup
-        mock_repo.get_income_sum_by_date_range.return_value = Decimal("1000.00")
-        mock_repo.get_expense_sum_by_date_range.return_value = Decimal("600.00")
+        mock_repo.get_monthly_cash_flow.return_value = {}
 
         # Execute
         result = service.get_cash_flow_data(mock_user, period="6m")
@@ -50,8 +49,7 @@ class TestAssetDashboardService:
     def test_get_income_expenses_data(self, service, mock_repo, mock_user):
         """Test income vs expenses data generation."""
         # Setup
-        mock_repo.get_income_sum_by_date_range.return_value = Decimal("1000.00")
-        mock_repo.get_expense_sum_by_date_range.return_value = Decimal("600.00")
+        mock_repo.get_monthly_cash_flow.return_value = {}
 
         # Execute
         result = service.get_income_expenses_data(mock_user)
@@ -64,8 +62,7 @@ class TestAssetDashboardService:
     def test_get_savings_data(self, service, mock_repo, mock_user):
         """Test savings data generation."""
         # Setup
-        mock_repo.get_income_sum_by_date_range.return_value = Decimal("1000.00")
-        mock_repo.get_expense_sum_by_date_range.return_value = Decimal("600.00")
+        mock_repo.get_monthly_cash_flow.return_value = {}
 
         # Execute
         result = service.get_savings_data(mock_user)
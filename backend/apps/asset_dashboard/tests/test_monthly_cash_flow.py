@@ -0,0 +1,125 @@
+"""Integration tests for the grouped monthly cash-flow query."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from apps.asset_dashboard.repositories.asset_dashboard_repository import (
+    AssetDashboardRepository,
+)
+from apps.asset_dashboard.services.asset_dashboard_service import (
+    AssetDashboardService,
+)
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="cftest", email="cf@test.com", password="testpass123")
+
+
+@pytest.fixture
+def repo():
+    return AssetDashboardRepository()
+
+
+@pytest.fixture
+def service(repo):
+    return AssetDashboardService(repo)
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Checking",
+        account_type="checking",
+        balance=Decimal("10000.00"),
+    )
+
+
+@pytest.fixture
+def categories(user):
+    return {
+        "income": TransactionCategory.objects.create(user=user, name="CF Salary", slug="cf-salary", type="income"),
+        "expense": TransactionCategory.objects.create(user=user, name="CF Food", slug="cf-food", type="expense"),
+        "investment": TransactionCategory.objects.create(
+            user=user, name="CF Brokerage", slug="cf-brokerage", type="investment"
+        ),
+        "cc_payment": TransactionCategory.objects.get(user=user, slug="credit-card-payment"),
+    }
+
+
+def _txn(user, account, category, amount, txn_date, transaction_type="debit"):
+    return Transaction.objects.create(
+        user=user,
+        account=account,
+        category=category,
+        amount=Decimal(amount),
+        date=txn_date,
+        description=f"Test {amount}",
+        transaction_type=transaction_type,
+        sync_source="manual",
+    )
+
+
+def _seed_months(user, account, categories, months: int) -> date:
+    """Create a spread of income/expense/investment rows over the last N months; return the first month."""
+    first_month = date.today().replace(day=1) - relativedelta(months=months - 1)
+    for offset in range(months):
+        month = first_month + relativedelta(months=offset)
+        _txn(user, account, categories["income"], "3000.00", month, "credit")
+        _txn(user, account, categories["expense"], "120.50", month + relativedelta(days=3))
+        _txn(user, account, categories["cc_payment"], "500.00", month + relativedelta(days=7))  # excluded
+        _txn(user, account, categories["investment"], "200.00", month + relativedelta(days=8))
+    return first_month
+
+
+class TestGetMonthlyCashFlow:
+    def test_matches_per_month_range_sums(self, repo, user, account, categories):
+        first_month = _seed_months(user, account, categories, 4)
+        end = date.today()
+
+        monthly = repo.get_monthly_cash_flow(user, first_month, end)
+
+        assert len(monthly) == 4
+        for month, totals in monthly.items():
+            month_end = month + relativedelta(months=1, days=-1)
+            assert totals["income"] == repo.get_income_sum_by_date_range(user, month, month_end)
+            assert totals["expense"] == repo.get_expense_sum_by_date_range(user, month, month_end)
+            assert totals["investment"] == repo.get_investment_sum_by_date_range(user, month, month_end)
+            assert totals == {
+                "income": Decimal("3000.00"),
+                "expense": Decimal("120.50"),
+                "investment": Decimal("200.00"),
+            }
+
+    def test_empty_range(self, repo, user):
+        assert repo.get_monthly_cash_flow(user, date(2020, 1, 1), date(2020, 12, 31)) == {}
+
+
+class TestMonthlyChartsQueryCount:
+    def test_cash_flow_query_count_is_constant(self, service, user, account, categories, django_assert_num_queries):
+        _seed_months(user, account, categories, 24)
+
+        # "all": earliest income + earliest expense + one grouped query, regardless of history length.
+        with django_assert_num_queries(3):
+            result = service.get_cash_flow_data(user, period="all")
+
+        assert len(result["labels"]) == 24
+        assert result["datasets"][1]["data"] == [3000.0] * 24
+        assert result["datasets"][2]["data"] == [120.5] * 24
+
+    def test_savings_data_uses_one_query(self, service, user, account, categories, django_assert_num_queries):
+        _seed_months(user, account, categories, 7)
+
+        with django_assert_num_queries(1):
+            result = service.get_savings_data(user)
+
+        monthly = result["datasets"][1]["data"]
+        assert monthly == [2879.5] * len(monthly)
+        assert result["datasets"][0]["data"][-1] == pytest.approx(2879.5 * len(monthly))
@@ -13,6 +13,7 @@ from django.db.models import Count, Sum
 from django.http import JsonResponse
 from loguru import logger
 
+from apps.core.services.dashboard_cache import cached_dashboard_response
 from apps.transaction.models import Transaction
 
 from .repositories import AssetDashboardRepository
@@ -20,6 +21,7 @@ from .services import AssetDashboardService
 
 
 @login_required
+@cached_dashboard_response("cash_flow_data")
 def cash_flow_data(request):
     """Get cash flow data - delegates to service layer."""
     try:
@@ -85,6 +87,7 @@ def savings_data(request):
 
 
 @login_required
+@cached_dashboard_response("dashboard_metrics")
 def dashboard_metrics(request):
     """Get dashboard metrics - delegates to service layer."""
     try:
@@ -108,6 +111,7 @@ def dashboard_metrics(request):
 
 
 @login_required
+@cached_dashboard_response("networth_history")
 def networth_history(request):
     """Get net worth history over time - delegates to service layer."""
     try:
@@ -202,6 +206,7 @@ def top_categories_data(request):
 
 
 @login_required
+@cached_dashboard_response("sankey_data")
 def sankey_data(request):
     """
     Get Sankey diagram data - uses Transaction model for cash flow visualization.
@@ -3,10 +3,10 @@
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Count, Sum
 from loguru import logger
 
 from apps.budget.models import Budget, BudgetCategory, BudgetProgress
+from apps.budget.services.category_spending import CategorySpending, load_category_spending
 from apps.transaction.repositories.transaction_repository import TransactionRepository
 
 
@@ -30,8 +30,15 @@ class BudgetCalculationService:
         total_allocated = Decimal("0")
         total_spent = Decimal("0")
 
-        for budget_category in budget.budget_categories.select_related("category"):
-            progress = self.calculate_category_progress(budget_category, budget.start_date, budget.end_date)
+        budget_categories = list(budget.budget_categories.select_related("category"))
+        spending = self._load_spending(
+            budget.user, [bc.category_id for bc in budget_categories], budget.start_date, budget.end_date
+        )
+
+        for budget_category in budget_categories:
+            progress = self.calculate_category_progress(
+                budget_category, budget.start_date, budget.end_date, spending=spending
+            )
             categories_progress.append(progress)
             total_allocated += budget_category.total_available
             total_spent += progress["spent_amount"]
@@ -53,7 +60,19 @@ class BudgetCalculationService:
             "categories": categories_progress,
         }
 
-    def calculate_category_progress(self, budget_category: BudgetCategory, start_date: date, end_date: date) -> dict:
+    def _load_spending(self, user, category_ids: list[int], start_date: date, end_date: date) -> CategorySpending:
+        """Debit spending for all given categories in one grouped query."""
+        return load_category_spending(
+            self.transaction_repository.get_by_user(user=user), category_ids, start_date, end_date
+        )
+
+    def calculate_category_progress(
+        self,
+        budget_category: BudgetCategory,
+        start_date: date,
+        end_date: date,
+        spending: CategorySpending | None = None,
+    ) -> dict:
         """
         Calculate progress for a specific budget category.
 
@@ -61,22 +80,19 @@ class BudgetCalculationService:
             budget_category: BudgetCategory to calculate for
             start_date: Period start date
             end_date: Period end date
+            spending: Preloaded spending covering this category and period (loaded if omitted)
 
         Returns:
             Dict with category progress data
         """
-        # Get all debit transactions for this category in the period
-        transactions = self.transaction_repository.get_by_user(
-            user=budget_category.budget.user,
-            start_date=start_date,
-            end_date=end_date,
-            category=budget_category.category,
-            transaction_type="debit",  # Only count expenses
-        )
+        if spending is None:
+            spending = self._load_spending(
+                budget_category.budget.user, [budget_category.category_id], start_date, end_date
+            )
 
-        agg = transactions.aggregate(spent=Sum("amount"), transaction_count=Count("id"))
-        spent_amount = agg["spent"] or Decimal("0")
-        transaction_count = agg["transaction_count"]
+        # Only debit transactions count as spending
+        spent_amount = spending.spent(budget_category.category_id, start_date, end_date)
+        transaction_count = spending.count(budget_category.category_id, start_date, end_date)
 
         # Calculate remaining and percentage
         total_available = budget_category.total_available
@@ -113,7 +129,11 @@ class BudgetCalculationService:
             return "on_track"
 
     def update_cached_progress(
-        self, budget_category: BudgetCategory, start_date: date, end_date: date
+        self,
+        budget_category: BudgetCategory,
+        start_date: date,
+        end_date: date,
+        spending: CategorySpending | None = None,
     ) -> BudgetProgress:
         """
         Update cached progress for a budget category.
@@ -122,11 +142,12 @@ class BudgetCalculationService:
             budget_category: BudgetCategory to update
             start_date: Period start
             end_date: Period end
+            spending: Preloaded spending covering this category and period (loaded if omitted)
 
         Returns:
             Updated BudgetProgress instance
         """
-        progress_data = self.calculate_category_progress(budget_category, start_date, end_date)
+        progress_data = self.calculate_category_progress(budget_category, start_date, end_date, spending=spending)
 
         progress, created = BudgetProgress.objects.update_or_create(
             budget_category=budget_category,
@@ -159,8 +180,15 @@ class BudgetCalculationService:
         """
         progress_list = []
 
-        for budget_category in budget.budget_categories.all():
-            progress = self.update_cached_progress(budget_category, budget.start_date, budget.end_date)
+        budget_categories = list(budget.budget_categories.select_related("category"))
+        spending = self._load_spending(
+            budget.user, [bc.category_id for bc in budget_categories], budget.start_date, budget.end_date
+        )
+
+        for budget_category in budget_categories:
+            progress = self.update_cached_progress(
+                budget_category, budget.start_date, budget.end_date, spending=spending
+            )
             progress_list.append(progress)
 
         logger.info(f"Updated cached progress for {len(progress_list)} categories")
@@ -0,0 +1,79 @@
+"""Batched per-category spending lookups for budget progress.
+
+Budget progress used to run one aggregate query per budget category (and, for
+multi-month views, per month). ``load_category_spending`` instead fetches debit
+totals for every requested category in one query grouped by
+``(category_id, month)``; callers then read any category/period from the
+returned ``CategorySpending`` in memory.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, QuerySet, Sum
+from django.db.models.functions import TruncMonth
+
+
+@dataclass
+class CategorySpending:
+    """Debit totals and counts keyed by (category_id, first day of month).
+
+    Rows were filtered to the loaded date range, so lookups are exact for
+    that range and for any whole months inside it.
+    """
+
+    buckets: dict[tuple[int, date], tuple[Decimal, int]] = field(default_factory=dict)
+
+    def _rows(self, category_id: int, start_date: date, end_date: date):
+        first_month = start_date.replace(day=1)
+        for (bucket_category_id, month), row in self.buckets.items():
+            if bucket_category_id == category_id and first_month <= month <= end_date:
+                yield row
+
+    def spent(self, category_id: int, start_date: date, end_date: date) -> Decimal:
+        """Total debits for a category in the months overlapping start_date..end_date."""
+        return sum((spent for spent, _ in self._rows(category_id, start_date, end_date)), Decimal("0"))
+
+    def count(self, category_id: int, start_date: date, end_date: date) -> int:
+        """Number of debit transactions for a category in the months overlapping start_date..end_date."""
+        return sum(count for _, count in self._rows(category_id, start_date, end_date))
+
+
+def load_category_spending(
+    transactions: QuerySet, category_ids: Iterable[int], start_date: date, end_date: date
+) -> CategorySpending:
+    """
+    Load debit spending for many categories in a single grouped query.
+
+    Args:
+        transactions: Transaction queryset already scoped to the user or household
+        category_ids: Categories to include
+        start_date: Range start (inclusive)
+        end_date: Range end (inclusive)
+
+    Returns:
+        CategorySpending for the requested categories and range
+    """
+    category_ids = set(category_ids)
+    if not category_ids:
+        return CategorySpending()
+
+    rows = (
+        transactions.filter(
+            category_id__in=category_ids,
+            date__gte=start_date,
+            date__lte=end_date,
+            transaction_type="debit",
+        )
+        .annotate(month=TruncMonth("date"))
+        .values("category_id", "month")
+        .annotate(spent=Sum("amount"), transaction_count=Count("id"))
+        .order_by()
+    )
+    return CategorySpending(
+        {(row["category_id"], row["month"]): (row["spent"], row["transaction_count"]) for row in rows}
+    )
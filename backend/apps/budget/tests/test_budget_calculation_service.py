@@ -8,6 +8,7 @@ import pytest
 from apps.budget.models import BudgetCategory, BudgetProgress
 from apps.budget.services.budget_calculation_service import BudgetCalculationService
 from apps.budget.tests.conftest import create_transaction
+from apps.transaction.models import TransactionCategory
 
 
 @pytest.fixture
@@ -143,6 +144,23 @@ class TestCalculateBudgetProgress:
         assert result["totals"]["allocated"] == Decimal("500.00")
         assert result["totals"]["percentage_used"] == Decimal("50.0")
 
+    def test_query_count_independent_of_category_count(
+        self, calc_service, user, account, budget, django_assert_num_queries
+    ):
+        for i in range(6):
+            category = TransactionCategory.objects.create(
+                user=user, name=f"Batch {i}", slug=f"batch-{i}-budget", type="expense"
+            )
+            BudgetCategory.objects.create(budget=budget, category=category, allocated_amount=Decimal("100.00"))
+            create_transaction(user, account, category, Decimal("10.00") * (i + 1), date(2024, 1, 10))
+
+        # Budget categories + one grouped spending query.
+        with django_assert_num_queries(2):
+            result = calc_service.calculate_budget_progress(budget)
+
+        assert [c["spent_amount"] for c in result["categories"]] == [Decimal("10.00") * (i + 1) for i in range(6)]
+        assert all(c["transaction_count"] == 1 for c in result["categories"])
+
     def test_empty_budget_returns_zero_totals(self, calc_service, budget):
         result = calc_service.calculate_budget_progress(budget)
         assert result["totals"]["allocated"] == Decimal("0")
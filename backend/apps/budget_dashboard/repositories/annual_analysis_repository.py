@@ -3,14 +3,21 @@
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Q, Sum
+from django.db.models import Q
 
 from apps.core.constants import get_expense_filter, get_income_filter
-from apps.transaction.models import Transaction
+from apps.transaction.models import TransactionMonthlyRollup
+from apps.transaction.services.monthly_rollup import aggregate_amounts, aggregate_buckets
+
+NON_ESSENTIAL_FILTER = Q(category__expense_priority="non_essential") | Q(category__expense_priority__isnull=True)
 
 
 class AnnualAnalysisRepository:
-    """Repository for Annual Analysis aggregation queries - ORM layer only."""
+    """Repository for Annual Analysis aggregation queries - ORM layer only.
+
+    Totals are read through the monthly rollup table; see
+    apps.transaction.services.monthly_rollup.
+    """
 
     def _get_expense_filter(self):
         return get_expense_filter()
@@ -18,43 +25,30 @@ class AnnualAnalysisRepository:
     def _get_income_filter(self):
         return get_income_filter()
 
-    def _tx_base(self, user, user_ids: list[int] | None = None):
-        """Return base Transaction queryset scoped to user or household shared accounts."""
+    def _scope(self, user, user_ids: list[int] | None = None) -> Q:
+        """Return the ownership filter for the user or the household's shared accounts."""
         if user_ids and len(user_ids) > 1:
-            return Transaction.objects.filter(user_id__in=user_ids, account__shared_with_household=True)
-        return Transaction.objects.filter(user=user)
+            return Q(user_id__in=user_ids, account__shared_with_household=True)
+        return Q(user=user)
+
+    def _sum(self, user, start_date: date, end_date: date, filter_q: Q, user_ids: list[int] | None) -> Decimal:
+        total, _ = aggregate_amounts(self._scope(user, user_ids), start_date, end_date, filter_q)[()]
+        return total
 
     def get_expense_sum(self, user, start_date: date, end_date: date, user_ids: list[int] | None = None) -> Decimal:
         """Get sum of all expenses for a date range."""
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        return self._sum(user, start_date, end_date, self._get_expense_filter(), user_ids)
 
     def get_income_sum(self, user, start_date: date, end_date: date, user_ids: list[int] | None = None) -> Decimal:
         """Get sum of all income for a date range."""
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_income_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        return self._sum(user, start_date, end_date, self._get_income_filter(), user_ids)
 
     def get_essential_expense_sum(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
     ) -> Decimal:
         """Get sum of essential expenses for a date range."""
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date, category__expense_priority="essential")
-            .filter(self._get_expense_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        filter_q = self._get_expense_filter() & Q(category__expense_priority="essential")
+        return self._sum(user, start_date, end_date, filter_q, user_ids)
 
     def get_non_essential_expense_sum(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
@@ -63,67 +57,72 @@ class AnnualAnalysisRepository:
 
         Includes expenses where expense_priority is 'non_essential' or null.
         """
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .filter(Q(category__expense_priority="non_essential") | Q(category__expense_priority__isnull=True))
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        filter_q = self._get_expense_filter() & NON_ESSENTIAL_FILTER
+        return self._sum(user, start_date, end_date, filter_q, user_ids)
+
+    def get_monthly_expense_priority_sums(
+        self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
+    ) -> dict[date, dict[str, Decimal]]:
+        """Get essential and non-essential expense totals per month in a single grouped query.
+
+        Returns:
+            Dict keyed by first day of month with "essential" and "non_essential"
+            totals. Months without expenses are omitted.
+        """
+        expense_filter = self._get_expense_filter()
+        buckets = {
+            "essential": expense_filter & Q(category__expense_priority="essential"),
+            "non_essential": expense_filter & NON_ESSENTIAL_FILTER,
+        }
+        rows = aggregate_buckets(self._scope(user, user_ids), start_date, end_date, buckets, group_by=("month",))
+        return {
+            month: totals for (month,), totals in sorted(rows.items()) if totals["essential"] or totals["non_essential"]
+        }
 
     def get_expenses_by_category_with_priority(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
     ) -> list[dict]:
         """Get expenses grouped by category with essential/non-essential flag."""
-        queryset = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .values(
-                "category__name",
-                "category__expense_priority",
-                "category__color",
-                "category__icon",
-            )
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
+        fields = ("category__name", "category__expense_priority", "category__color", "category__icon")
+        rows = aggregate_amounts(
+            self._scope(user, user_ids), start_date, end_date, self._get_expense_filter(), group_by=fields
         )
 
         return [
             {
-                "name": item["category__name"] or "Uncategorized",
-                "amount": float(item["total"]),
-                "is_essential": item["category__expense_priority"] == "essential",
-                "color": item["category__color"] or "#6b7280",
-                "icon": item["category__icon"] or "",
+                "name": name or "Uncategorized",
+                "amount": float(total),
+                "is_essential": priority == "essential",
+                "color": color or "#6b7280",
+                "icon": icon or "",
             }
-            for item in queryset
+            for (name, priority, color, icon), (total, _) in sorted(rows.items(), key=lambda item: -item[1][0])
         ]
 
     def get_income_by_category(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
     ) -> list[dict]:
         """Get income grouped by category."""
-        queryset = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_income_filter())
-            .values("category__name", "category__color")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
+        rows = aggregate_amounts(
+            self._scope(user, user_ids),
+            start_date,
+            end_date,
+            self._get_income_filter(),
+            group_by=("category__name", "category__color"),
         )
 
         return [
             {
-                "name": item["category__name"] or "Other Income",
-                "amount": float(item["total"]),
-                "color": item["category__color"] or "#22c55e",
+                "name": name or "Other Income",
+                "amount": float(total),
+                "color": color or "#22c55e",
             }
-            for item in queryset
+            for (name, color), (total, _) in sorted(rows.items(), key=lambda item: -item[1][0])
         ]
 
     def get_transaction_years(self, user, user_ids: list[int] | None = None) -> list[int]:
         """Get list of years where user has transactions."""
-        date_list = self._tx_base(user, user_ids).dates("date", "year", order="DESC")
+        date_list = TransactionMonthlyRollup.objects.filter(self._scope(user, user_ids)).dates(
+            "month", "year", order="DESC"
+        )
         return [d.year for d in date_list]
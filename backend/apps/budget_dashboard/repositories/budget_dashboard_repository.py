@@ -3,11 +3,13 @@
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Sum
+from django.db.models import Q
 
 from apps.budget.models import Budget
+from apps.budget.services.category_spending import CategorySpending
 from apps.core.constants import get_expense_filter
-from apps.transaction.models import Transaction
+from apps.transaction.models import TransactionMonthlyRollup
+from apps.transaction.services.monthly_rollup import aggregate_amounts
 
 
 class BudgetDashboardRepository:
@@ -16,56 +18,69 @@ class BudgetDashboardRepository:
     def _get_expense_filter(self):
         return get_expense_filter()
 
-    def _tx_base(self, user, user_ids: list[int] | None = None):
-        """Return base Transaction queryset scoped to user or household shared accounts."""
+    def _scope(self, user, user_ids: list[int] | None = None) -> Q:
+        """Return the ownership filter for the user or the household's shared accounts."""
         if user_ids and len(user_ids) > 1:
-            return Transaction.objects.filter(user_id__in=user_ids, account__shared_with_household=True)
-        return Transaction.objects.filter(user=user)
+            return Q(user_id__in=user_ids, account__shared_with_household=True)
+        return Q(user=user)
 
-    # Expense queries (based on category.type='expense' or debit transactions)
+    # Expense queries (based on category.type='expense' or debit transactions), read via the monthly rollup
     def get_expense_sum_by_date_range(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
     ) -> Decimal:
         """Get sum of expenses for a date range (based on category.type='expense')."""
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        total, _ = aggregate_amounts(self._scope(user, user_ids), start_date, end_date, self._get_expense_filter())[()]
+        return total
 
     def get_expenses_by_category(
         self, user, start_date: date, end_date: date, limit: int | None = None, user_ids: list[int] | None = None
-    ):
-        """Get expenses grouped by category for a date range."""
-        qs = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .values("category__name")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
+    ) -> list[dict]:
+        """Get expenses grouped by category for a date range, largest first."""
+        rows = aggregate_amounts(
+            self._scope(user, user_ids),
+            start_date,
+            end_date,
+            self._get_expense_filter(),
+            group_by=("category__name",),
         )
-        if limit:
-            qs = qs[:limit]
-        return qs
+        expenses = [
+            {"category__name": name, "total": total}
+            for (name,), (total, _) in sorted(rows.items(), key=lambda item: -item[1][0])
+        ]
+        return expenses[:limit] if limit else expenses
 
     def get_category_expense_sum(
         self, user, category, start_date: date, end_date: date, user_ids: list[int] | None = None
     ) -> Decimal:
         """Get sum of debit expenses for a specific category and date range."""
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(
-                category=category,
-                date__gte=start_date,
-                date__lte=end_date,
-                transaction_type="debit",
-            )
-            .aggregate(total=Sum("amount"))
+        total, _ = aggregate_amounts(
+            self._scope(user, user_ids),
+            start_date,
+            end_date,
+            Q(category=category, transaction_type="debit"),
+        )[()]
+        return total
+
+    def get_category_spending(
+        self,
+        user,
+        category_ids: list[int],
+        start_date: date,
+        end_date: date,
+        user_ids: list[int] | None = None,
+    ) -> CategorySpending:
+        """Get debit spending for many categories, grouped by (category, month)."""
+        category_ids = set(category_ids)
+        if not category_ids:
+            return CategorySpending()
+        rows = aggregate_amounts(
+            self._scope(user, user_ids),
+            start_date,
+            end_date,
+            Q(category_id__in=category_ids, transaction_type="debit"),
+            group_by=("category_id", "month"),
         )
-        return result["total"] or Decimal("0")
+        return CategorySpending(rows)
 
     def get_nonessential_expense_sum(
         self, user, start_date: date, end_date: date, user_ids: list[int] | None = None
@@ -75,17 +90,16 @@ class BudgetDashboardRepository:
         Filters by category.type='expense' for categorized transactions
         or falls back to debit transactions for uncategorized.
         """
-        result = (
-            self._tx_base(user, user_ids)
-            .filter(date__gte=start_date, date__lte=end_date)
-            .filter(self._get_expense_filter())
-            .aggregate(total=Sum("amount"))
-        )
-        return result["total"] or Decimal("0")
+        total, _ = aggregate_amounts(self._scope(user, user_ids), start_date, end_date, self._get_expense_filter())[()]
+        return total
 
     def get_expense_years(self, user, user_ids: list[int] | None = None) -> list[int]:
         """Get list of years where user has expenses."""
-        date_list = self._tx_base(user, user_ids).filter(self._get_expense_filter()).dates("date", "year", order="DESC")
+        date_list = (
+            TransactionMonthlyRollup.objects.filter(self._scope(user, user_ids))
+            .filter(self._get_expense_filter())
+            .dates("month", "year", order="DESC")
+        )
         return [d.year for d in date_list]
 
     # Budget queries (using budget_v2)
@@ -81,14 +81,14 @@ class AnnualAnalysisService:
             List of monthly breakdowns
         """
         monthly_data = []
+        monthly_sums = self.repo.get_monthly_expense_priority_sums(
+            user, date(year, 1, 1), date(year, 12, 31), user_ids=user_ids
+        )
 
         for month in range(1, 13):
-            start_date = date(year, month, 1)
-            last_day = calendar.monthrange(year, month)[1]
-            end_date = date(year, month, last_day)
-
-            essential = self.repo.get_essential_expense_sum(user, start_date, end_date, user_ids=user_ids)
-            non_essential = self.repo.get_non_essential_expense_sum(user, start_date, end_date, user_ids=user_ids)
+            sums = monthly_sums.get(date(year, month, 1), {})
+            essential = sums.get("essential", Decimal("0"))
+            non_essential = sums.get("non_essential", Decimal("0"))
 
             monthly_data.append(
                 {
@@ -107,18 +107,47 @@ class BudgetDashboardService:
         if end_date < start_date:
             return {"error": "end_date must be on/after start_date"}
 
-        # Get active budgets for this period
-        budgets = self.repo.get_active_budgets_for_date_range(user, start_date, end_date, user_ids=user_ids)
+        # Get active budgets for this period and their spending in one grouped query
+        budgets = list(self.repo.get_active_budgets_for_date_range(user, start_date, end_date, user_ids=user_ids))
+        spending = self._load_spending(user, budgets, start_date, end_date, user_ids=user_ids)
 
+        return self._build_budget_progress(budgets, spending, start_date, end_date, year, month)
+
+    def _load_spending(self, user, budgets, start_date: date, end_date: date, user_ids: list[int] | None = None):
+        """Fetch spending for every category allocated in budgets with a single repository call."""
+        category_ids = {bc.category_id for budget in budgets for bc in budget.budget_categories.all()}
+        return self.repo.get_category_spending(user, list(category_ids), start_date, end_date, user_ids=user_ids)
+
+    def _build_budget_progress(
+        self,
+        budgets,
+        spending,
+        start_date: date,
+        end_date: date,
+        year: int | None = None,
+        month: int | None = None,
+    ) -> dict:
+        """
+        Build budget progress rows from preloaded budgets and spending.
+
+        Args:
+            budgets: Budgets active during the period (with budget_categories prefetched)
+            spending: CategorySpending covering the period
+            start_date: Period start
+            end_date: Period end
+            year: Year to report (defaults to start_date's)
+            month: Month to report (defaults to start_date's)
+
+        Returns:
+            Dictionary with budget progress data
+        """
         results = []
         for budget in budgets:
             # Iterate through each budget category allocation
             for budget_category in budget.budget_categories.all():
                 category = budget_category.category
-                # Get total expenses for this category during the period
-                total_spent = self.repo.get_category_expense_sum(
-                    user, category, start_date, end_date, user_ids=user_ids
-                )
+                # Total expenses for this category during the period
+                total_spent = spending.spent(budget_category.category_id, start_date, end_date)
 
                 budget_amount = budget_category.allocated_amount or Decimal(0)
                 percentage = int(round((total_spent / budget_amount) * 100)) if budget_amount > 0 else 0
@@ -169,16 +198,17 @@ class BudgetDashboardService:
         last_day = calendar.monthrange(year, month)[1]
         end_of_month = date(year, month, last_day)
 
-        # Get budgets active during this month
-        budgets = self.repo.get_active_budgets_for_date_range(user, start_of_month, end_of_month)
+        # Get budgets active during this month and their spending in one grouped query
+        budgets = list(self.repo.get_active_budgets_for_date_range(user, start_of_month, end_of_month))
+        spending = self._load_spending(user, budgets, start_of_month, end_of_month)
 
         budget_expenses = []
         for budget in budgets:
             # Iterate through each budget category allocation
             for budget_category in budget.budget_categories.all():
                 category = budget_category.category
-                # Get total expenses for this category during the month
-                total_expense = self.repo.get_category_expense_sum(user, category, start_of_month, end_of_month)
+                # Total expenses for this category during the month
+                total_expense = spending.spent(budget_category.category_id, start_of_month, end_of_month)
 
                 allocated_amount = budget_category.allocated_amount or Decimal(0)
                 # Calculate percentage of budget used
@@ -215,7 +245,8 @@ class BudgetDashboardService:
         Returns:
             Formatted string like "75%" or "N/A"
         """
-        budgets = self.repo.get_active_budgets_for_date_range(user, start_date, end_date)
+        budgets = list(self.repo.get_active_budgets_for_date_range(user, start_date, end_date))
+        spending = self._load_spending(user, budgets, start_date, end_date)
 
         total_budget = Decimal(0)
         total_spent = Decimal(0)
@@ -226,10 +257,7 @@ class BudgetDashboardService:
                 allocated_amount = budget_category.allocated_amount or Decimal(0)
                 if allocated_amount > 0:
                     total_budget += allocated_amount
-                    cat_expense = self.repo.get_category_expense_sum(
-                        user, budget_category.category, start_date, end_date
-                    )
-                    total_spent += Decimal(cat_expense)
+                    total_spent += spending.spent(budget_category.category_id, start_date, end_date)
 
         if total_budget > 0:
             utilization = (total_spent / total_budget) * Decimal(100)
@@ -296,7 +324,8 @@ class BudgetDashboardService:
         Get budget progress for the last N months.
 
         Business logic: Aggregates budget progress data for multiple months
-        to support timeline and trend visualizations.
+        to support timeline and trend visualizations. Budgets and spending
+        for the whole window are loaded once, then split per month.
 
         Args:
             user: User instance
@@ -308,6 +337,7 @@ class BudgetDashboardService:
         today = date.today()
         monthly_data = []
 
+        target_months = []
         for i in range(months - 1, -1, -1):
             # Calculate the target month (going backwards from current)
             year = today.year
@@ -315,9 +345,28 @@ class BudgetDashboardService:
             while month <= 0:
                 month += 12
                 year -= 1
+            target_months.append((year, month))
+
+        if not target_months:
+            return {"monthly_data": monthly_data, "months_requested": months}
+
+        first_year, first_month = target_months[0]
+        last_year, last_month = target_months[-1]
+        window_start = date(first_year, first_month, 1)
+        window_end = date(last_year, last_month, calendar.monthrange(last_year, last_month)[1])
+
+        all_budgets = list(
+            self.repo.get_active_budgets_for_date_range(user, window_start, window_end, user_ids=user_ids)
+        )
+        spending = self._load_spending(user, all_budgets, window_start, window_end, user_ids=user_ids)
+
+        for year, month in target_months:
+            month_start = date(year, month, 1)
+            month_end = date(year, month, calendar.monthrange(year, month)[1])
+            budgets = [b for b in all_budgets if b.start_date <= month_end and b.end_date >= month_start]
 
-            # Get budget progress for this month
-            progress = self.get_budget_progress(user, year=year, month=month, user_ids=user_ids)
+            # Build budget progress for this month
+            progress = self._build_budget_progress(budgets, spending, month_start, month_end, year, month)
 
             # Calculate totals for this month
             budgets = progress.get("budgets", [])
@@ -0,0 +1,80 @@
+"""Integration tests for AnnualAnalysisRepository."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from apps.budget_dashboard.repositories.annual_analysis_repository import AnnualAnalysisRepository
+from apps.budget_dashboard.services.annual_analysis_service import AnnualAnalysisService
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="annualtest", email="annual@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Annual Checking",
+        account_type="checking",
+        balance=Decimal("10000.00"),
+    )
+
+
+@pytest.fixture
+def repo():
+    return AnnualAnalysisRepository()
+
+
+def _category(user, slug, priority):
+    return TransactionCategory.objects.create(
+        user=user, name=slug.title(), slug=slug, type="expense", expense_priority=priority
+    )
+
+
+def _txn(user, account, category, amount, txn_date):
+    return Transaction.objects.create(
+        user=user,
+        account=account,
+        category=category,
+        amount=Decimal(amount),
+        date=txn_date,
+        description=f"Test {amount}",
+        transaction_type="debit",
+        sync_source="manual",
+    )
+
+
+class TestMonthlyExpensePrioritySums:
+    def test_matches_per_month_sums(self, repo, user, account):
+        rent = _category(user, "annual-rent", "essential")
+        dining = _category(user, "annual-dining", "non_essential")
+        for month in (1, 2, 7):
+            _txn(user, account, rent, "1500.00", date(2024, month, 1))
+            _txn(user, account, dining, "80.25", date(2024, month, 15))
+
+        monthly = repo.get_monthly_expense_priority_sums(user, date(2024, 1, 1), date(2024, 12, 31))
+
+        assert sorted(monthly) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 7, 1)]
+        for month_start, sums in monthly.items():
+            month_end = month_start + relativedelta(months=1, days=-1)
+            assert sums["essential"] == repo.get_essential_expense_sum(user, month_start, month_end)
+            assert sums["non_essential"] == repo.get_non_essential_expense_sum(user, month_start, month_end)
+
+    def test_monthly_breakdown_uses_one_query(self, repo, user, account, django_assert_num_queries):
+        rent = _category(user, "annual-rent", "essential")
+        for month in range(1, 13):
+            _txn(user, account, rent, "1500.00", date(2024, month, 3))
+
+        with django_assert_num_queries(1):
+            breakdown = AnnualAnalysisService(repo)._get_monthly_breakdown(user, 2024)
+
+        assert [row["essential"] for row in breakdown] == [1500.0] * 12
+        assert all(row["non_essential"] == 0.0 for row in breakdown)
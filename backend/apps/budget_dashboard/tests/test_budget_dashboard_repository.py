@@ -9,6 +9,7 @@ from apps.budget.models import Budget, BudgetCategory
 from apps.budget_dashboard.repositories.budget_dashboard_repository import (
     BudgetDashboardRepository,
 )
+from apps.budget_dashboard.services import BudgetDashboardService
 from apps.financial_account.models import FinancialAccount
 from apps.richtato_user.models import User
 from apps.transaction.models import Transaction, TransactionCategory
@@ -244,3 +245,48 @@ class TestGetExpenseYears:
     def test_returns_empty_when_no_expenses(self, repo, user):
         result = repo.get_expense_years(user)
         assert result == []
+
+
+class TestGetCategorySpending:
+    def test_groups_debits_by_category_and_month(self, repo, user, account, expense_cat, expense_cat_2):
+        _txn(user, account, expense_cat, Decimal("40.00"), date(2024, 1, 5))
+        _txn(user, account, expense_cat, Decimal("10.00"), date(2024, 1, 20))
+        _txn(user, account, expense_cat, Decimal("25.00"), date(2024, 2, 3))
+        _txn(user, account, expense_cat, Decimal("99.00"), date(2024, 2, 4), transaction_type="credit")
+        _txn(user, account, expense_cat_2, Decimal("7.00"), date(2024, 2, 10))
+
+        spending = repo.get_category_spending(
+            user, [expense_cat.id, expense_cat_2.id], date(2024, 1, 1), date(2024, 2, 29)
+        )
+
+        jan = (date(2024, 1, 1), date(2024, 1, 31))
+        feb = (date(2024, 2, 1), date(2024, 2, 29))
+        assert spending.spent(expense_cat.id, *jan) == repo.get_category_expense_sum(user, expense_cat, *jan)
+        assert spending.spent(expense_cat.id, *feb) == Decimal("25.00")
+        assert spending.count(expense_cat.id, *jan) == 2
+        assert spending.spent(expense_cat.id, date(2024, 1, 1), date(2024, 2, 29)) == Decimal("75.00")
+        assert spending.spent(expense_cat_2.id, *jan) == Decimal("0")
+
+    def test_multi_month_progress_query_count_is_constant(
+        self, repo, user, account, expense_cat, expense_cat_2, django_assert_num_queries
+    ):
+        today = date.today()
+        budget = Budget.objects.create(
+            user=user,
+            name="Rolling",
+            period_type="custom",
+            start_date=date(today.year - 2, 1, 1),
+            end_date=date(today.year + 1, 12, 31),
+        )
+        for category in (expense_cat, expense_cat_2):
+            BudgetCategory.objects.create(budget=budget, category=category, allocated_amount=Decimal("100.00"))
+        _txn(user, account, expense_cat, Decimal("60.00"), today.replace(day=1))
+
+        # Budgets + prefetched allocations and categories + one grouped spending query.
+        with django_assert_num_queries(4):
+            result = BudgetDashboardService(repo).get_budget_progress_multi_month(user, months=12)
+
+        latest = result["monthly_data"][-1]
+        assert latest["total_budget"] == 200.0
+        assert latest["total_spent"] == 60.0
+        assert all(month["total_spent"] == 0 for month in result["monthly_data"][:-1])
@@ -6,6 +6,7 @@ from unittest.mock import Mock
 
 import pytest
 
+from apps.budget.services.category_spending import CategorySpending
 from apps.budget_dashboard.repositories import BudgetDashboardRepository
 from apps.budget_dashboard.services import BudgetDashboardService
 
@@ -57,13 +58,14 @@ class TestBudgetDashboardService:
         """Test budget progress calculation."""
         mock_budget_category = Mock()
         mock_budget_category.category.name = "Food"
+        mock_budget_category.category_id = 1
         mock_budget_category.allocated_amount = Decimal("200.00")
 
         mock_budget = Mock()
         mock_budget.budget_categories.all.return_value = [mock_budget_category]
 
         mock_repo.get_active_budgets_for_date_range.return_value = [mock_budget]
-        mock_repo.get_category_expense_sum.return_value = Decimal("150.00")
+        mock_repo.get_category_spending.return_value = CategorySpending({(1, date(2024, 1, 1)): (Decimal("150.00"), 3)})
 
         result = service.get_budget_progress(mock_user, year=2024, month=1)
 
@@ -78,20 +80,24 @@ class TestBudgetDashboardService:
         """Test budget rankings generation."""
         mock_bc_food = Mock()
         mock_bc_food.category.name = "Food"
+        mock_bc_food.category_id = 1
         mock_bc_food.allocated_amount = Decimal("200.00")
 
         mock_bc_transport = Mock()
         mock_bc_transport.category.name = "Transport"
+        mock_bc_transport.category_id = 2
         mock_bc_transport.allocated_amount = Decimal("100.00")
 
         mock_budget = Mock()
         mock_budget.budget_categories.all.return_value = [mock_bc_food, mock_bc_transport]
 
         mock_repo.get_active_budgets_for_date_range.return_value = [mock_budget]
-        mock_repo.get_category_expense_sum.side_effect = [
-            Decimal("180.00"),  # Food: 90%
-            Decimal("80.00"),  # Transport: 80%
-        ]
+        mock_repo.get_category_spending.return_value = CategorySpending(
+            {
+                (1, date(2024, 1, 1)): (Decimal("180.00"), 4),  # Food: 90%
+                (2, date(2024, 1, 1)): (Decimal("80.00"), 2),  # Transport: 80%
+            }
+        )
 
         result = service.get_budget_rankings(mock_user, 2024, 1)
 
@@ -105,10 +111,12 @@ class TestBudgetDashboardService:
         """Test budget utilization calculation with multiple budgets."""
         mock_bc_food = Mock()
         mock_bc_food.category.name = "Food"
+        mock_bc_food.category_id = 1
         mock_bc_food.allocated_amount = Decimal("200.00")
 
         mock_bc_transport = Mock()
         mock_bc_transport.category.name = "Transport"
+        mock_bc_transport.category_id = 2
         mock_bc_transport.allocated_amount = Decimal("100.00")
 
         mock_budget = Mock()
@@ -116,10 +124,12 @@ class TestBudgetDashboardService:
 
         mock_repo.get_active_budgets_for_date_range.return_value = [mock_budget]
 
-        mock_repo.get_category_expense_sum.side_effect = [
-            Decimal("150.00"),
-            Decimal("50.00"),
-        ]
+        mock_repo.get_category_spending.return_value = CategorySpending(
+            {
+                (1, date(2024, 1, 1)): (Decimal("150.00"), 3),
+                (2, date(2024, 1, 1)): (Decimal("50.00"), 1),
+            }
+        )
 
         start = date(2024, 1, 1)
         end = date(2024, 1, 31)
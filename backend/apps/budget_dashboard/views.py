@@ -12,6 +12,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from loguru import logger
 
+from apps.core.services.dashboard_cache import cached_dashboard_response
 from apps.core.utils.date_params import parse_date_range_params
 
 from .repositories import BudgetDashboardRepository
@@ -169,6 +170,7 @@ def expense_years(request):
 
 
 @login_required
+@cached_dashboard_response("budget_progress_multi_month")
 def budget_progress_multi_month(request):
     """Get budget progress for multiple months - delegates to service layer."""
     try:
@@ -202,6 +204,7 @@ def budget_progress_multi_month(request):
 
 
 @login_required
+@cached_dashboard_response("annual_analysis")
 def annual_analysis(request):
     """Get comprehensive annual analysis data - delegates to service layer."""
     try:
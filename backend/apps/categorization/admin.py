@@ -3,6 +3,7 @@
 from django.contrib import admin
 
 from .models import (
+    AICategorizationCache,
     CategorizationHistory,
     CategorizationQueue,
 )
@@ -46,3 +47,17 @@ class CategorizationQueueAdmin(admin.ModelAdmin):
         return len(obj.transaction_ids) if obj.transaction_ids else 0
 
     transaction_count.short_description = "Transaction Count"
+
+
+@admin.register(AICategorizationCache)
+class AICategorizationCacheAdmin(admin.ModelAdmin):
+    list_display = (
+        "normalized_description",
+        "category_path",
+        "confidence_score",
+        "hit_count",
+        "last_used_at",
+        "created_at",
+    )
+    search_fields = ("normalized_description", "category_path")
+    readonly_fields = ("created_at",)
@@ -1,13 +1,47 @@
 """Management command to process categorization queue."""
 
+import multiprocessing
+import signal
+import threading
+
+import django
 from django.core.management.base import BaseCommand
-from loguru import logger
+from django.db import connections
 
-from apps.categorization.models import CategorizationQueue
-from apps.categorization.services.batch_ai_service import (
-    BatchAICategorizationService,
+from apps.categorization.services.queue_worker import (
+    DEFAULT_HEARTBEAT_SECONDS,
+    DEFAULT_POLL_SECONDS,
+    DEFAULT_STALE_AFTER_SECONDS,
+    CategorizationQueueWorker,
 )
 
+_WORKER_OPTIONS = ("batch_size", "user", "heartbeat_interval", "stale_after", "poll_interval", "stats_interval")
+
+
+def _build_worker(worker_id: str, options: dict) -> CategorizationQueueWorker:
+    return CategorizationQueueWorker(
+        worker_id=worker_id,
+        batch_size=options["batch_size"],
+        username=options.get("user"),
+        heartbeat_seconds=options["heartbeat_interval"],
+        stale_after_seconds=options["stale_after"],
+        poll_seconds=options["poll_interval"],
+    )
+
+
+def _run_daemon_worker(worker_id: str, options: dict) -> None:
+    """Entry point of one daemon process: claim and process items until SIGTERM."""
+    django.setup()
+    connections.close_all()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    worker = _build_worker(worker_id, options)
+    worker.run_forever(stop, stats_seconds=options["stats_interval"])
+    connections.close_all()
+
 
 class Command(BaseCommand):
     help = "Process pending AI categorization queue items"
@@ -22,8 +56,9 @@ class Command(BaseCommand):
         parser.add_argument(
             "--batch-size",
             type=int,
-            default=75,
-            help="Number of transactions per batch (default: 75)",
+            default=None,
+            help="Maximum transactions per prompt (default: AI_CATEGORIZATION_MAX_BATCH_SIZE; "
+            "prompts are otherwise filled up to the token budget)",
         )
         parser.add_argument(
             "--user",
@@ -35,92 +70,124 @@ class Command(BaseCommand):
             action="store_true",
             help="Process all pending items (ignore limit)",
         )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running and process items as they are queued (stop with SIGTERM)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Daemon worker processes claiming items concurrently (default: 1)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=DEFAULT_POLL_SECONDS,
+            help=f"Seconds an idle daemon worker waits before polling again (default: {DEFAULT_POLL_SECONDS:g})",
+        )
+        parser.add_argument(
+            "--heartbeat-interval",
+            type=float,
+            default=DEFAULT_HEARTBEAT_SECONDS,
+            help=f"Minimum seconds between heartbeats of an item in progress (default: {DEFAULT_HEARTBEAT_SECONDS:g})",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=DEFAULT_STALE_AFTER_SECONDS,
+            help="Seconds without a heartbeat before a processing item is requeued "
+            f"(default: {DEFAULT_STALE_AFTER_SECONDS:g})",
+        )
+        parser.add_argument(
+            "--stats-interval",
+            type=float,
+            default=60.0,
+            help="Seconds between throughput and queue-lag log lines in daemon mode (default: 60)",
+        )
 
     def handle(self, *args, **options):
-        limit = options["limit"]
-        batch_size = options["batch_size"]
-        user_filter = options.get("user")
-        process_all = options.get("all", False)
-
-        self.stdout.write(self.style.SUCCESS(f"Starting categorization queue processing (batch_size={batch_size})"))
-
-        # Get pending queue items
-        queryset = CategorizationQueue.objects.filter(status="pending").select_related("user")
+        if options["daemon"]:
+            self._run_daemon(options)
+            return
 
-        if user_filter:
-            queryset = queryset.filter(user__username=user_filter)
+        limit = None if options.get("all", False) else options["limit"]
+        batch_size = options["batch_size"]
 
-        if not process_all:
-            queryset = queryset[:limit]
+        self.stdout.write(
+            self.style.SUCCESS(f"Starting categorization queue processing (batch_size={batch_size or 'auto'})")
+        )
 
-        queue_items = list(queryset)
+        # Items are claimed one at a time, so concurrent runs never process the same item.
+        worker = _build_worker("cli", options)
+        items_processed = worker.run_once(limit=limit, on_item=self._report_item)
 
-        if not queue_items:
+        if not items_processed:
             self.stdout.write(self.style.WARNING("No pending queue items found"))
             return
 
-        self.stdout.write(self.style.SUCCESS(f"Found {len(queue_items)} pending queue items"))
-
-        # Initialize service
-        batch_service = BatchAICategorizationService()
-        batch_service.batch_size = batch_size
-
-        # Process each queue item
-        total_processed = 0
-        total_categorized = 0
-        total_failed = 0
-
-        for queue_item in queue_items:
-            self.stdout.write(
-                f"\nProcessing queue item {queue_item.id} "
-                f"({len(queue_item.transaction_ids)} transactions) "
-                f"for user {queue_item.user.username}..."
-            )
-
-            try:
-                # Mark as processing
-                queue_item.mark_processing()
-
-                # Process transactions
-                results = batch_service.categorize_transaction_ids(queue_item.transaction_ids, queue_item.user)
-
-                # Update queue item
-                queue_item.mark_completed(
-                    categorized=results["categorized"],
-                    failed=results["failed"],
-                    processed=results["total"],
-                )
-
-                total_processed += results["total"]
-                total_categorized += results["categorized"]
-                total_failed += results["failed"]
-
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✓ Queue item {queue_item.id}: "
-                        f"{results['categorized']} categorized, "
-                        f"{results['failed']} failed, "
-                        f"{results['skipped']} skipped"
-                    )
-                )
-
-            except Exception as e:
-                error_msg = f"Error processing queue item {queue_item.id}: {str(e)}"
-                logger.error(error_msg)
-                queue_item.mark_failed(error_msg)
-
-                self.stdout.write(self.style.ERROR(f"✗ {error_msg}"))
-
-        # Summary
+        stats = worker.stats
         self.stdout.write(
             self.style.SUCCESS(
                 f"\n{'=' * 60}\n"
                 f"Processing Complete!\n"
                 f"{'=' * 60}\n"
-                f"Queue Items Processed: {len(queue_items)}\n"
-                f"Transactions Processed: {total_processed}\n"
-                f"Successfully Categorized: {total_categorized}\n"
-                f"Failed: {total_failed}\n"
+                f"Queue Items Processed: {items_processed}\n"
+                f"Transactions Processed: {stats.transactions}\n"
+                f"Successfully Categorized: {stats.categorized}\n"
+                f"Failed: {stats.failed}\n"
+                f"Throughput: {stats.transactions_per_second:.1f} transactions/s\n"
                 f"{'=' * 60}"
             )
         )
+
+    def _report_item(self, queue_item, results: dict) -> None:
+        self.stdout.write(
+            f"\nProcessed queue item {queue_item.id} "
+            f"({len(queue_item.transaction_ids)} transactions) "
+            f"for user {queue_item.user.username}"
+        )
+        if "error" in results:
+            self.stdout.write(self.style.ERROR(f"✗ Error processing queue item {queue_item.id}: {results['error']}"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Queue item {queue_item.id}: "
+                f"{results['categorized']} categorized, "
+                f"{results['failed']} failed, "
+                f"{results['skipped']} skipped"
+            )
+        )
+
+    def _run_daemon(self, options: dict) -> None:
+        workers = max(1, options["workers"])
+        self.stdout.write(self.style.SUCCESS(f"Starting categorization queue daemon with {workers} worker(s)"))
+
+        if workers == 1:
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            _build_worker("0", options).run_forever(stop, stats_seconds=options["stats_interval"])
+            return
+
+        # Forked workers must not share the parent's open database sockets.
+        connections.close_all()
+        worker_options = {key: options.get(key) for key in _WORKER_OPTIONS}
+        processes = [
+            multiprocessing.Process(target=_run_daemon_worker, args=(str(index), worker_options))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, _frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Categorization queue daemon stopped"))
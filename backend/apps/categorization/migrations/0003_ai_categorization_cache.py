@@ -0,0 +1,41 @@
+"""Add the shared AI categorization result cache."""
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categorization", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AICategorizationCache",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="sha256(fingerprint, normalized description)",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("category_set_fingerprint", models.CharField(max_length=64)),
+                ("normalized_description", models.CharField(max_length=500)),
+                ("category_path", models.CharField(help_text="Lowercased category full path", max_length=511)),
+                ("confidence_score", models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ("hit_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_used_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "db_table": "ai_categorization_cache",
+                "indexes": [
+                    models.Index(fields=["last_used_at"], name="ai_categori_last_us_38f780_idx"),
+                    models.Index(fields=["created_at"], name="ai_categori_created_237a5f_idx"),
+                ],
+            },
+        ),
+    ]
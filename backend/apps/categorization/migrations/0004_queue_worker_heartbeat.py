@@ -0,0 +1,26 @@
+"""Track worker heartbeats and claim attempts on CategorizationQueue."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categorization", "0003_ai_categorization_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="categorizationqueue",
+            name="attempts",
+            field=models.IntegerField(default=0, help_text="Times a worker has claimed this item"),
+        ),
+        migrations.AddField(
+            model_name="categorizationqueue",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last sign of life from the worker processing this item",
+                null=True,
+            ),
+        ),
+    ]
@@ -70,10 +70,14 @@ class CategorizationQueue(models.Model):
     transactions_categorized = models.IntegerField(default=0)
     transactions_failed = models.IntegerField(default=0)
     error_message = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0, help_text="Times a worker has claimed this item")
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last sign of life from the worker processing this item"
+    )
     completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
@@ -91,6 +95,7 @@ class CategorizationQueue(models.Model):
         """Mark queue item as currently processing."""
         self.status = "processing"
         self.started_at = timezone.now()
+        self.heartbeat_at = self.started_at
         self.save()
 
     def mark_completed(self, categorized: int, failed: int, processed: int):
@@ -117,3 +122,30 @@ class CategorizationQueue(models.Model):
         elif self.started_at:
             return timezone.now() - self.started_at
         return None
+
+
+class AICategorizationCache(models.Model):
+    """Cached AI answer for a normalized description under a category set.
+
+    Keyed on a hash of the category set fingerprint and the normalized
+    description, so users with identical category sets share answers.
+    """
+
+    key = models.CharField(max_length=64, unique=True, help_text="sha256(fingerprint, normalized description)")
+    category_set_fingerprint = models.CharField(max_length=64)
+    normalized_description = models.CharField(max_length=500)
+    category_path = models.CharField(max_length=511, help_text="Lowercased category full path")
+    confidence_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "ai_categorization_cache"
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.normalized_description} → {self.category_path}"
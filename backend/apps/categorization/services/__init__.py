@@ -2,12 +2,8 @@
 
 from .ai_categorization_service import AICategorizationService
 from .batch_ai_service import BatchAICategorizationService
-from .learning_service import LearningService
-from .rule_based_service import RuleBasedCategorizationService
 
 __all__ = [
-    "RuleBasedCategorizationService",
     "AICategorizationService",
     "BatchAICategorizationService",
-    "LearningService",
 ]
@@ -5,6 +5,12 @@ from decimal import Decimal
 from loguru import logger
 
 from apps.categorization.models import CategorizationHistory
+from apps.categorization.services.ai_result_cache import (
+    ai_result_cache,
+    category_set_fingerprint,
+    is_ai_result_cache_enabled,
+    normalize_description,
+)
 from apps.transaction.models import Transaction, TransactionCategory
 from apps.transaction.repositories.category_repository import CategoryRepository
 from artificial_intelligence.ai import OpenAI
@@ -13,9 +19,10 @@ from artificial_intelligence.ai import OpenAI
 class AICategorizationService:
     """Service for AI-based transaction categorization using OpenAI."""
 
-    def __init__(self):
+    def __init__(self, use_cache: bool | None = None):
         self.ai = OpenAI()
         self.category_repository = CategoryRepository()
+        self.use_cache = is_ai_result_cache_enabled() if use_cache is None else use_cache
 
     def suggest_category(
         self,
@@ -35,12 +42,24 @@ class AICategorizationService:
         try:
             # Get available categories
             if available_categories is None:
-                available_categories = self.category_repository.get_all_for_user(transaction.user, include_global=True)
+                available_categories = self.category_repository.get_all_for_user(transaction.user)
 
             if not available_categories:
                 logger.warning("No categories available for AI categorization")
                 return None
 
+            normalized = normalize_description(transaction.description)
+            fingerprint = None
+            if self.use_cache and normalized:
+                fingerprint = category_set_fingerprint([cat.full_path for cat in available_categories])
+                cached = ai_result_cache.get_many(fingerprint, [normalized]).get(normalized)
+                if cached:
+                    path, confidence = cached
+                    category = next((cat for cat in available_categories if cat.full_path.lower() == path), None)
+                    if category:
+                        logger.info(f"AI category for transaction {transaction.id} served from cache: {category.name}")
+                        return (category, confidence)
+
             # Build prompt for AI
             prompt = self._build_categorization_prompt(transaction, available_categories)
 
@@ -55,6 +74,8 @@ class AICategorizationService:
                     f"AI suggested category for transaction {transaction.id}: "
                     f"{category.name} (confidence: {confidence}%)"
                 )
+                if fingerprint is not None:
+                    ai_result_cache.set_many(fingerprint, {normalized: (category.full_path, confidence)})
                 return (category, confidence)
 
             return None
@@ -116,9 +137,6 @@ class AICategorizationService:
 
         category_str = "\n".join(category_list)
 
-        # Build transaction description
-        merchant_info = f"\nMerchant: {transaction.merchant.name}" if transaction.merchant else ""
-
         prompt = f"""You are a financial transaction categorization assistant.
 Analyze the following transaction and suggest the most appropriate category from the list provided.
 
@@ -126,7 +144,7 @@ Transaction Details:
 - Description: {transaction.description}
 - Amount: ${transaction.amount}
 - Date: {transaction.date}
-- Type: {transaction.get_transaction_type_display()}{merchant_info}
+- Type: {transaction.get_transaction_type_display()}
 
 Available Categories:
 {category_str}
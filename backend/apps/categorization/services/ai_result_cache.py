@@ -0,0 +1,162 @@
+"""Persistent cache of AI categorization answers.
+
+Merchant strings such as ``NETFLIX.COM`` or ``UBER *TRIP`` recur across users
+and months. Answers are cached per ``(category set fingerprint, normalized
+description)``, so any user with the same category set reuses them and only
+cache misses are sent to the model.
+
+Entries expire after ``AI_CATEGORIZATION_CACHE_TTL_DAYS`` and the table is
+trimmed to ``AI_CATEGORIZATION_CACHE_MAX_ENTRIES`` by least-recent use.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from loguru import logger
+
+from apps.categorization.models import AICategorizationCache
+
+DEFAULT_TTL_DAYS = 90
+DEFAULT_MAX_ENTRIES = 50_000
+# Low-confidence guesses are not worth repeating for other users.
+MIN_CACHED_CONFIDENCE = Decimal("50")
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_DIGIT_RE = re.compile(r"\d")
+
+
+def is_ai_result_cache_enabled() -> bool:
+    """True when AI categorization should consult the result cache."""
+    return getattr(settings, "AI_CATEGORIZATION_CACHE_ENABLED", True)
+
+
+def normalize_description(description: str | None) -> str:
+    """
+    Reduce a transaction description to its merchant-identifying words.
+
+    Lowercases, turns punctuation into spaces and drops reference-number
+    tokens (any token with three or more digits), so ``"UBER *TRIP 8842"``
+    and ``"Uber Trip"`` normalize the same.
+    """
+    tokens = _NON_ALNUM_RE.sub(" ", (description or "").lower()).split()
+    return " ".join(token for token in tokens if len(_DIGIT_RE.findall(token)) < 3)[:500]
+
+
+def category_set_fingerprint(category_paths: list[str]) -> str:
+    """Stable hash of a category set, independent of order and case."""
+    joined = "\n".join(sorted({path.strip().lower() for path in category_paths}))
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+def _cache_key(fingerprint: str, normalized: str) -> str:
+    return hashlib.sha256(f"{fingerprint}\0{normalized}".encode()).hexdigest()
+
+
+class AICategorizationResultCache:
+    """Database-backed cache with TTL expiry and LRU trimming."""
+
+    def __init__(self, ttl_days: int | None = None, max_entries: int | None = None):
+        self._ttl_days = ttl_days
+        self._max_entries = max_entries
+
+    @property
+    def ttl(self) -> timedelta:
+        days = self._ttl_days
+        if days is None:
+            days = getattr(settings, "AI_CATEGORIZATION_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS)
+        return timedelta(days=days)
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, "AI_CATEGORIZATION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+
+    def get_many(self, fingerprint: str, normalized_descriptions: list[str]) -> dict[str, tuple[str, Decimal | None]]:
+        """
+        Look up cached answers in one query and mark them used.
+
+        Args:
+            fingerprint: category_set_fingerprint of the caller's categories
+            normalized_descriptions: Descriptions from normalize_description
+
+        Returns:
+            Dict of normalized description to (category path, confidence)
+        """
+        keys = {_cache_key(fingerprint, norm): norm for norm in set(normalized_descriptions) if norm}
+        if not keys:
+            return {}
+
+        fresh_since = timezone.now() - self.ttl
+        rows = AICategorizationCache.objects.filter(key__in=keys.keys(), created_at__gte=fresh_since).values_list(
+            "key", "category_path", "confidence_score"
+        )
+        hits = {keys[key]: (path, confidence) for key, path, confidence in rows}
+        if hits:
+            AICategorizationCache.objects.filter(key__in=[_cache_key(fingerprint, norm) for norm in hits]).update(
+                hit_count=F("hit_count") + 1,
+                last_used_at=timezone.now(),
+            )
+        return hits
+
+    def set_many(self, fingerprint: str, answers: dict[str, tuple[str, Decimal | None]]) -> int:
+        """
+        Store model answers, replacing stale entries for the same key.
+
+        Args:
+            fingerprint: category_set_fingerprint of the caller's categories
+            answers: Normalized description to (category path, confidence)
+
+        Returns:
+            Number of entries written
+        """
+        now = timezone.now()
+        entries = [
+            AICategorizationCache(
+                key=_cache_key(fingerprint, norm),
+                category_set_fingerprint=fingerprint,
+                normalized_description=norm,
+                category_path=path.lower(),
+                confidence_score=confidence,
+                created_at=now,
+                last_used_at=now,
+            )
+            for norm, (path, confidence) in answers.items()
+            if norm and (confidence is None or confidence >= MIN_CACHED_CONFIDENCE)
+        ]
+        if not entries:
+            return 0
+        AICategorizationCache.objects.bulk_create(
+            entries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["category_path", "confidence_score", "created_at", "last_used_at"],
+        )
+        return len(entries)
+
+    def prune(self) -> int:
+        """Delete expired entries, then the least recently used beyond max_entries."""
+        deleted, _ = AICategorizationCache.objects.filter(created_at__lt=timezone.now() - self.ttl).delete()
+
+        excess = AICategorizationCache.objects.count() - self.max_entries
+        if excess > 0:
+            stale_ids = list(
+                AICategorizationCache.objects.order_by("last_used_at", "id").values_list("id", flat=True)[:excess]
+            )
+            evicted, _ = AICategorizationCache.objects.filter(id__in=stale_ids).delete()
+            deleted += evicted
+
+        if deleted:
+            logger.debug(f"Pruned {deleted} AI categorization cache entries")
+        return deleted
+
+
+ai_result_cache = AICategorizationResultCache()
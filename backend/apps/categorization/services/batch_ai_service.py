@@ -1,44 +1,104 @@
-"""Batch AI categorization service for efficient processing."""
+"""Batch AI categorization service for efficient processing.
+
+Descriptions with a cached answer (see ``ai_result_cache``) are categorized
+without a prompt, and only one transaction per distinct normalized
+description is sent to the model.
+
+Transactions are packed into prompts up to a token budget (see
+``prompt_packing``). Batches are sent concurrently, up to ``max_in_flight`` requests at a time
+(``AI_CATEGORIZATION_MAX_IN_FLIGHT``), on a thread pool sharing the OpenAI
+client. Worker threads only build prompts, call the API and parse responses;
+results are written to the database from the calling thread as each batch
+completes.
+"""
 
 import json
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
 
+from django.conf import settings
+from django.db import transaction as db_transaction
 from loguru import logger
 
 from apps.categorization.models import CategorizationHistory
+from apps.categorization.services.ai_result_cache import (
+    ai_result_cache,
+    category_set_fingerprint,
+    is_ai_result_cache_enabled,
+    normalize_description,
+)
+from apps.categorization.services.prompt_packing import (
+    CategoryCatalog,
+    PromptPacker,
+    estimate_tokens,
+    format_transaction_line,
+)
+from apps.core.services.dashboard_cache import invalidate_dashboards
 from apps.richtato_user.models import User
 from apps.transaction.models import Transaction, TransactionCategory
 from apps.transaction.repositories.category_repository import CategoryRepository
 from apps.transaction.repositories.transaction_repository import TransactionRepository
+from apps.transaction.services.flow_class import assign_flow_classes
+from apps.transaction.services.monthly_rollup import refresh_for_transactions
 from artificial_intelligence.ai import OpenAI
 
 
 class BatchAICategorizationService:
     """Service for batch processing multiple transactions with AI efficiently."""
 
-    def __init__(self):
+    def __init__(self, max_in_flight: int | None = None, use_cache: bool | None = None):
         self.ai = OpenAI()
         self.category_repository = CategoryRepository()
         self.transaction_repository = TransactionRepository()
-        self.batch_size = 75  # Medium batch size for optimal performance
+        # Prompts are packed up to a token budget; batch_size only caps transactions per prompt
+        self.packer = PromptPacker()
+        if max_in_flight is None:
+            max_in_flight = getattr(settings, "AI_CATEGORIZATION_MAX_IN_FLIGHT", 4)
+        self.max_in_flight = max(1, max_in_flight)
+        self.use_cache = is_ai_result_cache_enabled() if use_cache is None else use_cache
+
+    @property
+    def batch_size(self) -> int:
+        return self.packer.max_batch_size
+
+    @batch_size.setter
+    def batch_size(self, value: int) -> None:
+        self.packer.max_batch_size = max(1, value)
+
+    def _empty_results(self, total: int) -> dict:
+        return {
+            "total": total,
+            "categorized": 0,
+            "failed": 0,
+            "skipped": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_hit_rate": 0.0,
+            "requests": 0,
+            "estimated_tokens": 0,
+            "tokens_per_categorized": 0.0,
+        }
 
-    def categorize_transaction_ids(self, transaction_ids: list[int], user: User) -> dict:
+    def categorize_transaction_ids(
+        self,
+        transaction_ids: list[int],
+        user: User,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> dict:
         """
         Categorize a list of transaction IDs in batches.
 
         Args:
             transaction_ids: List of transaction IDs to categorize
             user: User who owns the transactions
+            progress_callback: Optional callback with the number of transactions
+                processed so far, called from this thread after each batch
 
         Returns:
             Dict with results
         """
-        results = {
-            "total": len(transaction_ids),
-            "categorized": 0,
-            "failed": 0,
-            "skipped": 0,
-        }
+        results = self._empty_results(len(transaction_ids))
 
         transactions = list(Transaction.objects.filter(id__in=transaction_ids, user=user).select_related("category"))
 
@@ -47,20 +107,13 @@ class BatchAICategorizationService:
             return results
 
         # Get available categories
-        categories = self.category_repository.get_all_for_user(user, include_global=True)
+        categories = self.category_repository.get_all_for_user(user)
 
         if not categories:
             logger.warning("No categories available for AI categorization")
             return results
 
-        # Process in batches
-        for i in range(0, len(transactions), self.batch_size):
-            batch = transactions[i : i + self.batch_size]
-            batch_results = self._categorize_batch(batch, categories, user)
-
-            results["categorized"] += batch_results["categorized"]
-            results["failed"] += batch_results["failed"]
-            results["skipped"] += batch_results["skipped"]
+        self._categorize_in_batches(transactions, categories, user, results, progress_callback)
 
         logger.info(
             f"Batch categorization complete: {results['categorized']} categorized, "
@@ -69,140 +122,283 @@ class BatchAICategorizationService:
 
         return results
 
-    def _categorize_batch(
+    def _categorize_in_batches(
         self,
         transactions: list[Transaction],
         categories: list[TransactionCategory],
         user: User,
-    ) -> dict:
+        results: dict,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> None:
         """
-        Categorize a single batch of transactions.
+        Apply cached answers, then dispatch the misses to the model and apply results as they arrive.
 
         Args:
-            transactions: List of transactions to categorize
+            transactions: Transactions to categorize
             categories: Available categories
             user: User
-
-        Returns:
-            Dict with batch results
+            results: Totals dict, updated in place
+            progress_callback: Optional callback with transactions processed so far
         """
-        results = {"categorized": 0, "failed": 0, "skipped": 0}
-
-        try:
-            # Build batch prompt
-            prompt = self._build_batch_prompt(transactions, categories)
+        catalog = CategoryCatalog.from_categories(categories)
 
-            # Get AI response
-            response = self.ai.one_shot_prompt(prompt)
+        def add(batch_results: dict) -> None:
+            results["categorized"] += batch_results["categorized"]
+            results["failed"] += batch_results["failed"]
+            results["skipped"] += batch_results["skipped"]
+            if progress_callback:
+                progress_callback(results["categorized"] + results["failed"] + results["skipped"])
+
+        # Representative transaction id -> transactions that share its answer
+        members = {t.id: [t] for t in transactions}
+        to_send = transactions
+        fingerprint = None
+        if self.use_cache:
+            fingerprint = category_set_fingerprint([cat.full_path for cat in categories])
+            to_send, members, hit_results = self._apply_cached_answers(transactions, fingerprint, catalog, results)
+            add(hit_results)
+
+        header_tokens = estimate_tokens(self._build_batch_prompt([], catalog))
+        packed = self.packer.pack(to_send, header_tokens)
+        results["requests"] += len(packed)
+        results["estimated_tokens"] += sum(batch.estimated_tokens for batch in packed)
+
+        batches = [batch.transactions for batch in packed]
+        for batch, categorizations in self._dispatch(batches, catalog):
+            batch_members = [t for rep in batch for t in members[rep.id]]
+            if categorizations is None:
+                add(self._release_failed_batch(batch_members))
+                continue
+
+            expanded = [
+                (member.id, category, confidence)
+                for txn_id, category, confidence in categorizations
+                for member in members.get(txn_id, [])
+            ]
+            batch_results = self._apply_batch_results(batch_members, expanded)
+            add(batch_results)
+
+            if fingerprint is not None and not batch_results["failed"]:
+                batch_by_id = {t.id: t for t in batch}
+                answers = {}
+                for txn_id, category, confidence in categorizations:
+                    if txn_id in batch_by_id:
+                        norm = normalize_description(batch_by_id[txn_id].description)
+                        answers.setdefault(norm, (category.full_path, confidence))
+                ai_result_cache.set_many(fingerprint, answers)
+
+        if fingerprint is not None:
+            ai_result_cache.prune()
+            looked_up = results["cache_hits"] + results["cache_misses"]
+            results["cache_hit_rate"] = round(results["cache_hits"] / looked_up, 4) if looked_up else 0.0
+
+        if results["categorized"]:
+            results["tokens_per_categorized"] = round(results["estimated_tokens"] / results["categorized"], 1)
+
+    def _apply_cached_answers(
+        self,
+        transactions: list[Transaction],
+        fingerprint: str,
+        catalog: CategoryCatalog,
+        results: dict,
+    ) -> tuple[list[Transaction], dict[int, list[Transaction]], dict]:
+        """
+        Categorize transactions whose normalized description has a cached answer.
 
-            # Parse batch response
-            categorizations = self._parse_batch_response(response, transactions, categories)
+        Remaining transactions are grouped by normalized description so only
+        one representative per distinct description is sent to the model.
 
-            # Apply categorizations
-            for txn_id, category, confidence in categorizations:
+        Returns:
+            Tuple of (representatives to send, representative id -> group, results for cache hits)
+        """
+        groups: dict[str, list[Transaction]] = {}
+        for txn in transactions:
+            # Descriptions with nothing left after normalization are sent individually
+            norm = normalize_description(txn.description) or f"\0{txn.id}"
+            groups.setdefault(norm, []).append(txn)
+
+        cached = ai_result_cache.get_many(fingerprint, [norm for norm in groups if not norm.startswith("\0")])
+        hit_transactions = []
+        hit_categorizations = []
+        for norm, (path, confidence) in cached.items():
+            category = catalog.by_name.get(path)
+            if category is None:
+                continue
+            for txn in groups.pop(norm):
+                hit_transactions.append(txn)
+                hit_categorizations.append((txn.id, category, confidence))
+
+        results["cache_hits"] += len(hit_transactions)
+        results["cache_misses"] += len(transactions) - len(hit_transactions)
+
+        hit_results = {"categorized": 0, "failed": 0, "skipped": 0}
+        if hit_transactions:
+            hit_results = self._apply_batch_results(hit_transactions, hit_categorizations)
+            logger.info(f"AI categorization cache answered {len(hit_transactions)} transactions")
+
+        representatives = [group[0] for group in groups.values()]
+        return representatives, {group[0].id: group for group in groups.values()}, hit_results
+
+    def _dispatch(
+        self,
+        batches: list[list[Transaction]],
+        catalog: CategoryCatalog,
+    ) -> Iterator[tuple[list[Transaction], list[tuple[int, TransactionCategory, Decimal]] | None]]:
+        """Yield (batch, categorizations) as requests complete; categorizations is None when a request failed."""
+        if self.max_in_flight == 1 or len(batches) <= 1:
+            for batch in batches:
                 try:
-                    transaction = next((t for t in transactions if t.id == txn_id), None)
-                    if transaction:
-                        transaction.category = category
-                        transaction.categorization_status = "categorized"
-                        transaction.save()
-
-                        # Record in history
-                        CategorizationHistory.objects.create(
-                            transaction=transaction,
-                            category=category,
-                            method="ai",
-                            confidence_score=confidence,
-                        )
-
-                        results["categorized"] += 1
-                        logger.debug(
-                            f"AI categorized transaction {txn_id}: {category.name} (confidence: {confidence}%)"
-                        )
+                    categorizations = self._request_batch(batch, catalog)
                 except Exception as e:
-                    logger.error(f"Error applying categorization for transaction {txn_id}: {str(e)}")
-                    results["failed"] += 1
+                    logger.error(f"Error in batch AI categorization: {str(e)}")
+                    categorizations = None
+                yield batch, categorizations
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_in_flight, len(batches)),
+            thread_name_prefix="ai-categorization",
+        ) as executor:
+            futures = {executor.submit(self._request_batch, batch, catalog): batch for batch in batches}
+            for future in as_completed(futures):
+                try:
+                    categorizations = future.result()
+                except Exception as e:
+                    logger.error(f"Error in batch AI categorization: {str(e)}")
+                    categorizations = None
+                yield futures[future], categorizations
+
+    def _request_batch(
+        self,
+        transactions: list[Transaction],
+        catalog: CategoryCatalog,
+    ) -> list[tuple[int, TransactionCategory, Decimal]]:
+        """Prompt the model for one batch and parse its answer. No database access, safe off-thread."""
+        prompt = self._build_batch_prompt(transactions, catalog)
+        response = self.ai.one_shot_prompt(prompt)
+        return self._parse_batch_response(response, catalog)
+
+    def _apply_batch_results(
+        self,
+        transactions: list[Transaction],
+        categorizations: list[tuple[int, TransactionCategory, Decimal]],
+    ) -> dict:
+        """
+        Persist a batch's categorizations and release rows the model skipped.
+
+        Writes are one bulk_update of the category fields and one bulk_create
+        of history rows. Neither fires model signals, so the balance
+        pre_save/post_save handlers never run for these category-only edits.
+        """
+        results = {"categorized": 0, "failed": 0, "skipped": 0}
+        transactions_by_id = {t.id: t for t in transactions}
+        history = []
+
+        for txn_id, category, confidence in categorizations:
+            # pop: the model may repeat an ID; only its first answer is applied
+            transaction = transactions_by_id.pop(txn_id, None)
+            if transaction is None:
+                continue
+            transaction.category = category
+            transaction.categorization_status = "categorized"
+            history.append(
+                CategorizationHistory(
+                    transaction=transaction,
+                    category=category,
+                    method="ai",
+                    confidence_score=confidence,
+                )
+            )
+            results["categorized"] += 1
+            logger.debug(f"AI categorized transaction {txn_id}: {category.name} (confidence: {confidence}%)")
 
-            # Mark any uncategorized transactions that AI didn't categorize
-            for transaction in transactions:
-                if transaction.categorization_status == "pending_ai":
-                    transaction.categorization_status = "uncategorized"
-                    transaction.save()
-                    results["skipped"] += 1
+        # Mark any uncategorized transactions that AI didn't categorize
+        skipped = [t for t in transactions if t.categorization_status == "pending_ai"]
+        for transaction in skipped:
+            transaction.categorization_status = "uncategorized"
+        results["skipped"] = len(skipped)
+        defaulted = self._default_missing_categories(skipped)
 
+        assign_flow_classes([*(t for t in transactions if t.categorization_status == "categorized"), *defaulted])
+        try:
+            with db_transaction.atomic():
+                Transaction.objects.bulk_update(
+                    transactions,
+                    ["category", "categorization_status", "flow_class"],
+                    batch_size=500,
+                )
+                CategorizationHistory.objects.bulk_create(history, batch_size=500)
+                refresh_for_transactions(transactions)
+                invalidate_dashboards(txn.user_id for txn in transactions)
         except Exception as e:
-            logger.error(f"Error in batch AI categorization: {str(e)}")
-            # Mark all transactions as uncategorized (remove pending status)
-            for transaction in transactions:
-                if transaction.categorization_status == "pending_ai":
-                    transaction.categorization_status = "uncategorized"
-                    transaction.save()
-            results["failed"] = len(transactions)
+            logger.error(f"Error applying AI categorizations for batch: {str(e)}")
+            return {"categorized": 0, "failed": len(transactions), "skipped": 0}
 
         return results
 
-    def _build_batch_prompt(self, transactions: list[Transaction], categories: list[TransactionCategory]) -> str:
+    def _release_failed_batch(self, transactions: list[Transaction]) -> dict:
+        """Mark all transactions as uncategorized (remove pending status) after a failed request."""
+        pending = [t for t in transactions if t.categorization_status == "pending_ai"]
+        for transaction in pending:
+            transaction.categorization_status = "uncategorized"
+        defaulted = self._default_missing_categories(pending)
+        assign_flow_classes(defaulted)
+        with db_transaction.atomic():
+            Transaction.objects.bulk_update(
+                pending, ["category", "categorization_status", "flow_class"], batch_size=500
+            )
+            if defaulted:
+                refresh_for_transactions(defaulted)
+                invalidate_dashboards(txn.user_id for txn in defaulted)
+        return {"categorized": 0, "failed": len(transactions), "skipped": 0}
+
+    def _default_missing_categories(self, transactions: list[Transaction]) -> list[Transaction]:
+        """Give rows without a category the user's Uncategorized category, as Transaction.save would."""
+        uncategorized: dict[int, TransactionCategory] = {}
+        defaulted = [t for t in transactions if t.category_id is None]
+        for transaction in defaulted:
+            if transaction.user_id not in uncategorized:
+                uncategorized[transaction.user_id] = TransactionCategory.get_uncategorized_for_user(transaction.user)
+            transaction.category = uncategorized[transaction.user_id]
+        return defaulted
+
+    def _build_batch_prompt(self, transactions: list[Transaction], catalog: CategoryCatalog) -> str:
         """
-        Build an efficient batch prompt for multiple transactions.
+        Build a compact batch prompt: an indexed category table and one row per transaction.
 
         Args:
             transactions: List of transactions
-            categories: Available categories
+            catalog: Available categories
 
         Returns:
             Formatted prompt string
         """
-        # Build category list (simplified for token efficiency)
-        category_names = []
-        for cat in categories:
-            if cat.parent:
-                category_names.append(f"{cat.parent.name} > {cat.name}")
-            else:
-                category_names.append(cat.name)
-
-        # Build transaction list
-        transaction_list = []
-        for idx, txn in enumerate(transactions, 1):
-            merchant_info = f" | Merchant: {txn.merchant.name}" if txn.merchant else ""
-            transaction_list.append(
-                f'{idx}. ID:{txn.id} | "{txn.description}" | ${txn.amount} | {txn.date}{merchant_info}'
-            )
-
-        prompt = f"""You are a financial transaction categorization assistant. Categorize these {len(transactions)} transactions into the most appropriate categories.
+        transaction_rows = "\n".join(format_transaction_line(txn) for txn in transactions)
 
-Available Categories:
-{", ".join(category_names)}
+        prompt = f"""You are a financial transaction categorization assistant. Pick the best category for each transaction.
 
-Transactions to Categorize:
-{chr(10).join(transaction_list)}
+Categories (index|name):
+{catalog.table()}
 
-Respond with ONLY a JSON array, no additional text:
-[
-  {{"id": {transactions[0].id}, "category": "Category Name", "confidence": 85}},
-  ...
-]
+Transactions (id|description|amount|date):
+{transaction_rows}
 
-Rules:
-- Use exact category names from the list
-- Confidence: 0-100 (higher = more certain)
-- Include all {len(transactions)} transactions
-- Match transaction ID exactly"""
+Respond with ONLY a JSON array, one object per transaction, no additional text:
+[{{"id": <transaction id>, "c": <category index>, "p": <confidence 0-100>}}]"""
 
         return prompt
 
     def _parse_batch_response(
         self,
         response: str,
-        transactions: list[Transaction],
-        categories: list[TransactionCategory],
+        catalog: CategoryCatalog,
     ) -> list[tuple[int, TransactionCategory, Decimal]]:
         """
         Parse AI batch response and match to transactions/categories.
 
         Args:
             response: AI response string
-            transactions: Original transactions
-            categories: Available categories
+            catalog: Categories the prompt's indexes refer to
 
         Returns:
             List of tuples (transaction_id, category, confidence_score)
@@ -224,26 +420,20 @@ Rules:
                 logger.error("AI response is not a JSON array")
                 return categorizations
 
-            # Build category lookup for fast matching
-            category_lookup = {}
-            for cat in categories:
-                category_lookup[cat.name.lower()] = cat
-                category_lookup[cat.full_path.lower()] = cat
-
             # Process each categorization
             for item in data:
                 try:
                     txn_id = int(item.get("id", 0))
-                    category_name = item.get("category", "").lower()
-                    confidence = Decimal(str(item.get("confidence", 0)))
+                    confidence = Decimal(str(item.get("p", item.get("confidence", 0))))
 
                     # Find matching category
-                    category = category_lookup.get(category_name)
+                    category = catalog.resolve(item)
 
                     if category and txn_id:
                         categorizations.append((txn_id, category, confidence))
                     else:
-                        logger.warning(f"Could not match transaction {txn_id} to category '{category_name}'")
+                        answer = item.get("c", item.get("category"))
+                        logger.warning(f"Could not match transaction {txn_id} to category {answer!r}")
 
                 except Exception as e:
                     logger.error(f"Error parsing categorization item: {str(e)}")
@@ -271,32 +461,21 @@ Rules:
         """
         # Get transactions with pending_ai status
         pending_transactions = list(
-            Transaction.objects.filter(user=user, categorization_status="pending_ai").select_related("merchant")[:limit]
+            Transaction.objects.filter(user=user, categorization_status="pending_ai").select_related("category")[:limit]
         )
 
         if not pending_transactions:
             logger.info(f"No pending transactions for user {user.username}")
-            return {"total": 0, "categorized": 0, "failed": 0, "skipped": 0}
+            return self._empty_results(0)
 
         logger.info(f"Processing {len(pending_transactions)} pending transactions for user {user.username}")
 
         # Get categories
-        categories = self.category_repository.get_all_for_user(user, include_global=True)
+        categories = self.category_repository.get_all_for_user(user)
 
-        results = {
-            "total": len(pending_transactions),
-            "categorized": 0,
-            "failed": 0,
-            "skipped": 0,
-        }
+        results = self._empty_results(len(pending_transactions))
 
-        # Process in batches
-        for i in range(0, len(pending_transactions), self.batch_size):
-            batch = pending_transactions[i : i + self.batch_size]
-            batch_results = self._categorize_batch(batch, categories, user)
-
-            results["categorized"] += batch_results["categorized"]
-            results["failed"] += batch_results["failed"]
-            results["skipped"] += batch_results["skipped"]
+        if categories:
+            self._categorize_in_batches(pending_transactions, categories, user, results)
 
         return results
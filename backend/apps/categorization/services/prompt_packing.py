@@ -0,0 +1,122 @@
+"""Token-budgeted packing of transactions into AI categorization prompts.
+
+Instead of a fixed number of transactions per request, each prompt is filled
+until its estimated size (prompt plus expected answer) reaches
+``AI_CATEGORIZATION_PROMPT_TOKEN_BUDGET``. Categories are sent once per prompt
+as a compact ``index|name`` table and the model answers with indexes, which
+keeps both the prompt header and the per-transaction answer short.
+
+Token counts are estimated at roughly four characters per token, which is
+close enough for budgeting English merchant strings and needs no tokenizer.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from apps.transaction.models import Transaction, TransactionCategory
+
+CHARS_PER_TOKEN = 4
+# Answer size per transaction: {"id": 1234567, "c": 12, "p": 85},
+OUTPUT_TOKENS_PER_ITEM = 14
+DEFAULT_TOKEN_BUDGET = 6000
+DEFAULT_MAX_BATCH_SIZE = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_transaction_line(transaction: Transaction) -> str:
+    """One ``id|description|amount|date`` row of the prompt's transaction table."""
+    description = " ".join((transaction.description or "").replace("|", "/").split())
+    return f"{transaction.id}|{description}|{transaction.amount}|{transaction.date}"
+
+
+@dataclass
+class CategoryCatalog:
+    """A user's categories as an indexed table, plus lookups to resolve answers."""
+
+    categories: list[TransactionCategory]
+    names: list[str] = field(default_factory=list)
+    by_name: dict[str, TransactionCategory] = field(default_factory=dict)
+
+    @classmethod
+    def from_categories(cls, categories: list[TransactionCategory]) -> CategoryCatalog:
+        """Build the catalog (touches category parents, so call it on the request thread)."""
+        catalog = cls(categories=list(categories))
+        for cat in catalog.categories:
+            catalog.names.append(f"{cat.parent.name} > {cat.name}" if cat.parent else cat.name)
+            catalog.by_name[cat.name.lower()] = cat
+            catalog.by_name[cat.full_path.lower()] = cat
+        return catalog
+
+    def table(self) -> str:
+        """Compact ``index|name`` table for the prompt."""
+        return "\n".join(f"{index}|{name}" for index, name in enumerate(self.names))
+
+    def resolve(self, item: dict) -> TransactionCategory | None:
+        """Category for an answer item, by index ("c") or, as a fallback, by name ("category")."""
+        index = item.get("c")
+        if index is not None:
+            try:
+                index = int(index)
+            except (TypeError, ValueError):
+                index = None
+            if index is not None and 0 <= index < len(self.categories):
+                return self.categories[index]
+        name = item.get("category")
+        if name:
+            return self.by_name.get(str(name).strip().lower())
+        return None
+
+
+@dataclass
+class PackedBatch:
+    """Transactions sharing one prompt, with the prompt's estimated token cost."""
+
+    transactions: list[Transaction]
+    estimated_tokens: int
+
+
+class PromptPacker:
+    """Greedily fills prompts up to a token budget."""
+
+    def __init__(self, token_budget: int | None = None, max_batch_size: int | None = None):
+        if token_budget is None:
+            token_budget = getattr(settings, "AI_CATEGORIZATION_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+        if max_batch_size is None:
+            max_batch_size = getattr(settings, "AI_CATEGORIZATION_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)
+        self.token_budget = token_budget
+        self.max_batch_size = max(1, max_batch_size)
+
+    def pack(self, transactions: list[Transaction], header_tokens: int) -> list[PackedBatch]:
+        """
+        Split transactions into prompts that fit the budget.
+
+        Args:
+            transactions: Transactions to send, in order
+            header_tokens: Estimated tokens of the prompt without any transactions
+
+        Returns:
+            Batches in order; a single oversized transaction still gets its own batch
+        """
+        batches: list[PackedBatch] = []
+        current: list[Transaction] = []
+        current_tokens = header_tokens
+
+        for txn in transactions:
+            cost = estimate_tokens(format_transaction_line(txn)) + 1 + OUTPUT_TOKENS_PER_ITEM
+            if current and (current_tokens + cost > self.token_budget or len(current) >= self.max_batch_size):
+                batches.append(PackedBatch(current, current_tokens))
+                current, current_tokens = [], header_tokens
+            current.append(txn)
+            current_tokens += cost
+
+        if current:
+            batches.append(PackedBatch(current, current_tokens))
+        return batches
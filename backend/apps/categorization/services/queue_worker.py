@@ -0,0 +1,238 @@
+"""Claim-based worker for the AI categorization queue.
+
+Any number of workers, in one or many processes or hosts, can drain
+``CategorizationQueue`` concurrently. Each claims one pending row at a time
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` followed by a conditional status
+update, so a row is only ever processed by the worker that claimed it. On
+backends without row locks (SQLite) the conditional update alone guards the
+claim.
+
+While processing, the worker heartbeats ``heartbeat_at`` after each batch.
+Rows left in ``processing`` by a crashed worker are returned to ``pending``
+once their heartbeat is older than ``stale_after_seconds``, and failed after
+``max_attempts`` claims.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from loguru import logger
+
+from apps.categorization.models import CategorizationQueue
+from apps.categorization.services.batch_ai_service import BatchAICategorizationService
+
+DEFAULT_HEARTBEAT_SECONDS = 30.0
+DEFAULT_STALE_AFTER_SECONDS = 600.0
+DEFAULT_POLL_SECONDS = 5.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class QueueWorkerStats:
+    """Throughput counters for one worker."""
+
+    worker_id: str
+    items: int = 0
+    transactions: int = 0
+    categorized: int = 0
+    failed: int = 0
+    total_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+
+    def record(self, results: dict, lag_seconds: float) -> None:
+        self.items += 1
+        self.transactions += results["total"]
+        self.categorized += results["categorized"]
+        self.failed += results["failed"]
+        self.total_lag_seconds += lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+
+    @property
+    def transactions_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.transactions / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def avg_lag_seconds(self) -> float:
+        return self.total_lag_seconds / self.items if self.items else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"worker {self.worker_id}: {self.items} items, {self.transactions} transactions "
+            f"({self.transactions_per_second:.1f}/s), {self.categorized} categorized, {self.failed} failed, "
+            f"queue lag avg {self.avg_lag_seconds:.1f}s max {self.max_lag_seconds:.1f}s"
+        )
+
+
+class CategorizationQueueWorker:
+    """Claims and processes CategorizationQueue rows until the queue is empty or stopped."""
+
+    def __init__(
+        self,
+        worker_id: str = "0",
+        batch_size: int | None = None,
+        username: str | None = None,
+        heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+        stale_after_seconds: float = DEFAULT_STALE_AFTER_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        service_factory: Callable[[], BatchAICategorizationService] = BatchAICategorizationService,
+    ):
+        self.worker_id = worker_id
+        self.batch_size = batch_size
+        self.username = username
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.service_factory = service_factory
+        self.stats = QueueWorkerStats(worker_id=worker_id)
+        self._service: BatchAICategorizationService | None = None
+
+    @property
+    def service(self) -> BatchAICategorizationService:
+        if self._service is None:
+            self._service = self.service_factory()
+            if self.batch_size:
+                self._service.batch_size = self.batch_size
+        return self._service
+
+    def _pending(self):
+        queryset = CategorizationQueue.objects.filter(status="pending")
+        if self.username:
+            queryset = queryset.filter(user__username=self.username)
+        return queryset
+
+    def claim_next(self) -> CategorizationQueue | None:
+        """Claim the oldest pending row no other worker holds, or return None."""
+        while True:
+            with transaction.atomic():
+                candidate_id = (
+                    self._pending()
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .order_by("created_at", "id")
+                    .values_list("id", flat=True)
+                    .first()
+                )
+                if candidate_id is None:
+                    return None
+
+                now = timezone.now()
+                claimed = CategorizationQueue.objects.filter(pk=candidate_id, status="pending").update(
+                    status="processing",
+                    started_at=now,
+                    heartbeat_at=now,
+                    attempts=F("attempts") + 1,
+                )
+            if claimed:
+                return CategorizationQueue.objects.select_related("user").get(pk=candidate_id)
+            # Another worker won the race on a backend without row locks; try the next row.
+
+    def heartbeat(self, item: CategorizationQueue, processed: int | None = None) -> None:
+        """Record that item is still being worked on (and optionally its progress)."""
+        fields = {"heartbeat_at": timezone.now()}
+        if processed is not None:
+            fields["transactions_processed"] = processed
+        CategorizationQueue.objects.filter(pk=item.pk, status="processing").update(**fields)
+
+    def recover_stale(self) -> int:
+        """Return rows whose worker stopped heartbeating to pending, or fail them after max_attempts."""
+        cutoff = timezone.now() - timedelta(seconds=self.stale_after_seconds)
+        stale = Q(status="processing") & (
+            Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+        )
+
+        failed = CategorizationQueue.objects.filter(stale, attempts__gte=self.max_attempts).update(
+            status="failed",
+            completed_at=timezone.now(),
+            error_message=f"Abandoned after {self.max_attempts} attempts without a heartbeat",
+        )
+        requeued = CategorizationQueue.objects.filter(stale).update(status="pending", heartbeat_at=None)
+        if requeued or failed:
+            logger.warning(f"Recovered stale categorization queue items: {requeued} requeued, {failed} failed")
+        return requeued + failed
+
+    def process(self, item: CategorizationQueue) -> dict:
+        """Categorize a claimed item and record the outcome on it."""
+        lag_seconds = (item.started_at - item.created_at).total_seconds()
+        last_beat = time.monotonic()
+
+        def on_progress(processed: int) -> None:
+            nonlocal last_beat
+            if time.monotonic() - last_beat >= self.heartbeat_seconds:
+                self.heartbeat(item, processed)
+                last_beat = time.monotonic()
+
+        try:
+            results = self.service.categorize_transaction_ids(item.transaction_ids, item.user, on_progress)
+        except Exception as e:
+            error_msg = f"Error processing queue item {item.id}: {str(e)}"
+            logger.error(error_msg)
+            item.mark_failed(error_msg)
+            raise
+
+        item.mark_completed(
+            categorized=results["categorized"],
+            failed=results["failed"],
+            processed=results["total"],
+        )
+        self.stats.record(results, lag_seconds)
+        return results
+
+    def run_once(
+        self,
+        limit: int | None = None,
+        on_item: Callable[[CategorizationQueue, dict], None] | None = None,
+    ) -> int:
+        """
+        Drain the queue in this thread.
+
+        Args:
+            limit: Maximum items to process, or None for all
+            on_item: Optional callback with each item and its results
+
+        Returns:
+            Number of items processed (including failures)
+        """
+        self.recover_stale()
+        processed = 0
+        while limit is None or processed < limit:
+            item = self.claim_next()
+            if item is None:
+                break
+            processed += 1
+            try:
+                results = self.process(item)
+            except Exception as e:
+                if on_item:
+                    on_item(item, {"error": str(e)})
+                continue
+            if on_item:
+                on_item(item, results)
+        return processed
+
+    def run_forever(self, stop: threading.Event, stats_seconds: float = 60.0) -> None:
+        """Process items as they arrive until stop is set, logging throughput periodically."""
+        last_stats = time.monotonic()
+        while not stop.is_set():
+            try:
+                processed = self.run_once(limit=1)
+            except Exception as e:
+                logger.error(f"Categorization worker {self.worker_id} error: {e}")
+                processed = 0
+
+            if time.monotonic() - last_stats >= stats_seconds:
+                logger.info(self.stats.summary() + f", queue depth {self._pending().count()}")
+                last_stats = time.monotonic()
+
+            if not processed:
+                stop.wait(self.poll_seconds)
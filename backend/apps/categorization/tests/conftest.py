@@ -0,0 +1,175 @@
+"""Shared fixtures for categorization tests, including a local OpenAI stub server."""
+
+import json
+import re
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory
+
+
+class StubOpenAIServer:
+    """Minimal chat-completions server answering batch prompts offline.
+
+    Every transaction row in a batch prompt is answered with the index of
+    ``category_name``; other prompts get a single-transaction JSON answer. The
+    next ``rate_limit_remaining`` requests get a 429 to exercise retries.
+    """
+
+    def __init__(self, category_name: str, delay_seconds: float = 0.0, rate_limit_remaining: int = 0):
+        self.category_name = category_name
+        self.delay_seconds = delay_seconds
+        self.rate_limit_remaining = rate_limit_remaining
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def answer(self, prompt: str) -> str:
+        if "Transactions (id|" not in prompt:  # single-transaction prompt
+            return json.dumps({"category": self.category_name, "confidence": 90, "reasoning": "stub"})
+        table = dict(re.findall(r"^(\d+)\|([^|\n]+)$", prompt, re.MULTILINE))
+        index = next(int(i) for i, name in table.items() if name == self.category_name)
+        ids = self.transaction_ids(prompt)
+        return json.dumps([{"id": i, "c": index, "p": 90} for i in ids])
+
+    @staticmethod
+    def transaction_ids(prompt: str) -> list[int]:
+        rows = prompt.split("Transactions (id|description|amount|date):\n", 1)[1].split("\n\n", 1)[0]
+        return [int(row.split("|", 1)[0]) for row in rows.splitlines() if row]
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with stub._lock:
+                    stub.requests += 1
+                    if stub.rate_limit_remaining > 0:
+                        stub.rate_limit_remaining -= 1
+                        stub.rate_limited += 1
+                        limited = True
+                    else:
+                        limited = False
+                        stub.prompts.append(prompt)
+                        stub.in_flight += 1
+                        stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+
+                if limited:
+                    self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}}, retry_after="0")
+                    return
+
+                try:
+                    time.sleep(stub.delay_seconds)
+                    self._send(
+                        200,
+                        {
+                            "id": "chatcmpl-stub",
+                            "object": "chat.completion",
+                            "created": 0,
+                            "model": body.get("model", "stub"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": stub.answer(prompt)},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                        },
+                    )
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _send(self, status_code, payload, retry_after=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", retry_after)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="ai_user", email="ai@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="AI Account",
+        account_type="checking",
+        balance=Decimal("1000.00"),
+    )
+
+
+@pytest.fixture
+def stub_category(user):
+    return TransactionCategory.objects.create(user=user, name="Zzq Streaming", slug="zzq-streaming", type="expense")
+
+
+@pytest.fixture
+def stub_openai(monkeypatch, stub_category):
+    """Start a stub server and point the OpenAI client at it. Tune attributes before use."""
+    server = StubOpenAIServer(stub_category.name).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_BACKOFF_SECONDS", "0")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_pending_transactions(user, account):
+    def make(count: int, description: str = "NETFLIX.COM", unique: bool = True) -> list[Transaction]:
+        ids = [
+            Transaction.objects.create(
+                user=user,
+                account=account,
+                date=date(2024, 1, 1),
+                amount=Decimal("15.49"),
+                transaction_type="debit",
+                description=f"{description} #{i}" if unique else description,
+            ).id
+            for i in range(count)
+        ]
+        # save() resets pending_ai on uncategorized rows; set the queue status directly.
+        Transaction.objects.filter(id__in=ids).update(categorization_status="pending_ai")
+        return list(Transaction.objects.filter(id__in=ids).order_by("id"))
+
+    return make
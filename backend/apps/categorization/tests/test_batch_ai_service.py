@@ -0,0 +1,251 @@
+"""Tests for batch AI categorization against a local OpenAI stub server."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.categorization.models import AICategorizationCache, CategorizationHistory
+from apps.categorization.services.ai_categorization_service import AICategorizationService
+from apps.categorization.services.ai_result_cache import (
+    AICategorizationResultCache,
+    category_set_fingerprint,
+    normalize_description,
+)
+from apps.categorization.services.batch_ai_service import BatchAICategorizationService
+from apps.categorization.services.prompt_packing import CategoryCatalog, PromptPacker, estimate_tokens
+from apps.core.constants import flow_class_for
+from apps.transaction.models import Transaction, TransactionCategory, TransactionMonthlyRollup
+from apps.transaction.services.monthly_rollup import check_rollup_consistency, rebuild_rollups
+
+
+class TestConcurrentDispatch:
+    def test_dispatches_batches_concurrently(self, user, stub_openai, stub_category, make_pending_transactions):
+        stub_openai.delay_seconds = 0.2
+        transactions = make_pending_transactions(12)
+
+        service = BatchAICategorizationService(max_in_flight=3)
+        service.batch_size = 2
+        results = service.categorize_transaction_ids([t.id for t in transactions], user)
+
+        assert results["categorized"] == 12 and results["failed"] == 0
+        assert stub_openai.requests == 6
+        assert 1 < stub_openai.max_in_flight <= 3
+        assert set(Transaction.objects.filter(user=user).values_list("category_id", flat=True)) == {stub_category.id}
+        assert CategorizationHistory.objects.filter(transaction__user=user, method="ai").count() == 12
+
+    def test_serial_mode_sends_one_request_at_a_time(self, user, stub_openai, make_pending_transactions):
+        transactions = make_pending_transactions(6)
+
+        service = BatchAICategorizationService(max_in_flight=1)
+        service.batch_size = 2
+        results = service.categorize_transaction_ids([t.id for t in transactions], user)
+
+        assert results["categorized"] == 6
+        assert stub_openai.max_in_flight == 1
+
+    def test_retries_rate_limited_requests(self, user, stub_openai, make_pending_transactions):
+        stub_openai.rate_limit_remaining = 2
+        transactions = make_pending_transactions(4)
+
+        service = BatchAICategorizationService(max_in_flight=2)
+        service.batch_size = 2
+        results = service.process_pending_transactions(user)
+
+        assert results["categorized"] == 4
+        assert stub_openai.rate_limited == 2
+        assert stub_openai.requests == 4
+        assert not Transaction.objects.filter(id__in=[t.id for t in transactions], categorization_status="pending_ai")
+
+    def test_failed_batch_releases_pending_rows(self, user, stub_openai, monkeypatch, make_pending_transactions):
+        monkeypatch.setenv("OPENAI_MAX_RETRIES", "0")
+        stub_openai.rate_limit_remaining = 100
+        transactions = make_pending_transactions(4)
+
+        service = BatchAICategorizationService(max_in_flight=2)
+        service.batch_size = 2
+        results = service.categorize_transaction_ids([t.id for t in transactions], user)
+
+        assert results["categorized"] == 0 and results["failed"] == 4
+        statuses = set(Transaction.objects.filter(user=user).values_list("categorization_status", flat=True))
+        assert statuses == {"uncategorized"}
+
+
+class TestBulkPersistence:
+    def test_applies_batch_with_constant_queries_and_no_balance_signals(
+        self, user, account, stub_openai, stub_category, make_pending_transactions, django_assert_num_queries
+    ):
+        transactions = make_pending_transactions(30)
+        account.refresh_from_db()
+        balance_before = account.balance
+        service = BatchAICategorizationService(max_in_flight=1)
+        catalog = CategoryCatalog.from_categories([stub_category])
+        answer = stub_openai.answer(service._build_batch_prompt(transactions[:25], catalog))
+        categorizations = service._parse_batch_response(answer, catalog)
+
+        # savepoint, one bulk UPDATE, one bulk INSERT, rollup refresh (account lock, select, delete, insert), release
+        with django_assert_num_queries(8):
+            results = service._apply_batch_results(transactions, categorizations)
+
+        assert results == {"categorized": 25, "failed": 0, "skipped": 5}
+        statuses = dict(Transaction.objects.filter(user=user).values_list("id", "categorization_status"))
+        assert [statuses[t.id] for t in transactions] == ["categorized"] * 25 + ["uncategorized"] * 5
+        assert CategorizationHistory.objects.filter(transaction__user=user).count() == 25
+        account.refresh_from_db()
+        assert account.balance == balance_before
+
+    def test_duplicate_ids_in_response_are_applied_once(
+        self, user, stub_openai, stub_category, make_pending_transactions
+    ):
+        transactions = make_pending_transactions(2)
+        service = BatchAICategorizationService(max_in_flight=1)
+        catalog = CategoryCatalog.from_categories([stub_category])
+        answer = stub_openai.answer(service._build_batch_prompt([transactions[0], *transactions], catalog))
+
+        results = service._apply_batch_results(transactions, service._parse_batch_response(answer, catalog))
+
+        assert results["categorized"] == 2
+        assert CategorizationHistory.objects.filter(transaction__user=user).count() == 2
+
+    def test_skipped_rows_without_category_get_uncategorized(
+        self, user, stub_openai, stub_category, make_pending_transactions
+    ):
+        transactions = make_pending_transactions(2)
+        Transaction.objects.filter(id__in=[t.id for t in transactions]).update(category=None)
+        transactions = list(Transaction.objects.filter(id__in=[t.id for t in transactions]).order_by("id"))
+        service = BatchAICategorizationService(max_in_flight=1)
+        catalog = CategoryCatalog.from_categories([stub_category])
+        answer = stub_openai.answer(service._build_batch_prompt(transactions[:1], catalog))
+
+        results = service._apply_batch_results(transactions, service._parse_batch_response(answer, catalog))
+
+        assert results["skipped"] == 1
+        skipped = Transaction.objects.get(id=transactions[1].id)
+        assert skipped.category == TransactionCategory.get_uncategorized_for_user(user)
+        assert skipped.categorization_status == "uncategorized"
+
+    def test_released_rows_without_category_get_uncategorized(self, user, stub_openai, make_pending_transactions):
+        transactions = make_pending_transactions(2)
+        Transaction.objects.filter(id__in=[t.id for t in transactions]).update(category=None, flow_class="expense")
+        rebuild_rollups(user.id)
+        transactions = list(Transaction.objects.filter(id__in=[t.id for t in transactions]))
+
+        BatchAICategorizationService(max_in_flight=1)._release_failed_batch(transactions)
+
+        uncategorized = TransactionCategory.get_uncategorized_for_user(user)
+        assert set(Transaction.objects.filter(user=user).values_list("category_id", flat=True)) == {uncategorized.id}
+        rollup = TransactionMonthlyRollup.objects.get(user=user)
+        assert rollup.category_id == uncategorized.id
+        assert rollup.flow_class == flow_class_for(uncategorized.type, uncategorized.slug, "debit")
+        assert check_rollup_consistency(user.id) == []
+
+
+class TestResultCache:
+    def test_normalizes_reference_numbers_and_punctuation(self):
+        assert normalize_description("UBER *TRIP 8842") == normalize_description("Uber Trip")
+        assert normalize_description("NETFLIX.COM 866-579-7172 CA") == "netflix com ca"
+        assert normalize_description("7-ELEVEN #12") == "7 eleven 12"
+
+    def test_fingerprint_ignores_order_and_case(self):
+        assert category_set_fingerprint(["Food", "Travel"]) == category_set_fingerprint(["travel", "FOOD"])
+        assert category_set_fingerprint(["Food"]) != category_set_fingerprint(["Food", "Travel"])
+
+    def test_repeat_descriptions_are_sent_once_then_served_from_cache(
+        self, user, stub_openai, stub_category, make_pending_transactions
+    ):
+        first = make_pending_transactions(5, description="NETFLIX.COM 8665797172", unique=False)
+        service = BatchAICategorizationService(max_in_flight=1, use_cache=True)
+
+        results = service.categorize_transaction_ids([t.id for t in first], user)
+
+        assert results["categorized"] == 5
+        assert stub_openai.requests == 1
+        assert len(stub_openai.transaction_ids(stub_openai.prompts[0])) == 1
+        assert results["cache_hits"] == 0 and results["cache_misses"] == 5
+
+        second = make_pending_transactions(3, description="Netflix.com 1234567", unique=False)
+        results = service.process_pending_transactions(user)
+
+        assert stub_openai.requests == 1
+        assert results["cache_hits"] == 3
+        assert results["cache_hit_rate"] == 1.0
+        categories = set(
+            Transaction.objects.filter(id__in=[t.id for t in second]).values_list("category_id", flat=True)
+        )
+        assert categories == {stub_category.id}
+
+    def test_cache_is_scoped_to_the_category_set(self, user, stub_openai, stub_category, make_pending_transactions):
+        service = BatchAICategorizationService(max_in_flight=1, use_cache=True)
+        service.categorize_transaction_ids([t.id for t in make_pending_transactions(1)], user)
+
+        TransactionCategory.objects.create(user=user, name="Zzq New", slug="zzq-new", type="expense")
+        make_pending_transactions(1)
+        service.process_pending_transactions(user)
+
+        assert stub_openai.requests == 2
+
+    def test_expired_and_excess_entries_are_pruned(self, db):
+        cache = AICategorizationResultCache(ttl_days=30, max_entries=2)
+        cache.set_many("fp", {f"merchant {i}": ("food", Decimal("90")) for i in range(4)})
+        AICategorizationCache.objects.filter(normalized_description="merchant 0").update(
+            created_at=timezone.now() - timedelta(days=31)
+        )
+
+        assert cache.get_many("fp", ["merchant 0"]) == {}
+        assert cache.prune() == 2
+        assert AICategorizationCache.objects.count() == 2
+
+    def test_low_confidence_answers_are_not_cached(self, db):
+        cache = AICategorizationResultCache()
+        assert cache.set_many("fp", {"maybe food": ("food", Decimal("20"))}) == 0
+
+    def test_suggest_category_consults_cache(self, user, stub_openai, stub_category, make_pending_transactions):
+        first, second = make_pending_transactions(2, description="UBER *TRIP", unique=False)
+        service = AICategorizationService(use_cache=True)
+
+        assert service.suggest_category(first) == (stub_category, Decimal("90"))
+        assert service.suggest_category(second) == (stub_category, Decimal("90.00"))
+        assert stub_openai.requests == 1
+
+
+class TestPromptPacking:
+    def test_packs_up_to_token_budget(self, user, stub_category, make_pending_transactions):
+        transactions = make_pending_transactions(20)
+        header_tokens = 100
+        per_row = estimate_tokens(f"{transactions[0].id}|NETFLIX.COM #0|15.49|2024-01-01") + 1 + 14
+
+        packed = PromptPacker(token_budget=header_tokens + 6 * per_row, max_batch_size=50).pack(
+            transactions, header_tokens
+        )
+
+        assert [len(batch.transactions) for batch in packed] == [6, 6, 6, 2]
+        assert all(batch.estimated_tokens <= header_tokens + 6 * per_row for batch in packed)
+        assert [t for batch in packed for t in batch.transactions] == transactions
+
+    def test_max_batch_size_caps_large_budgets(self, user, make_pending_transactions):
+        transactions = make_pending_transactions(5)
+
+        packed = PromptPacker(token_budget=100_000, max_batch_size=2).pack(transactions, 10)
+
+        assert [len(batch.transactions) for batch in packed] == [2, 2, 1]
+
+    def test_catalog_resolves_indexes_and_names(self, user, stub_category):
+        other = TransactionCategory.objects.create(user=user, name="Zzq Other", slug="zzq-other", type="expense")
+        catalog = CategoryCatalog.from_categories([stub_category, other])
+
+        assert catalog.table() == "0|Zzq Streaming\n1|Zzq Other"
+        assert catalog.resolve({"c": 1}) == other
+        assert catalog.resolve({"c": "0"}) == stub_category
+        assert catalog.resolve({"c": 7, "category": "zzq other"}) == other
+        assert catalog.resolve({"c": 7}) is None
+
+    def test_reports_token_usage_and_requests(self, user, stub_openai, make_pending_transactions, settings):
+        settings.AI_CATEGORIZATION_PROMPT_TOKEN_BUDGET = 100_000
+        make_pending_transactions(40)
+
+        results = BatchAICategorizationService(max_in_flight=1, use_cache=False).process_pending_transactions(user)
+
+        assert results["categorized"] == 40
+        assert results["requests"] == stub_openai.requests == 1
+        assert results["estimated_tokens"] >= estimate_tokens(stub_openai.prompts[0])
+        assert results["tokens_per_categorized"] == round(results["estimated_tokens"] / 40, 1)
@@ -0,0 +1,98 @@
+"""Tests for the claim-based categorization queue worker."""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.categorization.models import CategorizationQueue
+from apps.categorization.services.queue_worker import CategorizationQueueWorker
+from apps.transaction.models import Transaction
+
+
+def _queue(user, transaction_ids):
+    return CategorizationQueue.objects.create(user=user, transaction_ids=transaction_ids)
+
+
+class TestClaiming:
+    def test_claimed_item_is_not_claimed_again(self, user):
+        first = _queue(user, [1])
+        second = _queue(user, [2])
+
+        worker_a = CategorizationQueueWorker("a")
+        worker_b = CategorizationQueueWorker("b")
+
+        assert worker_a.claim_next().id == first.id
+        assert worker_b.claim_next().id == second.id
+        assert worker_a.claim_next() is None
+
+        first.refresh_from_db()
+        assert first.status == "processing"
+        assert first.attempts == 1
+        assert first.heartbeat_at is not None
+
+    def test_user_filter(self, user, django_user_model):
+        other = django_user_model.objects.create_user(username="other", email="o@test.com", password="x")
+        _queue(other, [1])
+        mine = _queue(user, [2])
+
+        assert CategorizationQueueWorker(username=user.username).claim_next().id == mine.id
+
+
+class TestStaleRecovery:
+    def test_requeues_items_without_recent_heartbeat(self, user):
+        item = _queue(user, [1])
+        CategorizationQueueWorker().claim_next()
+        CategorizationQueue.objects.filter(pk=item.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        assert CategorizationQueueWorker(stale_after_seconds=60).recover_stale() == 1
+        item.refresh_from_db()
+        assert item.status == "pending"
+
+    def test_fresh_heartbeat_is_left_alone(self, user):
+        item = _queue(user, [1])
+        CategorizationQueueWorker().claim_next()
+
+        assert CategorizationQueueWorker(stale_after_seconds=60).recover_stale() == 0
+        item.refresh_from_db()
+        assert item.status == "processing"
+
+    def test_fails_after_max_attempts(self, user):
+        item = _queue(user, [1])
+        CategorizationQueue.objects.filter(pk=item.pk).update(
+            status="processing", attempts=3, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+
+        CategorizationQueueWorker(stale_after_seconds=60, max_attempts=3).recover_stale()
+        item.refresh_from_db()
+        assert item.status == "failed"
+
+
+class TestProcessing:
+    def test_run_once_drains_queue_and_records_stats(self, user, stub_openai, make_pending_transactions):
+        transactions = make_pending_transactions(6)
+        items = [_queue(user, [t.id for t in transactions[:3]]), _queue(user, [t.id for t in transactions[3:]])]
+
+        worker = CategorizationQueueWorker(batch_size=2, heartbeat_seconds=0)
+        assert worker.run_once() == 2
+
+        for item in items:
+            item.refresh_from_db()
+            assert item.status == "completed"
+            assert item.transactions_categorized == 3
+        assert worker.stats.items == 2
+        assert worker.stats.transactions == 6
+        assert worker.stats.categorized == 6
+        assert not Transaction.objects.filter(user=user, categorization_status="pending_ai").exists()
+
+    def test_command_processes_claimed_items(self, user, stub_openai, make_pending_transactions):
+        transactions = make_pending_transactions(2)
+        item = _queue(user, [t.id for t in transactions])
+
+        out = StringIO()
+        call_command("process_categorization_queue", stdout=out)
+
+        item.refresh_from_db()
+        assert item.status == "completed"
+        assert "Queue Items Processed: 1" in out.getvalue()
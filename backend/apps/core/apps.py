@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self):
+        """Register dashboard cache invalidation signals."""
+        import apps.core.services.dashboard_cache  # noqa: F401
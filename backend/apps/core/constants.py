@@ -4,23 +4,46 @@ from django.db.models import Q
 
 CC_PAYMENT_CATEGORY_SLUG = "credit-card-payment"
 
+FLOW_CLASS_CHOICES = [
+    ("income", "Income"),
+    ("expense", "Expense"),
+    ("investment", "Investment"),
+    ("transfer", "Transfer"),
+    ("cc_payment", "Credit Card Payment"),
+    ("other", "Other"),
+]
+
+
+def flow_class_for(category_type: str | None, category_slug: str | None, transaction_type: str) -> str:
+    """Classify a transaction's cash flow from its category and direction.
+
+    Credit-card payments are their own class; uncategorized rows fall back to
+    the transaction direction (debit = expense, credit = income); otherwise the
+    category type decides.
+    """
+    if category_slug == CC_PAYMENT_CATEGORY_SLUG:
+        return "cc_payment"
+    if category_type is None:
+        return "income" if transaction_type == "credit" else "expense"
+    return category_type
+
 
 def get_expense_filter() -> Q:
     """Q filter for expense transactions, excluding credit-card payments.
 
-    Expense = category.type == "expense" OR uncategorized debit.
+    Expense = category.type == "expense" OR uncategorized debit, precomputed
+    in the denormalized ``flow_class`` column.
     """
-    expense_filter = Q(category__type="expense") | Q(category__isnull=True, transaction_type="debit")
-    cc_payment_exclusion = ~Q(category__slug=CC_PAYMENT_CATEGORY_SLUG)
-    return expense_filter & cc_payment_exclusion
+    return Q(flow_class="expense")
 
 
 def get_income_filter() -> Q:
     """Q filter for income transactions.
 
-    Income = category.type == "income" OR uncategorized credit.
+    Income = category.type == "income" OR uncategorized credit, precomputed
+    in the denormalized ``flow_class`` column.
     """
-    return Q(category__type="income") | Q(category__isnull=True, transaction_type="credit")
+    return Q(flow_class="income")
 
 
 def get_investment_filter() -> Q:
@@ -28,4 +51,4 @@ def get_investment_filter() -> Q:
 
     Investment = category.type == "investment".
     """
-    return Q(category__type="investment")
+    return Q(flow_class="investment")
@@ -0,0 +1,246 @@
+"""Shared, bounded pool for long-running per-user background jobs.
+
+Views hand slow work (bulk recategorization, AI categorization, backups) to
+``background_jobs`` instead of starting a thread per request. A fixed number
+of worker threads bounds concurrent database connections, the queue has a
+hard depth limit, and users are served round-robin so one user submitting
+many jobs cannot starve everyone else.
+
+Tests run with ``RUN_BACKGROUND_JOB_WORKERS = False`` and call
+``background_jobs.run_pending()`` to execute queued jobs in the test thread.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.db import close_old_connections
+from loguru import logger
+
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_MAX_PER_USER = 3
+
+
+class BackgroundJobQueueFull(Exception):
+    """Raised when a job cannot be queued because a limit was reached."""
+
+
+def should_run_background_job_workers() -> bool:
+    """Worker threads are unsafe in pytest's transactional DB setup; tests run jobs explicitly."""
+    return getattr(settings, "RUN_BACKGROUND_JOB_WORKERS", True)
+
+
+@dataclass
+class BackgroundJob:
+    """A queued unit of work and its timing."""
+
+    user_id: int
+    name: str
+    func: Callable[[BackgroundJob], None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+
+    @property
+    def queue_wait_seconds(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return self.started_at - self.enqueued_at
+
+    @property
+    def run_seconds(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class BackgroundJobStats:
+    """Counters for the background job pool."""
+
+    submitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    total_queue_wait_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class BackgroundJobPool:
+    """Fixed-size worker pool with a bounded, per-user round-robin queue."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+        max_per_user: int | None = None,
+    ):
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._max_per_user = max_per_user
+        # user_id -> that user's pending jobs; users are served in rotation.
+        self._queues: OrderedDict[int, deque[BackgroundJob]] = OrderedDict()
+        self._queued = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads: list[threading.Thread] = []
+        self.stats = BackgroundJobStats()
+
+    @property
+    def max_workers(self) -> int:
+        if self._max_workers is not None:
+            return self._max_workers
+        return getattr(settings, "BACKGROUND_JOB_WORKERS", DEFAULT_WORKERS)
+
+    @property
+    def max_queue(self) -> int:
+        if self._max_queue is not None:
+            return self._max_queue
+        return getattr(settings, "BACKGROUND_JOB_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+
+    @property
+    def max_per_user(self) -> int:
+        if self._max_per_user is not None:
+            return self._max_per_user
+        return getattr(settings, "BACKGROUND_JOB_MAX_PER_USER", DEFAULT_MAX_PER_USER)
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return self._queued
+
+    def submit(self, user_id: int, func: Callable[[BackgroundJob], None], name: str = "job") -> BackgroundJob:
+        """
+        Queue func to run on a worker thread.
+
+        Args:
+            user_id: Owner of the job, used for per-user limits and fairness
+            func: Callable invoked with the BackgroundJob once it starts
+            name: Label used in logs
+
+        Returns:
+            The queued BackgroundJob
+
+        Raises:
+            BackgroundJobQueueFull: If the queue or the user's quota is full
+        """
+        job = BackgroundJob(user_id=user_id, name=name, func=func)
+        with self._cond:
+            user_queue = self._queues.get(user_id)
+            if self._queued >= self.max_queue:
+                self.stats.rejected += 1
+                raise BackgroundJobQueueFull("Background job queue is full, try again later")
+            if user_queue is not None and len(user_queue) >= self.max_per_user:
+                self.stats.rejected += 1
+                raise BackgroundJobQueueFull("Too many background jobs queued for this user")
+
+            if user_queue is None:
+                user_queue = self._queues[user_id] = deque()
+            user_queue.append(job)
+            self._queued += 1
+            self.stats.submitted += 1
+            self._cond.notify()
+
+        if should_run_background_job_workers():
+            self._ensure_workers()
+        return job
+
+    def _take_next(self) -> BackgroundJob | None:
+        """Pop the next job round-robin across users. Caller holds the lock."""
+        if not self._queues:
+            return None
+        user_id, user_queue = next(iter(self._queues.items()))
+        job = user_queue.popleft()
+        if user_queue:
+            self._queues.move_to_end(user_id)
+        else:
+            del self._queues[user_id]
+        self._queued -= 1
+        return job
+
+    def run_job(self, job: BackgroundJob) -> None:
+        """Run a job in the calling thread, recording timing and failures."""
+        job.started_at = time.monotonic()
+        try:
+            job.func(job)
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"Background job {job.name} for user {job.user_id} failed: {e}")
+        finally:
+            job.finished_at = time.monotonic()
+
+        with self._cond:
+            if job.error is None:
+                self.stats.completed += 1
+            else:
+                self.stats.failed += 1
+            self.stats.total_queue_wait_seconds += job.queue_wait_seconds
+            self.stats.total_run_seconds += job.run_seconds
+
+    def run_pending(self) -> int:
+        """Run all queued jobs in the calling thread. Returns jobs run."""
+        ran = 0
+        while True:
+            with self._cond:
+                job = self._take_next()
+            if job is None:
+                return ran
+            self.run_job(job)
+            ran += 1
+
+    def _ensure_workers(self) -> None:
+        with self._cond:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            self._stopping = False
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"background-job-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job = self._take_next()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._take_next()
+                if job is None:
+                    return
+            try:
+                close_old_connections()  # Ensure DB connection is usable in this thread
+                self.run_job(job)
+            finally:
+                close_old_connections()
+
+    def stop(self) -> None:
+        """Stop worker threads once the queue is drained (for testing/shutdown)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def clear(self) -> None:
+        """Drop queued jobs and reset counters (for tests)."""
+        with self._cond:
+            self._queues.clear()
+            self._queued = 0
+            self.stats = BackgroundJobStats()
+
+
+background_jobs = BackgroundJobPool()
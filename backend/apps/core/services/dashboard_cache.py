@@ -0,0 +1,240 @@
+"""Per-user dashboard response cache with version-based invalidation.
+
+Dashboard endpoints are pure functions of (viewer, scope members, query
+params, the members' data, today's date). Each user has a data version held
+in the cache backend; signals and bulk writers bump it whenever the user's
+transactions, accounts, budgets or categories change. A response is stored
+under a key derived from the endpoint, params and every scope member's
+version, so a write makes all of that user's (and their household's) cached
+dashboards unreachable without having to enumerate them.
+
+The same key doubles as the response ``ETag``: a client revalidating with
+``If-None-Match`` gets a ``304`` without the view running or the cached body
+being read.
+
+``DASHBOARD_CACHE_ALIAS`` selects the Django cache. Versions live in that
+backend too, so it must be shared by every worker process (e.g. Redis): with a
+per-process locmem cache a write handled by one worker would not invalidate
+responses cached by another. The cache is therefore off by default.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import date
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from apps.budget.models import Budget, BudgetCategory
+from apps.financial_account.models import FinancialAccount
+from apps.household.models import HouseholdMember
+from apps.household.scope import get_scope_user_ids
+from apps.transaction.models import Transaction, TransactionCategory
+
+DEFAULT_TIMEOUT_SECONDS = 60 * 60
+
+
+def is_dashboard_cache_enabled() -> bool:
+    """True when dashboard responses should be served from the cache."""
+    return getattr(settings, "DASHBOARD_CACHE_ENABLED", False)
+
+
+@dataclass
+class DashboardCacheStats:
+    """Hit/miss counters for the dashboard response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class DashboardResponseCache:
+    """Version-stamped store of rendered dashboard responses."""
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        self._alias = alias
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.stats = DashboardCacheStats()
+
+    @property
+    def backend(self):
+        return caches[self._alias or getattr(settings, "DASHBOARD_CACHE_ALIAS", "default")]
+
+    @property
+    def timeout(self) -> int:
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, "DASHBOARD_CACHE_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)
+
+    def _version_key(self, user_id: int) -> str:
+        return f"dashboard:version:{user_id}"
+
+    def _response_key(self, etag: str) -> str:
+        return f"dashboard:response:{etag}"
+
+    def get_versions(self, user_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Current data version per user.
+
+        Missing versions are seeded with a timestamp rather than 0, so a
+        version evicted from the backend never reuses an old number.
+        """
+        user_ids = sorted(set(user_ids))
+        keys = {self._version_key(user_id): user_id for user_id in user_ids}
+        found = self.backend.get_many(list(keys))
+        for key in keys.keys() - found.keys():
+            self.backend.add(key, time.time_ns(), None)
+            found[key] = self.backend.get(key)
+        return {user_id: found[key] for key, user_id in keys.items()}
+
+    def bump(self, user_ids: Iterable[int]) -> None:
+        """Advance each user's data version, orphaning their cached responses."""
+        for user_id in set(user_ids):
+            key = self._version_key(user_id)
+            try:
+                self.backend.incr(key)
+            except ValueError:
+                self.backend.add(key, time.time_ns(), None)
+            with self._lock:
+                self.stats.invalidations += 1
+
+    def etag_for(self, endpoint: str, viewer_id: int, scope_user_ids: Iterable[int], params) -> str:
+        """Identity of one endpoint response for the current data versions."""
+        versions = self.get_versions([viewer_id, *scope_user_ids])
+        parts = [
+            endpoint,
+            str(viewer_id),
+            date.today().isoformat(),
+            ",".join(f"{user_id}:{version}" for user_id, version in sorted(versions.items())),
+            "&".join(f"{name}={value}" for name, value in sorted(params.items())),
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+    def get(self, etag: str) -> tuple[bytes, str] | None:
+        cached = self.backend.get(self._response_key(etag))
+        with self._lock:
+            if cached is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return cached
+
+    def set(self, etag: str, response: HttpResponse) -> None:
+        self.backend.set(self._response_key(etag), (response.content, response["Content-Type"]), self.timeout)
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.stats.not_modified += 1
+
+    def reset_stats(self) -> None:
+        """Reset counters (for tests)."""
+        with self._lock:
+            self.stats = DashboardCacheStats()
+
+
+dashboard_cache = DashboardResponseCache()
+
+
+def get_dashboard_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for this process's dashboard cache."""
+    return dashboard_cache.stats.as_dict()
+
+
+def invalidate_dashboards(user_ids: Iterable[int | None]) -> None:
+    """
+    Bump the data version for users whose dashboard inputs changed.
+
+    Bumps immediately and again on commit, so a response computed from
+    pre-commit rows cannot stay cached under the post-write version.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    dashboard_cache.bump(user_ids)
+    transaction.on_commit(lambda: dashboard_cache.bump(user_ids))
+
+
+def _scope_user_ids(request) -> list[int]:
+    if request.GET.get("scope") != "household":
+        return [request.user.id]
+    return get_scope_user_ids(request)
+
+
+def cached_dashboard_response(endpoint: str):
+    """
+    Serve a JSON dashboard view from the response cache, with ETag revalidation.
+
+    Only 200 responses are stored. Apply beneath ``login_required``.
+
+    Args:
+        endpoint: Stable name for the view, part of the cache key
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_dashboard_cache_enabled():
+                return view(request, *args, **kwargs)
+
+            etag = dashboard_cache.etag_for(endpoint, request.user.id, _scope_user_ids(request), request.GET)
+            client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+            if quote_etag(etag) in client_etags or "*" in client_etags:
+                dashboard_cache.record_not_modified()
+                response = HttpResponseNotModified()
+            else:
+                cached = dashboard_cache.get(etag)
+                if cached is not None:
+                    content, content_type = cached
+                    response = HttpResponse(content, content_type=content_type)
+                else:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    dashboard_cache.set(etag, response)
+
+            response["ETag"] = quote_etag(etag)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=FinancialAccount)
+@receiver(post_delete, sender=FinancialAccount)
+@receiver(post_save, sender=TransactionCategory)
+@receiver(post_delete, sender=TransactionCategory)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=HouseholdMember)
+@receiver(post_delete, sender=HouseholdMember)
+def user_data_changed(sender, instance, **kwargs):
+    """A row feeding the owner's dashboards changed."""
+    invalidate_dashboards([instance.user_id])
+
+
+@receiver(post_save, sender=BudgetCategory)
+@receiver(post_delete, sender=BudgetCategory)
+def budget_category_changed(sender, instance: BudgetCategory, **kwargs):
+    """Budget allocations changed; the budget owner's progress views are stale."""
+    invalidate_dashboards([instance.budget.user_id])
@@ -0,0 +1,60 @@
+"""Tests for the shared background job pool."""
+
+import threading
+
+import pytest
+
+from apps.core.services.background_jobs import BackgroundJobPool, BackgroundJobQueueFull
+
+
+class TestBackgroundJobPool:
+    def test_serves_users_round_robin(self):
+        pool = BackgroundJobPool(max_workers=1, max_queue=10, max_per_user=5)
+        order = []
+        for name in ["a1", "a2", "a3"]:
+            pool.submit(1, lambda job: order.append(job.name), name=name)
+        pool.submit(2, lambda job: order.append(job.name), name="b1")
+
+        assert pool.run_pending() == 4
+        assert order == ["a1", "b1", "a2", "a3"]
+        assert pool.pending_count == 0
+
+    def test_enforces_queue_and_per_user_limits(self):
+        pool = BackgroundJobPool(max_workers=1, max_queue=3, max_per_user=2)
+        pool.submit(1, lambda job: None)
+        pool.submit(1, lambda job: None)
+        with pytest.raises(BackgroundJobQueueFull):
+            pool.submit(1, lambda job: None)
+
+        pool.submit(2, lambda job: None)
+        with pytest.raises(BackgroundJobQueueFull):
+            pool.submit(3, lambda job: None)
+
+        assert pool.stats.rejected == 2
+        assert pool.pending_count == 3
+
+    def test_records_timings_and_failures(self):
+        pool = BackgroundJobPool(max_workers=1)
+
+        def fail(job):
+            raise RuntimeError("boom")
+
+        ok = pool.submit(1, lambda job: None)
+        failed = pool.submit(1, fail)
+        pool.run_pending()
+
+        assert ok.queue_wait_seconds >= 0 and ok.run_seconds >= 0
+        assert ok.error is None
+        assert failed.error == "boom"
+        assert pool.stats.completed == 1
+        assert pool.stats.failed == 1
+
+    def test_worker_threads_run_jobs(self, settings):
+        settings.RUN_BACKGROUND_JOB_WORKERS = True
+        pool = BackgroundJobPool(max_workers=2)
+        done = threading.Event()
+        try:
+            pool.submit(1, lambda job: done.set())
+            assert done.wait(timeout=5)
+        finally:
+            pool.stop()
@@ -0,0 +1,132 @@
+"""Tests for the per-user dashboard response cache."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.cache import caches
+
+from apps.core.services.dashboard_cache import dashboard_cache, get_dashboard_cache_stats
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory
+from apps.transaction.services.bulk_transaction_service import bulk_create_import_transactions
+
+METRICS_URL = "/api/asset-dashboard/metrics/"
+NETWORTH_URL = "/api/asset-dashboard/networth-history/"
+
+
+@pytest.fixture(autouse=True)
+def enabled_cache(settings):
+    settings.DASHBOARD_CACHE_ENABLED = True
+    caches[settings.DASHBOARD_CACHE_ALIAS].clear()
+    dashboard_cache.reset_stats()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="cachetest", email="cache@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Cache Checking",
+        account_type="checking",
+        balance=Decimal("1000.00"),
+    )
+
+
+@pytest.fixture
+def salary(user):
+    return TransactionCategory.objects.create(user=user, name="Cache Salary", slug="cache-salary", type="income")
+
+
+@pytest.fixture
+def logged_in(client, user):
+    client.force_login(user)
+    return client
+
+
+def _income(account, category, amount):
+    return Transaction(
+        user=account.user,
+        account=account,
+        category=category,
+        amount=Decimal(amount),
+        date=date.today(),
+        description="Cache income",
+        transaction_type="credit",
+    )
+
+
+class TestDashboardResponseCache:
+    def test_repeat_request_is_served_from_cache(self, logged_in, account):
+        first = logged_in.get(METRICS_URL, {"period": "30d"})
+        second = logged_in.get(METRICS_URL, {"period": "30d"})
+
+        assert first.status_code == second.status_code == 200
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+        assert get_dashboard_cache_stats()["hits"] == 1
+
+    def test_params_are_part_of_the_key(self, logged_in, account):
+        monthly = logged_in.get(METRICS_URL, {"period": "30d"})
+        yearly = logged_in.get(METRICS_URL, {"period": "1y"})
+
+        assert monthly["ETag"] != yearly["ETag"]
+
+    def test_if_none_match_returns_304(self, logged_in, account):
+        etag = logged_in.get(METRICS_URL)["ETag"]
+
+        response = logged_in.get(METRICS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert get_dashboard_cache_stats()["not_modified"] == 1
+
+    def test_transaction_save_invalidates(self, logged_in, account, salary):
+        before = logged_in.get(METRICS_URL)
+
+        _income(account, salary, "250.00").save()
+        after = logged_in.get(METRICS_URL, HTTP_IF_NONE_MATCH=before["ETag"])
+
+        assert after.status_code == 200
+        assert after["ETag"] != before["ETag"]
+        assert after.json()["income_sum"] != before.json()["income_sum"]
+
+    def test_bulk_import_invalidates(self, logged_in, account, salary):
+        before = logged_in.get(METRICS_URL)
+
+        bulk_create_import_transactions(account, [_income(account, salary, "75.00")])
+
+        assert logged_in.get(METRICS_URL)["ETag"] != before["ETag"]
+
+    def test_other_users_writes_do_not_invalidate(self, logged_in, account, django_user_model):
+        before = logged_in.get(METRICS_URL)
+        other = django_user_model.objects.create_user(username="cacheother", password="testpass123")
+
+        FinancialAccount.objects.create(user=other, name="Other", account_type="checking", balance=Decimal("1.00"))
+
+        assert logged_in.get(METRICS_URL)["ETag"] == before["ETag"]
+
+    def test_deferred_history_recompute_invalidates(
+        self, logged_in, account, salary, settings, django_capture_on_commit_callbacks
+    ):
+        from apps.transaction.services.balance_recalculation_queue import (
+            balance_recalculation_queue,
+            flush_balance_recalculations,
+        )
+
+        settings.DEFER_BALANCE_RECALCULATION = True
+        balance_recalculation_queue.drain()
+        with django_capture_on_commit_callbacks(execute=True):
+            _income(account, salary, "250.00").save()
+        before_recompute = logged_in.get(NETWORTH_URL)
+
+        assert flush_balance_recalculations() == 1
+        after_recompute = logged_in.get(NETWORTH_URL)
+
+        assert after_recompute["ETag"] != before_recompute["ETag"]
+        assert after_recompute.content != before_recompute.content
@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for transaction lists.
+
+Pages are addressed by an opaque cursor encoding the ``(date, created_at, id)``
+of the last row served, so each page is an index seek on ``(user, -date)``
+instead of an OFFSET scan. Total counts are cached briefly since an exact
+``COUNT(*)`` would scan the whole history on every page.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+
+CURSOR_ORDERING = ("-date", "-created_at", "-id")
+COUNT_CACHE_TIMEOUT_SECONDS = 60
+
+
+@dataclass
+class CursorPage:
+    """One page of a cursor-paginated queryset."""
+
+    items: list
+    next_cursor: str | None
+    has_next: bool
+
+
+def is_cursor_mode(request_params) -> bool:
+    """True when the request opts into cursor pagination."""
+    return request_params.get("pagination") == "cursor" or "cursor" in request_params
+
+
+def encode_cursor(obj) -> str:
+    """Encode an object's ordering key as an opaque URL-safe cursor."""
+    payload = json.dumps([obj.date.isoformat(), obj.created_at.isoformat(), obj.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, datetime, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises ValueError on malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, created_at_str, obj_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(date_str), datetime.fromisoformat(created_at_str), int(obj_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def paginate_by_cursor(queryset: QuerySet, cursor: str | None, page_size: int) -> CursorPage:
+    """Return the page of queryset following cursor, newest first."""
+    queryset = queryset.order_by(*CURSOR_ORDERING)
+    if cursor:
+        cursor_date, cursor_created_at, cursor_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(date__lt=cursor_date)
+            | Q(date=cursor_date, created_at__lt=cursor_created_at)
+            | Q(date=cursor_date, created_at=cursor_created_at, id__lt=cursor_id)
+        )
+
+    items = list(queryset[: page_size + 1])
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = encode_cursor(items[-1]) if has_next else None
+    return CursorPage(items=items, next_cursor=next_cursor, has_next=has_next)
+
+
+def get_cached_count(queryset: QuerySet, timeout: int = COUNT_CACHE_TIMEOUT_SECONDS) -> int:
+    """Count queryset rows, caching the result briefly per distinct query."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(f"{sql}|{params!r}".encode()).hexdigest()
+    cache_key = f"cursor_pagination:count:{digest}"
+    total = cache.get(cache_key)
+    if total is None:
+        total = queryset.count()
+        cache.set(cache_key, total, timeout)
+    return total
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import io
 import re
 from datetime import date
 from decimal import Decimal, InvalidOperation
 
 import pandas as pd
-import pdfplumber
+
+from apps.financial_account.institutions.parsers.pdf_text import extract_pdf_text
 
 AMEX_CHECKING_MARKERS = (
     "american express",
@@ -81,7 +81,7 @@ CONTINUATION_STOP_PREFIXES = ("continued on next page", "continued on reverse",
 
 def parse_amex_checking_pdf(content: bytes) -> pd.DataFrame:
     """Extract AmEx Rewards Checking transactions from a monthly PDF statement."""
-    text = _extract_pdf_text(content)
+    text = extract_pdf_text(content)
     if not _looks_like_amex_checking(text):
         raise ValueError("File does not look like an American Express Rewards Checking statement PDF.")
 
@@ -100,7 +100,7 @@ def parse_amex_checking_pdf(content: bytes) -> pd.DataFrame:
 
 def parse_amex_checking_balance_summary(content: bytes) -> dict[str, str] | None:
     """Extract beginning/ending balances from an AmEx Rewards Checking PDF statement."""
-    text = _extract_pdf_text(content)
+    text = extract_pdf_text(content)
     if not _looks_like_amex_checking(text):
         return None
     return extract_amex_checking_balance_summary(text)
@@ -155,16 +155,6 @@ def extract_amex_checking_balance_summary(text: str) -> dict[str, str] | None:
     return summary
 
 
-def _extract_pdf_text(content: bytes) -> str:
-    pages: list[str] = []
-    with pdfplumber.open(io.BytesIO(content)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            if page_text.strip():
-                pages.append(page_text)
-    return "\n".join(pages)
-
-
 def _looks_like_amex_checking(text: str) -> bool:
     lowered = text.lower()
     return all(marker in lowered for marker in AMEX_CHECKING_MARKERS)
@@ -0,0 +1,130 @@
+"""Shared PDF text extraction for the institution PDF parsers.
+
+Every PDF parser works from the same text: the non-blank pages'
+``extract_text()`` output joined by newlines. Extraction is the slow part of
+PDF import, so it happens once per file: results are kept in a small
+process-local LRU keyed by the file's SHA-256, which lets a parser and its
+balance-summary helper share one extraction.
+
+Statements with at least ``PDF_TEXT_PARALLEL_MIN_PAGES`` pages are split into
+page ranges extracted by a ``spawn`` process pool of
+``PDF_TEXT_EXTRACTION_WORKERS`` processes (pdfplumber is CPU-bound and holds
+the GIL). If the pool cannot be used, extraction falls back to a serial pass.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+from django.conf import settings
+from loguru import logger
+
+DEFAULT_CACHE_SIZE = 16
+DEFAULT_PARALLEL_MIN_PAGES = 4
+
+_cache: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _extraction_workers() -> int:
+    return getattr(settings, "PDF_TEXT_EXTRACTION_WORKERS", min(4, os.cpu_count() or 1))
+
+
+def extract_pdf_text(content: bytes) -> str:
+    """
+    Return the text of a PDF statement, extracting it at most once per file.
+
+    Args:
+        content: Raw PDF bytes
+
+    Returns:
+        Non-blank page texts joined by newlines
+    """
+    file_hash = hashlib.sha256(content).hexdigest()
+    with _cache_lock:
+        if file_hash in _cache:
+            _cache.move_to_end(file_hash)
+            return _cache[file_hash]
+
+    text = "\n".join(page for page in _extract_pages(content) if page.strip())
+
+    with _cache_lock:
+        _cache[file_hash] = text
+        _cache.move_to_end(file_hash)
+        while len(_cache) > getattr(settings, "PDF_TEXT_CACHE_SIZE", DEFAULT_CACHE_SIZE):
+            _cache.popitem(last=False)
+    return text
+
+
+def clear_pdf_text_cache() -> None:
+    """Drop cached extractions (for tests)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _extract_pages(content: bytes) -> list[str]:
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        page_count = len(pdf.pages)
+        workers = _extraction_workers()
+        min_pages = getattr(settings, "PDF_TEXT_PARALLEL_MIN_PAGES", DEFAULT_PARALLEL_MIN_PAGES)
+        if workers <= 1 or page_count < max(min_pages, 2):
+            return [page.extract_text() or "" for page in pdf.pages]
+
+    step = -(-page_count // min(workers, page_count))
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    pool = None
+    try:
+        pool = _get_pool(workers)
+        futures = [pool.submit(extract_page_range, content, start, stop) for start, stop in ranges]
+        return [page for future in futures for page in future.result()]
+    except (BrokenProcessPool, CancelledError, OSError) as exc:
+        logger.warning("Parallel PDF extraction failed; extracting serially", error=str(exc))
+        _discard_pool(pool)
+        return extract_page_range(content, 0, page_count)
+
+
+def extract_page_range(content: bytes, start: int, stop: int) -> list[str]:
+    """Extract pages ``start`` to ``stop - 1``; runs inside pool workers."""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return [pdf.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor | None) -> None:
+    """Stop handing out a broken pool; requests still waiting on it fall back on their own."""
+    global _pool
+    with _pool_lock:
+        if pool is None or _pool is not pool:
+            return
+        _pool = None
+    pool.shutdown(wait=False)
+
+
+def _reset_pool() -> None:
+    """Shut down the shared pool (for tests)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import io
 import re
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
 import pandas as pd
-import pdfplumber
+
+from apps.financial_account.institutions.parsers.pdf_text import extract_pdf_text
 
 ROBINHOOD_BANK_MARKERS = (
     "robinhood banking",
@@ -69,7 +69,7 @@ SECTION_HEADER_PREFIXES = (
 
 def parse_robinhood_bank_pdf(content: bytes) -> pd.DataFrame:
     """Extract Robinhood Banking transactions from a monthly PDF statement."""
-    text = _extract_pdf_text(content)
+    text = extract_pdf_text(content)
     if not _looks_like_robinhood_bank(text):
         raise ValueError("File does not look like a Robinhood Banking statement PDF.")
 
@@ -88,7 +88,7 @@ def parse_robinhood_bank_pdf(content: bytes) -> pd.DataFrame:
 
 def parse_robinhood_bank_balance_summary(content: bytes) -> dict[str, str] | None:
     """Extract beginning/ending balances from a Robinhood Banking PDF statement."""
-    text = _extract_pdf_text(content)
+    text = extract_pdf_text(content)
     if not _looks_like_robinhood_bank(text):
         return None
     return extract_robinhood_bank_balance_summary(text)
@@ -143,16 +143,6 @@ def extract_robinhood_bank_balance_summary(text: str) -> dict[str, str] | None:
     return summary
 
 
-def _extract_pdf_text(content: bytes) -> str:
-    pages: list[str] = []
-    with pdfplumber.open(io.BytesIO(content)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            if page_text.strip():
-                pages.append(page_text)
-    return "\n".join(pages)
-
-
 def _looks_like_robinhood_bank(text: str) -> bool:
     lowered = text.lower()
     return all(marker in lowered for marker in ROBINHOOD_BANK_MARKERS)
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import io
 import re
 from datetime import date, datetime
 
 import pandas as pd
-import pdfplumber
+
+from apps.financial_account.institutions.parsers.pdf_text import extract_pdf_text
 
 ROBINHOOD_CREDIT_MARKERS = (
     "credit limit",
@@ -66,7 +66,7 @@ SKIP_DESCRIPTIONS = {
 
 def parse_robinhood_credit_pdf(content: bytes) -> pd.DataFrame:
     """Extract Robinhood Credit Card transactions from a monthly PDF statement."""
-    text = _extract_pdf_text(content)
+    text = extract_pdf_text(content)
     if not _looks_like_robinhood_credit(text):
         raise ValueError("File does not look like a Robinhood Credit Card statement PDF.")
 
@@ -87,16 +87,6 @@ def parse_robinhood_credit_pdf(content: bytes) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
-def _extract_pdf_text(content: bytes) -> str:
-    pages: list[str] = []
-    with pdfplumber.open(io.BytesIO(content)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            if page_text.strip():
-                pages.append(page_text)
-    return "\n".join(pages)
-
-
 def _looks_like_robinhood_credit(text: str) -> bool:
     lowered = text.lower()
     return any(marker in lowered for marker in ROBINHOOD_CREDIT_MARKERS)
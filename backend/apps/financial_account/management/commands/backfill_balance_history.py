@@ -1,13 +1,121 @@
-"""Management command to backfill AccountBalanceHistory from transactions."""
+"""Management command to backfill AccountBalanceHistory from transactions.
 
+The default mode processes one account at a time. ``--batched`` loads grouped
+daily net changes for a shard of accounts in one query, computes running
+balances with a NumPy cumulative sum, and bulk-upserts the history rows.
+``--workers`` spreads shards across a process pool.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from decimal import Decimal
 
+import django
+import numpy as np
+import pandas as pd
 from django.core.management.base import BaseCommand
-from django.db.models import Sum
+from django.db import connections
+from django.db import transaction as db_transaction
+from django.db.models import Case, DecimalField, F, Sum, When
 
 from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
 from apps.transaction.models import Transaction
 
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class ShardResult:
+    """Outcome of backfilling one shard of accounts."""
+
+    shard_index: int
+    accounts: int
+    records: int
+    elapsed_seconds: float
+
+
+def _to_cents(value: Decimal) -> int:
+    return int((value * 100).to_integral_value())
+
+
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def compute_shard_history(account_ids: list[int]) -> list[AccountBalanceHistory]:
+    """
+    Build balance history rows for a shard of accounts.
+
+    Issues two queries (anchors and grouped daily net changes) regardless of
+    shard size. Amounts are handled as integer cents so the cumulative sum
+    stays exact.
+    """
+    anchors = dict(FinancialAccount.objects.filter(id__in=account_ids).values_list("id", "balance"))
+    rows = list(
+        Transaction.objects.filter(account_id__in=account_ids)
+        .order_by()
+        .values("account_id", "date")
+        .annotate(
+            net=Sum(
+                Case(
+                    When(transaction_type="credit", then=F("amount")),
+                    default=-F("amount"),
+                    output_field=DecimalField(max_digits=15, decimal_places=2),
+                )
+            )
+        )
+    )
+    if not rows:
+        return []
+
+    frame = pd.DataFrame(rows)
+    frame["net_cents"] = np.fromiter((_to_cents(net or Decimal("0")) for net in frame["net"]), dtype=np.int64)
+    frame = frame.sort_values(["account_id", "date"], ascending=[True, False], kind="stable")
+
+    # Net change strictly after each date = reverse cumulative sum minus the date's own change.
+    net_after = frame.groupby("account_id", sort=False)["net_cents"].cumsum() - frame["net_cents"]
+    anchor_cents = frame["account_id"].map(lambda account_id: _to_cents(anchors[account_id])).to_numpy(np.int64)
+    frame["balance_cents"] = anchor_cents - net_after.to_numpy(np.int64)
+
+    return [
+        AccountBalanceHistory(account_id=account_id, date=target_date, balance=_from_cents(balance_cents))
+        for account_id, target_date, balance_cents in zip(
+            frame["account_id"], frame["date"], frame["balance_cents"], strict=True
+        )
+    ]
+
+
+def backfill_shard(shard_index: int, account_ids: list[int], dry_run: bool, clear_existing: bool) -> ShardResult:
+    """Compute and persist balance history for one shard of accounts."""
+    started = time.perf_counter()
+    history = compute_shard_history(account_ids)
+
+    if not dry_run:
+        with db_transaction.atomic():
+            if clear_existing:
+                AccountBalanceHistory.objects.filter(account_id__in=account_ids).delete()
+            AccountBalanceHistory.objects.bulk_create(
+                history,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["account", "date"],
+                update_fields=["balance"],
+            )
+
+    return ShardResult(
+        shard_index=shard_index,
+        accounts=len(account_ids),
+        records=len(history),
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def _init_worker() -> None:
+    """Give each pool process its own Django setup and database connections."""
+    django.setup()
+    connections.close_all()
+
 
 class Command(BaseCommand):
     help = "Backfill AccountBalanceHistory for all accounts based on transaction history"
@@ -33,6 +141,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Clear existing balance history before backfilling",
         )
+        parser.add_argument(
+            "--batched",
+            action="store_true",
+            help="Process accounts in shards with grouped queries and bulk upserts",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Accounts per shard in batched mode (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes for batched mode (default: 1, in-process)",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
@@ -49,6 +174,10 @@ class Command(BaseCommand):
         if account_id:
             accounts = accounts.filter(id=account_id)
 
+        if options.get("batched") or options.get("workers", 1) > 1:
+            self._handle_batched(accounts, dry_run, clear_existing, options)
+            return
+
         total_accounts = accounts.count()
         total_records_created = 0
         accounts_processed = 0
@@ -63,6 +192,9 @@ class Command(BaseCommand):
             if options["verbosity"] >= 1 and accounts_processed % 10 == 0:
                 self.stdout.write(f"  Processed {accounts_processed}/{total_accounts} accounts...")
 
+        self._write_summary(dry_run, total_records_created, accounts_processed)
+
+    def _write_summary(self, dry_run: bool, total_records_created: int, accounts_processed: int) -> None:
         self.stdout.write("")
         if dry_run:
             self.stdout.write(
@@ -78,6 +210,49 @@ class Command(BaseCommand):
                 )
             )
 
+    def _handle_batched(self, accounts, dry_run: bool, clear_existing: bool, options) -> None:
+        """Backfill shards of accounts, optionally across a process pool."""
+        batch_size = max(1, options.get("batch_size") or DEFAULT_BATCH_SIZE)
+        workers = max(1, options.get("workers") or 1)
+
+        account_ids = list(accounts.order_by("id").values_list("id", flat=True))
+        shards = [account_ids[i : i + batch_size] for i in range(0, len(account_ids), batch_size)]
+
+        self.stdout.write(
+            f"Processing {len(account_ids)} accounts in {len(shards)} shards "
+            f"(batch size {batch_size}, {workers} worker{'s' if workers != 1 else ''})..."
+        )
+
+        started = time.perf_counter()
+        results: list[ShardResult] = []
+
+        if workers == 1:
+            for index, shard in enumerate(shards):
+                results.append(self._report_shard(backfill_shard(index, shard, dry_run, clear_existing), len(shards)))
+        else:
+            # Forked workers must not share the parent's open database sockets.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = [
+                    pool.submit(backfill_shard, index, shard, dry_run, clear_existing)
+                    for index, shard in enumerate(shards)
+                ]
+                for future in as_completed(futures):
+                    results.append(self._report_shard(future.result(), len(shards)))
+
+        total_records = sum(result.records for result in results)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Finished {len(shards)} shards in {elapsed:.2f}s")
+        self._write_summary(dry_run, total_records, len(account_ids))
+
+    def _report_shard(self, result: ShardResult, total_shards: int) -> ShardResult:
+        rate = result.records / result.elapsed_seconds if result.elapsed_seconds else 0.0
+        self.stdout.write(
+            f"  Shard {result.shard_index + 1}/{total_shards}: {result.accounts} accounts, "
+            f"{result.records} records in {result.elapsed_seconds:.2f}s ({rate:.0f} records/s)"
+        )
+        return result
+
     def _process_account(
         self,
         account: FinancialAccount,
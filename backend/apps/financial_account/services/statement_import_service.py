@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import codecs
+import copy
 import csv
 import hashlib
 import io
 import re
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal, InvalidOperation
@@ -13,6 +20,9 @@ from pathlib import Path
 from typing import Any
 
 import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
 from loguru import logger
 
 from apps.financial_account.institutions.parsers.amex_checking_pdf import parse_amex_checking_balance_summary
@@ -26,10 +36,27 @@ from apps.financial_account.institutions.registry import (
     supported_file_types_for_parser,
 )
 from apps.financial_account.models import FinancialAccount
+from apps.financial_account.services.statement_parse_cache import (
+    ParsedStatement,
+    is_statement_parse_cache_enabled,
+    pack_rows,
+    statement_parse_cache,
+    unpack_rows,
+)
 from apps.transaction.models import Transaction
-from apps.transaction.services.bulk_transaction_service import bulk_create_import_transactions
+from apps.transaction.services.bulk_transaction_service import (
+    apply_import_side_effects,
+    bulk_create_import_transactions,
+    insert_import_transactions,
+)
+from apps.transaction.services.monthly_rollup import slices_for
 
+# Bump when parsing, normalization or row hashing changes so cached parses are not reused.
+STATEMENT_PARSER_VERSION = 1
 OPENING_BALANCE_DESCRIPTION = "Opening Balance"
+DEFAULT_STREAMING_THRESHOLD_BYTES = 25 * 1024 * 1024
+DEFAULT_IMPORT_CHUNK_ROWS = 10_000
+STREAMING_SNIFF_BYTES = 64 * 1024
 BOFA_BANKING_ACCOUNT_TYPES = {"checking", "savings"}
 ROBINHOOD_BANKING_ACCOUNT_TYPES = {"checking", "savings"}
 AMEX_CHECKING_ACCOUNT_TYPES = {"checking"}
@@ -47,6 +74,52 @@ BOFA_EMPTY_AMOUNT_ROW = re.compile(r'^(.+?),,("(?:-)?[\d,]+\.\d{2}")\s*$')
 BOFA_AMOUNT_BALANCE_SUFFIX = re.compile(r'^(.+),("(?:-)?[\d,]+\.\d{2}"),("(?:-)?[\d,]+\.\d{2}")\s*$')
 _DATE_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 _DATE_US = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+RUNNING_BALANCE_COLUMNS = ["Running Bal.", "Running Bal", "Running Balance", "Balance"]
+
+
+@contextmanager
+def _timed(timings: dict[str, float], stage: str) -> Iterator[None]:
+    """Add the wall-clock seconds spent in one import stage (summed over chunks)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(timings.get(stage, 0) + time.perf_counter() - started, 4)
+
+
+def _peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where ``resource`` is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _LineReader:
+    """File-like ``read()`` over an iterator of text lines, so pandas can consume a generator."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._pending]
+        available = len(self._pending)
+        while size < 0 or available < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            available += len(line)
+        data = "".join(parts)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
 
 
 @dataclass
@@ -109,6 +182,9 @@ class StatementImportResult:
     balance_summary: dict[str, str] | None = None
     reconciliation: dict[str, Any] = field(default_factory=dict)
     reconciliation_warnings: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    peak_memory_bytes: int | None = None
+    peak_rss_bytes: int | None = None
 
     def as_dict(self) -> dict[str, Any]:
         """Serialize the import result for API responses."""
@@ -125,9 +201,14 @@ class StatementImportResult:
             "rows": [row.as_dict() for row in self.rows],
             "reconciliation": self.reconciliation,
             "reconciliation_warnings": list(dict.fromkeys(self.reconciliation_warnings)),
+            "timings": self.timings,
         }
         if self.balance_summary is not None:
             payload["balance_summary"] = self.balance_summary
+        if self.peak_memory_bytes is not None:
+            payload["peak_memory_bytes"] = self.peak_memory_bytes
+        if self.peak_rss_bytes is not None:
+            payload["peak_rss_bytes"] = self.peak_rss_bytes
         return payload
 
 
@@ -149,11 +230,9 @@ class StatementImportService:
         statement_status: str = "provisional",
     ) -> StatementImportResult:
         """Parse and classify a statement without creating transactions."""
-        result = self._parse_statement(account, statement_file, institution, statement_period, statement_status)
-        self._classify_rows(account, result)
-        self._validate_bofa_banking_balances(account, institution, result)
-        self._validate_robinhood_banking_balances(account, institution, result)
-        self._validate_amex_checking_balances(account, institution, result)
+        result = self._load_statement(account, statement_file, institution, statement_period, statement_status)
+        with _timed(result.timings, "classify"):
+            self._classify_rows(account, result)
         self._plan_opening_balance(account, result)
         return result
 
@@ -169,69 +248,357 @@ class StatementImportService:
         ending_balance: Decimal | None = None,
         ending_date: date | None = None,
     ) -> StatementImportResult:
-        """Parse, deduplicate, and create transactions for new statement rows."""
-        result = self.preview_statement(account, statement_file, institution, statement_period, statement_status)
-
-        if ending_balance is not None:
-            summary = dict(result.balance_summary or {})
-            summary["ending_balance"] = str(ending_balance.quantize(Decimal("0.01")))
-            if ending_date is not None:
-                summary["ending_date"] = ending_date.isoformat()
-            result.balance_summary = summary
+        """
+        Parse, deduplicate, and create transactions for new statement rows.
 
-        if apply_opening_balance:
-            self._apply_opening_balance(account, result)
-            result.reconciliation["opening_balance_applied"] = True
-        else:
-            result.reconciliation["opening_balance_applied"] = False
+        CSV uploads of at least ``STATEMENT_STREAMING_THRESHOLD_BYTES`` are
+        imported chunk by chunk with ``import_statement_streaming``.
+        """
+        if self._should_stream(statement_file, institution):
+            return self.import_statement_streaming(
+                account,
+                statement_file,
+                institution,
+                statement_period,
+                statement_status,
+                apply_opening_balance=apply_opening_balance,
+                ending_balance=ending_balance,
+                ending_date=ending_date,
+            )
 
-        transactions = []
+        result = self.preview_statement(account, statement_file, institution, statement_period, statement_status)
+        self._apply_balance_overrides(account, result, apply_opening_balance, ending_balance, ending_date)
 
         if statement_status == "closed":
             self._finalize_duplicate_rows(account, result.rows)
 
-        for row in result.rows:
-            if row.status != "new":
-                continue
+        transactions = [
+            self._build_transaction(account, row, statement_status) for row in result.rows if row.status == "new"
+        ]
+        with _timed(result.timings, "insert"):
+            result.imported_count = bulk_create_import_transactions(account, transactions)
+        self._reconcile_account_ending_balance(account, result, apply_opening_balance=apply_opening_balance)
+        logger.info(
+            "Imported statement rows",
+            account_id=account.id,
+            institution=institution,
+            imported=result.imported_count,
+            duplicates=result.duplicate_count,
+            timings=result.timings,
+        )
+        return result
 
-            transactions.append(
-                Transaction(
-                    user=account.user,
-                    account=account,
-                    date=row.posted_date,
-                    amount=row.amount,
-                    transaction_type=row.transaction_type,
-                    description=row.description,
-                    sync_source="csv",
-                    external_id=row.source_row_hash,
-                    status="posted" if statement_status == "closed" else "pending",
-                    raw_data={
-                        "institution": row.institution,
-                        "statement_period": row.statement_period,
-                        "statement_status": statement_status,
-                        "source_file_hash": row.source_file_hash,
-                        "source_row_hash": row.source_row_hash,
-                        "source_row_hash_base": row.source_row_hash_base,
-                        "activity_type": row.activity_type,
-                        "symbol": row.symbol,
-                        "quantity": row.quantity,
-                        "running_balance": row.running_balance,
-                        "raw_row": row.raw_data,
-                    },
-                )
+    def import_statement_streaming(
+        self,
+        account: FinancialAccount,
+        statement_file,
+        institution: str,
+        statement_period: str = "",
+        statement_status: str = "provisional",
+        *,
+        apply_opening_balance: bool = False,
+        ending_balance: Decimal | None = None,
+        ending_date: date | None = None,
+        chunk_rows: int | None = None,
+        measure_memory: bool = False,
+    ) -> StatementImportResult:
+        """
+        Import a large CSV statement without holding all of it in memory.
+
+        The file is read ``chunk_rows`` rows at a time; each chunk is
+        normalized, classified against rows that existed before this import
+        and inserted, all inside one atomic block. Balance history and rollups
+        are recomputed once after the last chunk. Normalized rows are not kept
+        on the result, and statement-internal balance checks are skipped.
+
+        The process's resident-set high-water mark is always reported as
+        ``peak_rss_bytes``; it costs one syscall but is process-wide, so it
+        bounds rather than isolates the import's own footprint.
+
+        Args:
+            chunk_rows: Rows per chunk; defaults to ``STATEMENT_IMPORT_CHUNK_ROWS``
+            measure_memory: Trace allocations and report the peak as
+                ``peak_memory_bytes``. Tracing slows parsing, and is skipped
+                when something else in the process is already tracing.
+        """
+        chunk_rows = chunk_rows or getattr(settings, "STATEMENT_IMPORT_CHUNK_ROWS", DEFAULT_IMPORT_CHUNK_ROWS)
+        tracing = measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            result = self._stream_statement(
+                account,
+                statement_file,
+                institution,
+                statement_period,
+                statement_status,
+                chunk_rows,
+                apply_opening_balance=apply_opening_balance,
+                ending_balance=ending_balance,
+                ending_date=ending_date,
             )
+            if tracing:
+                result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            if tracing:
+                tracemalloc.stop()
 
-        result.imported_count = bulk_create_import_transactions(account, transactions)
-        self._reconcile_account_ending_balance(account, result, apply_opening_balance=apply_opening_balance)
+        result.peak_rss_bytes = _peak_rss_bytes()
+
+        if not result.errors:
+            self._reconcile_account_ending_balance(account, result, apply_opening_balance=apply_opening_balance)
         logger.info(
-            "Imported statement rows",
+            "Imported statement rows in chunks",
             account_id=account.id,
             institution=institution,
             imported=result.imported_count,
             duplicates=result.duplicate_count,
+            chunk_rows=chunk_rows,
+            peak_memory_bytes=result.peak_memory_bytes,
+            peak_rss_bytes=result.peak_rss_bytes,
+            timings=result.timings,
         )
         return result
 
+    def _stream_statement(
+        self,
+        account: FinancialAccount,
+        statement_file,
+        institution: str,
+        statement_period: str,
+        statement_status: str,
+        chunk_rows: int,
+        *,
+        apply_opening_balance: bool,
+        ending_balance: Decimal | None,
+        ending_date: date | None,
+    ) -> StatementImportResult:
+        result = StatementImportResult(institution=institution, statement_status=statement_status)
+        resolved = self._resolve_statement_parser(institution, getattr(statement_file, "name", ""), result)
+        if resolved is None:
+            return result
+        parser_key, config, extension = resolved
+        if extension != ".csv":
+            result.errors.append("Streaming import only supports CSV statements.")
+            return result
+
+        source = io.BytesIO(statement_file) if isinstance(statement_file, bytes) else statement_file
+        with _timed(result.timings, "read"):
+            result.file_hash = self._hash_stream(source)
+            source.seek(0)
+            head = source.read(STREAMING_SNIFF_BYTES)
+        bofa_layout = parser_key == "bofa" or self._looks_like_bofa_banking_csv(head)
+
+        # Same fallbacks as _read_frame/_read_csv_bytes; a failed attempt rolls back its inserts.
+        attempts = [("utf-8-sig", bofa_layout)]
+        if not bofa_layout:
+            attempts.append(("utf-8-sig", True))
+        attempts.append(("latin-1", bofa_layout))
+        for encoding, sanitize_bofa in attempts:
+            source.seek(0)
+            attempt = StatementImportResult(
+                institution=parser_key,
+                statement_status=statement_status,
+                file_hash=result.file_hash,
+                timings=result.timings,
+            )
+            try:
+                with transaction.atomic():
+                    self._import_chunks(
+                        account,
+                        self._read_csv_chunks(source, encoding, sanitize_bofa, chunk_rows),
+                        config,
+                        parser_key,
+                        statement_period,
+                        attempt,
+                        apply_opening_balance=apply_opening_balance,
+                        ending_balance=ending_balance,
+                        ending_date=ending_date,
+                    )
+                    if attempt.errors:
+                        transaction.set_rollback(True)
+                return attempt
+            except UnicodeDecodeError:
+                continue
+            except pd.errors.EmptyDataError:
+                result.errors.append("Statement file has no rows")
+                return result
+            except pd.errors.ParserError as exc:
+                if sanitize_bofa:
+                    result.errors.append(f"Failed to parse statement file: {exc}")
+                    return result
+        result.errors.append("Failed to parse statement file")
+        return result
+
+    def _import_chunks(
+        self,
+        account: FinancialAccount,
+        chunks: Iterator[pd.DataFrame],
+        config: dict[str, Any],
+        parser_key: str,
+        statement_period: str,
+        result: StatementImportResult,
+        *,
+        apply_opening_balance: bool,
+        ending_balance: Decimal | None,
+        ending_date: date | None,
+    ) -> None:
+        self._plan_opening_balance(account, result)
+        self._apply_balance_overrides(account, result, apply_opening_balance, ending_balance, ending_date)
+        preexisting_max_id = Transaction.objects.aggregate(last=Max("id"))["last"] or 0
+        earliest_date = None
+        rollup_slices = set()
+
+        column_map = None
+        next_row_number = 2
+        for frame in chunks:
+            frame = frame.dropna(how="all")
+            if frame.empty:
+                continue
+            frame.columns = [str(column).strip() for column in frame.columns]
+            if column_map is None:
+                column_map = self._resolve_column_map(list(frame.columns), config)
+                if parser_key == "generic":
+                    missing = [field for field in ("date", "description", "amount") if not column_map.get(field)]
+                    if missing:
+                        result.errors.append(f"Missing required columns: {', '.join(missing)}")
+                        return
+
+            rows = self._normalize_frame(
+                account,
+                frame,
+                column_map,
+                parser_key,
+                statement_period,
+                result,
+                first_row_number=next_row_number,
+            )
+            next_row_number += len(frame)
+            result.parsed_count += len(rows)
+            with _timed(result.timings, "classify"):
+                self._classify_rows(account, result, rows, before_id=preexisting_max_id)
+            if result.statement_status == "closed":
+                self._finalize_duplicate_rows(account, rows)
+            transactions = [
+                self._build_transaction(account, row, result.statement_status) for row in rows if row.status == "new"
+            ]
+            if not transactions:
+                continue
+            with _timed(result.timings, "insert"):
+                result.imported_count += insert_import_transactions(account, transactions)
+            chunk_earliest = min(txn.date for txn in transactions)
+            earliest_date = chunk_earliest if earliest_date is None else min(earliest_date, chunk_earliest)
+            rollup_slices |= slices_for(transactions, include_original=False)
+
+        if column_map is None:
+            result.errors.append("Statement file has no rows")
+        elif not result.parsed_count:
+            result.errors.append("No valid statement rows found")
+        elif earliest_date is not None:
+            with _timed(result.timings, "history"):
+                apply_import_side_effects(account, earliest_date, rollup_slices)
+
+    def _should_stream(self, statement_file, institution: str) -> bool:
+        """True for CSV uploads large enough to import in chunks."""
+        parser_key = institution if get_parser_config(institution) else parser_key_for_slug(institution)
+        if not parser_key or parser_key == "bofa":
+            return False
+        if Path(getattr(statement_file, "name", "")).suffix.lower() != ".csv":
+            return False
+        size = len(statement_file) if isinstance(statement_file, bytes) else getattr(statement_file, "size", None)
+        if size is None:
+            return False
+        threshold = getattr(settings, "STATEMENT_STREAMING_THRESHOLD_BYTES", DEFAULT_STREAMING_THRESHOLD_BYTES)
+        return size >= threshold
+
+    @staticmethod
+    def _hash_stream(source) -> str:
+        digest = hashlib.sha256()
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+    def _read_csv_chunks(
+        self,
+        source,
+        encoding: str,
+        sanitize_bofa: bool,
+        chunk_rows: int,
+    ) -> Iterator[pd.DataFrame]:
+        text = codecs.getreader(encoding)(source, errors="replace" if sanitize_bofa else "strict")
+        if sanitize_bofa:
+            text = _LineReader(self._bofa_transaction_lines(text))
+        with pd.read_csv(text, dtype=str, chunksize=chunk_rows) as reader:
+            yield from reader
+
+    def _bofa_transaction_lines(self, lines) -> Iterator[str]:
+        """Streaming form of _extract_bofa_transaction_csv over an iterable of text lines."""
+        preamble = []
+        for line in lines:
+            normalized = line.strip().lower()
+            if normalized.startswith("date,") and "description" in normalized and "amount" in normalized:
+                yield line.rstrip("\r\n") + "\n"
+                break
+            preamble.append(line)
+        else:
+            yield from preamble
+            return
+        for line in lines:
+            yield self._sanitize_bofa_transaction_line(line.rstrip("\r\n")) + "\n"
+
+    def _apply_balance_overrides(
+        self,
+        account: FinancialAccount,
+        result: StatementImportResult,
+        apply_opening_balance: bool,
+        ending_balance: Decimal | None,
+        ending_date: date | None,
+    ) -> None:
+        if ending_balance is not None:
+            summary = dict(result.balance_summary or {})
+            summary["ending_balance"] = str(ending_balance.quantize(Decimal("0.01")))
+            if ending_date is not None:
+                summary["ending_date"] = ending_date.isoformat()
+            result.balance_summary = summary
+
+        if apply_opening_balance:
+            self._apply_opening_balance(account, result)
+            result.reconciliation["opening_balance_applied"] = True
+        else:
+            result.reconciliation["opening_balance_applied"] = False
+
+    def _build_transaction(
+        self,
+        account: FinancialAccount,
+        row: NormalizedStatementRow,
+        statement_status: str,
+    ) -> Transaction:
+        return Transaction(
+            user=account.user,
+            account=account,
+            date=row.posted_date,
+            amount=row.amount,
+            transaction_type=row.transaction_type,
+            description=row.description,
+            sync_source="csv",
+            external_id=row.source_row_hash,
+            source_row_hash=row.source_row_hash,
+            status="posted" if statement_status == "closed" else "pending",
+            raw_data={
+                "institution": row.institution,
+                "statement_period": row.statement_period,
+                "statement_status": statement_status,
+                "source_file_hash": row.source_file_hash,
+                "source_row_hash": row.source_row_hash,
+                "source_row_hash_base": row.source_row_hash_base,
+                "activity_type": row.activity_type,
+                "symbol": row.symbol,
+                "quantity": row.quantity,
+                "running_balance": row.running_balance,
+                "raw_row": row.raw_data,
+            },
+        )
+
     def _finalize_duplicate_rows(self, account: FinancialAccount, rows: list[NormalizedStatementRow]) -> None:
         """Mark matching provisional rows as posted when a closed statement confirms them."""
         duplicate_hashes = [row.source_row_hash for row in rows if row.status == "duplicate"]
@@ -245,6 +612,79 @@ class StatementImportService:
             status="pending",
         ).update(status="posted")
 
+    def _load_statement(
+        self,
+        account: FinancialAccount,
+        statement_file,
+        institution: str,
+        statement_period: str,
+        statement_status: str,
+    ) -> StatementImportResult:
+        """
+        Parse and validate a statement, reusing the cached parse of an identical file.
+
+        Only file-derived state comes from the cache; row statuses and anything
+        that reads the database are recomputed by the caller.
+        """
+        content = statement_file.read() if hasattr(statement_file, "read") else statement_file
+        if isinstance(content, str):
+            content = content.encode()
+        file_hash = hashlib.sha256(content).hexdigest()
+        cache_key = (
+            file_hash,
+            institution,
+            STATEMENT_PARSER_VERSION,
+            account.id,
+            account.account_type,
+            statement_period,
+        )
+
+        cache_enabled = is_statement_parse_cache_enabled()
+        parsed = statement_parse_cache.get(cache_key) if cache_enabled else None
+        if parsed is not None:
+            return StatementImportResult(
+                parsed_count=len(parsed.rows),
+                invalid_count=parsed.invalid_count,
+                errors=list(parsed.errors),
+                rows=unpack_rows(NormalizedStatementRow, parsed.rows),
+                file_hash=file_hash,
+                institution=parsed.institution,
+                statement_status=statement_status,
+                balance_summary=dict(parsed.balance_summary) if parsed.balance_summary is not None else None,
+                reconciliation=copy.deepcopy(parsed.reconciliation),
+                reconciliation_warnings=list(parsed.reconciliation_warnings),
+            )
+
+        named_content = io.BytesIO(content)
+        named_content.name = getattr(statement_file, "name", "")
+        result = self._parse_statement(
+            account,
+            named_content,
+            institution,
+            statement_period,
+            statement_status,
+            file_hash=file_hash,
+        )
+        with _timed(result.timings, "validate"):
+            self._validate_bofa_banking_balances(account, institution, result)
+            self._validate_robinhood_banking_balances(account, institution, result)
+            self._validate_amex_checking_balances(account, institution, result)
+
+        if cache_enabled and result.rows:
+            statement_parse_cache.set(
+                cache_key,
+                ParsedStatement(
+                    institution=result.institution,
+                    rows=pack_rows(result.rows),
+                    invalid_count=result.invalid_count,
+                    errors=tuple(result.errors),
+                    balance_summary=copy.deepcopy(result.balance_summary),
+                    reconciliation=copy.deepcopy(result.reconciliation),
+                    reconciliation_warnings=tuple(result.reconciliation_warnings),
+                ),
+            )
+        return result
+
     def _parse_statement(
         self,
         account: FinancialAccount,
@@ -252,31 +692,24 @@ class StatementImportService:
         institution: str,
         statement_period: str,
         statement_status: str,
+        *,
+        file_hash: str = "",
     ) -> StatementImportResult:
         result = StatementImportResult(institution=institution, statement_status=statement_status)
-        parser_key = institution if get_parser_config(institution) else parser_key_for_slug(institution)
-        config = get_parser_config(parser_key) if parser_key else None
-        if config is None:
-            result.errors.append(f"Unsupported institution: {institution}")
-            return result
-        result.institution = parser_key
-
-        filename = getattr(statement_file, "name", "")
-        extension = Path(filename).suffix.lower()
-        allowed_extensions = supported_extensions_for_parser(parser_key)
-        if extension not in allowed_extensions:
-            allowed_types = ", ".join(supported_file_types_for_parser(parser_key)).upper()
-            result.errors.append(f"Unsupported file type. Upload a {allowed_types} file for this institution.")
+        resolved = self._resolve_statement_parser(institution, getattr(statement_file, "name", ""), result)
+        if resolved is None:
             return result
+        parser_key, config, extension = resolved
 
         content = statement_file.read() if hasattr(statement_file, "read") else statement_file
         if isinstance(content, str):
             content = content.encode()
-        result.file_hash = hashlib.sha256(content).hexdigest()
+        result.file_hash = file_hash or hashlib.sha256(content).hexdigest()
         result._raw_content = content  # noqa: SLF001 — used for BoFA balance validation
 
         try:
-            frame = self._read_frame(content, extension, parser_key=parser_key)
+            with _timed(result.timings, "read"):
+                frame = self._read_frame(content, extension, parser_key=parser_key)
         except Exception as exc:
             result.errors.append(f"Failed to parse statement file: {exc}")
             return result
@@ -295,28 +728,101 @@ class StatementImportService:
                 result.errors.append(f"Missing required columns: {', '.join(missing)}")
                 return result
 
-        for row_number, raw_row in enumerate(frame.to_dict("records"), start=2):
-            raw_mapping = {str(key).strip(): value for key, value in raw_row.items()}
-            normalized = self._normalize_row(
-                account=account,
-                config=config,
-                institution=parser_key,
-                source_file_hash=result.file_hash,
-                statement_period=statement_period,
-                row_number=row_number,
-                raw_row=raw_mapping,
-                column_map=column_map,
-            )
-            if normalized is None:
-                result.invalid_count += 1
-                continue
-            result.rows.append(normalized)
+        result.rows.extend(self._normalize_frame(account, frame, column_map, parser_key, statement_period, result))
 
         result.parsed_count = len(result.rows)
         if not result.rows and not result.errors:
             result.errors.append("No valid statement rows found")
         return result
 
+    def _resolve_statement_parser(
+        self,
+        institution: str,
+        filename: str,
+        result: StatementImportResult,
+    ) -> tuple[str, dict[str, Any], str] | None:
+        """Resolve (parser key, parser config, file extension), or record why the file is unsupported."""
+        parser_key = institution if get_parser_config(institution) else parser_key_for_slug(institution)
+        config = get_parser_config(parser_key) if parser_key else None
+        if config is None:
+            result.errors.append(f"Unsupported institution: {institution}")
+            return None
+        result.institution = parser_key
+
+        extension = Path(filename).suffix.lower()
+        allowed_extensions = supported_extensions_for_parser(parser_key)
+        if extension not in allowed_extensions:
+            allowed_types = ", ".join(supported_file_types_for_parser(parser_key)).upper()
+            result.errors.append(f"Unsupported file type. Upload a {allowed_types} file for this institution.")
+            return None
+        return parser_key, config, extension
+
+    def _normalize_frame(
+        self,
+        account: FinancialAccount,
+        frame: pd.DataFrame,
+        column_map: dict[str, str | None],
+        parser_key: str,
+        statement_period: str,
+        result: StatementImportResult,
+        *,
+        first_row_number: int = 2,
+    ) -> list[NormalizedStatementRow]:
+        """Normalize a frame column-wise and build one row per valid record, counting invalid ones."""
+        with _timed(result.timings, "normalize"):
+            text = frame.apply(self._stringify_series)
+            columns = {
+                field_name: text[column] if column else pd.Series("", index=text.index, dtype=object)
+                for field_name, column in column_map.items()
+            }
+            posted_dates = self._map_unique(columns["date"], self._parse_date)
+            descriptions = columns["description"].str.split().str.join(" ")
+            running_balances = self._text_column(text, RUNNING_BALANCE_COLUMNS)
+
+        rows: list[NormalizedStatementRow] = []
+        with _timed(result.timings, "rows"):
+            parsed_amounts: dict[tuple[str, str, str, str], tuple[Decimal | None, str]] = {}
+            row_values = zip(
+                posted_dates,
+                descriptions,
+                zip(columns["amount"], columns["debit"], columns["credit"], columns["type"]),
+                columns["activity"],
+                columns["symbol"],
+                columns["quantity"],
+                running_balances,
+                text.to_dict("records"),
+            )
+            for row_number, values in enumerate(row_values, start=first_row_number):
+                posted_date, description, amount_key, activity_type, symbol, quantity, running_balance, raw_row = values
+                if amount_key not in parsed_amounts:
+                    amount_value, debit_value, credit_value, type_value = amount_key
+                    parsed_amounts[amount_key] = self._parse_amount(
+                        amount_value, debit_value, credit_value, account, type_value=type_value
+                    )
+                amount, transaction_type = parsed_amounts[amount_key]
+                if posted_date is None or amount is None or not description:
+                    result.invalid_count += 1
+                    continue
+                rows.append(
+                    self._build_row(
+                        account=account,
+                        institution=parser_key,
+                        source_file_hash=result.file_hash,
+                        statement_period=statement_period,
+                        row_number=row_number,
+                        posted_date=posted_date,
+                        description=description,
+                        amount=amount,
+                        transaction_type=transaction_type,
+                        activity_type=activity_type,
+                        symbol=symbol,
+                        quantity=quantity,
+                        running_balance=running_balance,
+                        raw_data=raw_row,
+                    )
+                )
+        return rows
+
     def _read_frame(self, content: bytes, extension: str, *, parser_key: str = "") -> pd.DataFrame:
         reader = get_parser_reader(parser_key)
         if extension == ".pdf":
@@ -489,20 +995,16 @@ class StatementImportService:
         """Prefer transaction-table balances when the summary preamble was misparsed."""
         corrected = dict(summary)
 
-        for _, raw_row in frame.iterrows():
-            raw_mapping = {str(key).strip(): value for key, value in raw_row.to_dict().items()}
-            description = self._first_value(raw_mapping, ["Description", "Payee"])
-            if "beginning balance" not in description.lower():
-                continue
-            running_balance = self._signed_decimal(
-                self._first_value(raw_mapping, ["Running Bal.", "Running Bal", "Running Balance"])
-            )
-            if running_balance is None:
-                break
+        descriptions = self._text_column(frame, ["Description", "Payee"])
+        beginning_rows = descriptions.str.lower().str.contains("beginning balance", regex=False).to_numpy()
+        if not beginning_rows.any():
+            return corrected
+        running_values = self._text_column(frame, ["Running Bal.", "Running Bal", "Running Balance"])
+        running_balance = self._signed_decimal(running_values.iloc[beginning_rows.argmax()])
+        if running_balance is not None:
             parsed_beginning = Decimal(corrected["beginning_balance"])
             if abs(running_balance - parsed_beginning) > Decimal("0.01"):
                 corrected["beginning_balance"] = str(running_balance.quantize(Decimal("0.01")))
-            break
 
         return corrected
 
@@ -677,33 +1179,22 @@ class StatementImportService:
         errors: list[str] = []
         expected = beginning_balance
 
-        for index, raw_row in frame.iterrows():
-            row_number = int(index) + 2
-            raw_mapping = {str(key).strip(): value for key, value in raw_row.to_dict().items()}
-            amount_value = self._first_value(raw_mapping, ["Amount"])
-            running_value = self._first_value(
-                raw_mapping,
-                ["Running Bal.", "Running Bal", "Running Balance", "Balance"],
-            )
-            signed_amount = self._signed_decimal(amount_value)
+        signed_amounts = self._map_unique(self._text_column(frame, ["Amount"]), self._signed_decimal)
+        running_balances = self._map_unique(self._text_column(frame, RUNNING_BALANCE_COLUMNS), self._signed_decimal)
 
+        for index, signed_amount, running_balance in zip(frame.index, signed_amounts, running_balances):
+            row_number = int(index) + 2
             if signed_amount is None:
-                if running_value:
-                    running_balance = self._signed_decimal(running_value)
-                    if running_balance is not None:
-                        if abs(running_balance - expected) > Decimal("0.01"):
-                            errors.append(
-                                f"Row {row_number}: running balance is {running_balance}, "
-                                f"expected {expected.quantize(Decimal('0.01'))}."
-                            )
-                        expected = running_balance
+                if running_balance is not None:
+                    if abs(running_balance - expected) > Decimal("0.01"):
+                        errors.append(
+                            f"Row {row_number}: running balance is {running_balance}, "
+                            f"expected {expected.quantize(Decimal('0.01'))}."
+                        )
+                    expected = running_balance
                 continue
 
             expected = (expected + signed_amount).quantize(Decimal("0.01"))
-            if not running_value:
-                continue
-
-            running_balance = self._signed_decimal(running_value)
             if running_balance is None:
                 continue
             if abs(running_balance - expected) > Decimal("0.01"):
@@ -853,53 +1344,23 @@ class StatementImportService:
         else:
             result.reconciliation["account_ending_ok"] = True
 
-    def _normalize_row(
+    def _build_row(
         self,
         account: FinancialAccount,
-        config: dict[str, Any],
         institution: str,
         source_file_hash: str,
         statement_period: str,
         row_number: int,
-        raw_row: dict[str, Any],
-        column_map: dict[str, str | None] | None = None,
-    ) -> NormalizedStatementRow | None:
-        if column_map is not None:
-            date_value = self._row_value(raw_row, column_map.get("date"))
-            description = self._row_value(raw_row, column_map.get("description"))
-            amount_value = self._row_value(raw_row, column_map.get("amount"))
-            debit_value = self._row_value(raw_row, column_map.get("debit"))
-            credit_value = self._row_value(raw_row, column_map.get("credit"))
-            type_value = self._row_value(raw_row, column_map.get("type"))
-            activity_type = self._row_value(raw_row, column_map.get("activity"))
-            symbol = self._row_value(raw_row, column_map.get("symbol"))
-            quantity = self._row_value(raw_row, column_map.get("quantity"))
-        else:
-            date_value = self._first_value(raw_row, config["date"])
-            description = self._first_value(raw_row, config["description"])
-            amount_value = self._first_value(raw_row, config["amount"])
-            debit_value = self._first_value(raw_row, config.get("debit", []))
-            credit_value = self._first_value(raw_row, config.get("credit", []))
-            type_value = self._first_value(raw_row, config.get("type", []))
-            activity_type = self._first_value(raw_row, config.get("activity", []))
-            symbol = self._first_value(raw_row, config.get("symbol", []))
-            quantity = self._first_value(raw_row, config.get("quantity", []))
-        running_balance = self._first_value(
-            raw_row,
-            ["Running Bal.", "Running Bal", "Running Balance", "Balance"],
-        )
-
-        posted_date = self._parse_date(date_value)
-        amount, transaction_type = self._parse_amount(
-            amount_value,
-            debit_value,
-            credit_value,
-            account,
-            type_value=type_value,
-        )
-        if posted_date is None or amount is None or not description:
-            return None
-        description = self._normalize_description(description)
+        posted_date: date,
+        description: str,
+        amount: Decimal,
+        transaction_type: str,
+        activity_type: str,
+        symbol: str,
+        quantity: str,
+        running_balance: str,
+        raw_data: dict[str, str],
+    ) -> NormalizedStatementRow:
         row_hash_base = self._row_hash_base(
             account.id,
             posted_date,
@@ -909,8 +1370,6 @@ class StatementImportService:
             symbol,
             quantity,
         )
-        row_hash = hashlib.sha256(row_hash_base.encode()).hexdigest()
-
         return NormalizedStatementRow(
             row_number=row_number,
             posted_date=posted_date,
@@ -919,22 +1378,36 @@ class StatementImportService:
             transaction_type=transaction_type,
             institution=institution,
             source_file_hash=source_file_hash,
-            source_row_hash=row_hash,
+            source_row_hash=hashlib.sha256(row_hash_base.encode()).hexdigest(),
             source_row_hash_base=row_hash_base,
             statement_period=statement_period,
             activity_type=activity_type,
             symbol=symbol,
             quantity=quantity,
             running_balance=running_balance,
-            raw_data={key: self._stringify_value(value) for key, value in raw_row.items()},
+            raw_data=raw_data,
         )
 
-    def _classify_rows(self, account: FinancialAccount, result: StatementImportResult) -> None:
-        existing_hashes = self._get_existing_row_hashes(account)
-        existing_signatures = self._get_existing_change_signatures(account)
+    def _classify_rows(
+        self,
+        account: FinancialAccount,
+        result: StatementImportResult,
+        rows: list[NormalizedStatementRow] | None = None,
+        *,
+        before_id: int | None = None,
+    ) -> None:
+        """
+        Mark rows as duplicates or possible changes of already-imported transactions.
+
+        Args:
+            rows: Rows to classify; defaults to all of ``result.rows``
+            before_id: Only compare against transactions with ids up to this one
+        """
+        rows = result.rows if rows is None else rows
+        existing_hashes, existing_signatures = self._get_existing_source_keys(account, rows, before_id=before_id)
         seen_hashes = set()
 
-        for row in result.rows:
+        for row in rows:
             within_file_key = f"{row.source_row_hash}:{row.row_number}"
             if within_file_key in seen_hashes:
                 row.status = "duplicate"
@@ -947,46 +1420,47 @@ class StatementImportService:
                 result.duplicate_count += 1
                 continue
 
-            change_signature = f"{account.id}:{row.posted_date}:{self._normalize_description(row.description)}"
-            if change_signature in existing_signatures:
+            if Transaction.change_signature_for(row.posted_date, row.description) in existing_signatures:
                 row.status = "possible_changed"
                 result.possible_changed_count += 1
 
-    def _get_existing_row_hashes(self, account: FinancialAccount) -> set[str]:
-        transactions = Transaction.objects.filter(account=account, sync_source="csv").values(
-            "date",
-            "amount",
-            "description",
-            "raw_data",
-        )
-        hashes = set()
-        for transaction in transactions:
-            raw_data = transaction.get("raw_data") or {}
-            source_row_hash = raw_data.get("source_row_hash")
-            if source_row_hash:
-                hashes.add(source_row_hash)
-                continue
+    def _get_existing_source_keys(
+        self,
+        account: FinancialAccount,
+        rows: list[NormalizedStatementRow],
+        *,
+        before_id: int | None = None,
+    ) -> tuple[set[str], set[str]]:
+        """
+        Look up which of the file's row hashes and change signatures are already imported.
 
-            base = self._row_hash_base(
-                account.id,
-                transaction["date"],
-                transaction["amount"],
-                transaction["description"],
-            )
-            hashes.add(hashlib.sha256(base.encode()).hexdigest())
-            old_key = f"{account.id}:{transaction['date']}:{transaction['amount']}:{transaction['description']}"
-            hashes.add(hashlib.md5(old_key.encode()).hexdigest())
-        return hashes
+        Both probes are served by the (account, key) indexes. Row hashes keep
+        the import-time date even if the row's date is edited later, so only
+        the change-signature probe, which follows the current date, is limited
+        to the file's date range.
 
-    def _get_existing_change_signatures(self, account: FinancialAccount) -> set[str]:
-        transactions = Transaction.objects.filter(account=account, sync_source="csv").values_list(
-            "date",
-            "description",
+        Returns:
+            Tuple of (existing row hashes, existing change signatures)
+        """
+        if not rows:
+            return set(), set()
+
+        row_hashes = {row.source_row_hash for row in rows}
+        signatures = {Transaction.change_signature_for(row.posted_date, row.description) for row in rows}
+        imported = Transaction.objects.filter(account=account, sync_source="csv")
+        if before_id is not None:
+            imported = imported.filter(id__lte=before_id)
+        existing_hashes = set(imported.filter(source_row_hash__in=row_hashes).values_list("source_row_hash", flat=True))
+        in_file_range = imported.filter(
+            date__gte=min(row.posted_date for row in rows),
+            date__lte=max(row.posted_date for row in rows),
         )
-        return {
-            f"{account.id}:{transaction_date}:{self._normalize_description(description)}"
-            for transaction_date, description in transactions
-        }
+        existing_signatures = set(
+            in_file_range.filter(source_change_signature__in=signatures).values_list(
+                "source_change_signature", flat=True
+            )
+        )
+        return existing_hashes, existing_signatures
 
     def _row_hash_base(
         self,
@@ -998,17 +1472,7 @@ class StatementImportService:
         symbol: str = "",
         quantity: str = "",
     ) -> str:
-        return ":".join(
-            [
-                str(account_id),
-                posted_date.isoformat(),
-                str(abs(Decimal(str(amount))).quantize(Decimal("0.01"))),
-                self._normalize_description(description),
-                activity_type.strip().lower(),
-                symbol.strip().upper(),
-                quantity.strip(),
-            ]
-        )
+        return Transaction.row_hash_base(account_id, posted_date, amount, description, activity_type, symbol, quantity)
 
     def _parse_date(self, value: str) -> date | None:
         if not value:
@@ -1099,16 +1563,22 @@ class StatementImportService:
         except InvalidOperation:
             return None
 
-    def _first_value(self, raw_row: dict[str, Any], candidates: list[str]) -> str:
-        lower_map = {key.strip().lower(): key for key in raw_row}
+    def _text_column(self, frame: pd.DataFrame, candidates: list[str]) -> pd.Series:
+        """Stringified values of the first candidate column that is non-empty in each row."""
+        lower_map = {str(column).strip().lower(): column for column in frame.columns}
+        combined = pd.Series("", index=frame.index, dtype=object)
         for candidate in candidates:
-            raw_key = lower_map.get(candidate.strip().lower())
-            if raw_key is None:
+            column = lower_map.get(candidate.strip().lower())
+            if column is None:
                 continue
-            value = self._stringify_value(raw_row.get(raw_key))
-            if value:
-                return value
-        return ""
+            combined = combined.where(combined != "", self._stringify_series(frame[column]))
+        return combined
+
+    @staticmethod
+    def _map_unique(series: pd.Series, parse: Callable[[str], Any]) -> list[Any]:
+        """Apply a scalar parser once per distinct value of a column."""
+        parsed = {value: parse(value) for value in series.unique()}
+        return [parsed[value] for value in series]
 
     def _resolve_column_map(
         self,
@@ -1137,15 +1607,9 @@ class StatementImportService:
                     break
         return resolved
 
-    def _row_value(self, raw_row: dict[str, Any], column_key: str | None) -> str:
-        if not column_key:
-            return ""
-        return self._stringify_value(raw_row.get(column_key))
-
-    def _stringify_value(self, value: Any) -> str:
-        if value is None or pd.isna(value):
-            return ""
-        return str(value).strip()
+    @staticmethod
+    def _stringify_series(series: pd.Series) -> pd.Series:
+        return series.where(series.notna(), "").astype(str).str.strip()
 
     def _normalize_description(self, description: str) -> str:
         return " ".join(str(description).split())
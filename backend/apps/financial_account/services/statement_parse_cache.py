@@ -0,0 +1,146 @@
+"""Process-local cache of parsed statements, shared by preview and commit.
+
+The import UI previews a statement and commits the same file seconds later.
+Parsing (pandas/pdfplumber) and the statement-internal balance checks depend
+only on the file, the parser and the target account, so their output is kept
+here keyed by ``(file_hash, institution, parser version, account, account
+type, statement period)``. Commit reuses it and only re-runs the steps that
+read the database: duplicate classification and opening-balance planning.
+
+Rows are stored as plain tuples. Entries expire after
+``STATEMENT_PARSE_CACHE_TTL_SECONDS`` and the least recently used ones are
+evicted once the cache holds more than ``STATEMENT_PARSE_CACHE_MAX_ROWS``
+rows in total. A commit served by another process simply parses again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from django.conf import settings
+
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_ROWS = 200_000
+
+
+def is_statement_parse_cache_enabled() -> bool:
+    """True when parsed statements should be reused between preview and commit."""
+    return getattr(settings, "STATEMENT_PARSE_CACHE_ENABLED", True)
+
+
+@dataclass
+class StatementParseCacheStats:
+    """Hit/miss counters for the statement parse cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ParsedStatement:
+    """File-derived part of a StatementImportResult."""
+
+    institution: str
+    rows: tuple[tuple, ...]
+    invalid_count: int
+    errors: tuple[str, ...]
+    balance_summary: dict[str, str] | None
+    reconciliation: dict[str, Any]
+    reconciliation_warnings: tuple[str, ...]
+
+
+class StatementParseCache:
+    """TTL + row-budget LRU of ParsedStatement entries."""
+
+    def __init__(self, ttl_seconds: int | None = None, max_rows: int | None = None):
+        self._ttl_seconds = ttl_seconds
+        self._max_rows = max_rows
+        self._entries: OrderedDict[tuple, tuple[float, ParsedStatement]] = OrderedDict()
+        self._row_count = 0
+        self._lock = threading.Lock()
+        self.stats = StatementParseCacheStats()
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return getattr(settings, "STATEMENT_PARSE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+
+    @property
+    def max_rows(self) -> int:
+        if self._max_rows is not None:
+            return self._max_rows
+        return getattr(settings, "STATEMENT_PARSE_CACHE_MAX_ROWS", DEFAULT_MAX_ROWS)
+
+    def get(self, key: tuple) -> ParsedStatement | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._discard(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, parsed: ParsedStatement) -> None:
+        if len(parsed.rows) > self.max_rows:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, parsed)
+            self._row_count += len(parsed.rows)
+            while self._row_count > self.max_rows:
+                self._discard(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._row_count = 0
+
+    def reset_stats(self) -> None:
+        """Reset counters (for tests)."""
+        with self._lock:
+            self.stats = StatementParseCacheStats()
+
+    def _discard(self, key: tuple) -> None:
+        _, parsed = self._entries.pop(key)
+        self._row_count -= len(parsed.rows)
+
+
+statement_parse_cache = StatementParseCache()
+
+
+def get_statement_parse_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for this process's statement parse cache."""
+    return statement_parse_cache.stats.as_dict()
+
+
+def pack_rows(rows: list) -> tuple[tuple, ...]:
+    """Flatten NormalizedStatementRow objects into tuples in field order."""
+    if not rows:
+        return ()
+    names = [row_field.name for row_field in fields(rows[0])]
+    return tuple(tuple(getattr(row, name) for name in names) for row in rows)
+
+
+def unpack_rows(row_class: type, packed: tuple[tuple, ...]) -> list:
+    """Rebuild fresh row objects; raw_data dicts are copied so callers may mutate them."""
+    rows = [row_class(*values) for values in packed]
+    for row in rows:
+        row.raw_data = dict(row.raw_data)
+    return rows
@@ -81,7 +81,7 @@ AMEX EPAYMENT ACH PMT *****0019
 08/31/2024 Ending Balance $7,073.68
 """.strip()
         monkeypatch.setattr(
-            "apps.financial_account.institutions.parsers.amex_checking_pdf._extract_pdf_text",
+            "apps.financial_account.institutions.parsers.amex_checking_pdf.extract_pdf_text",
             lambda _content: sample_text,
         )
 
@@ -109,7 +109,7 @@ ID 009002315986217
 05/31/2025 Ending Balance $6,940.01
 """.strip()
         monkeypatch.setattr(
-            "apps.financial_account.institutions.parsers.amex_checking_pdf._extract_pdf_text",
+            "apps.financial_account.institutions.parsers.amex_checking_pdf.extract_pdf_text",
             lambda _content: sample_text,
         )
 
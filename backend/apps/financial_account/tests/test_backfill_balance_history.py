@@ -0,0 +1,74 @@
+"""Tests for the backfill_balance_history management command."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction
+
+
+@pytest.fixture
+def accounts(db):
+    user = User.objects.create_user(username="backfill", email="backfill@test.com", password="testpass123")
+    created = []
+    for index, (account_type, balance) in enumerate(
+        [("checking", Decimal("2500.00")), ("credit_card", Decimal("-310.55")), ("savings", Decimal("0.00"))]
+    ):
+        account = FinancialAccount.objects.create(user=user, name=f"Account {index}", account_type=account_type)
+        FinancialAccount.objects.filter(pk=account.pk).update(balance=balance)
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user=user,
+                    account=account,
+                    date=date(2024, 1, 1) + timedelta(days=day // 2),
+                    amount=Decimal(f"{day * 3 + index}.{day % 100:02d}"),
+                    transaction_type="credit" if day % 4 == 0 else "debit",
+                    description=f"Txn {day}",
+                )
+                for day in range(40)
+            ]
+        )
+        created.append(account)
+    # Account with no transactions should be skipped.
+    created.append(FinancialAccount.objects.create(user=user, name="Empty", account_type="checking"))
+    return created
+
+
+def _history():
+    return sorted(AccountBalanceHistory.objects.values_list("account_id", "date", "balance"))
+
+
+class TestBatchedBackfill:
+    def test_batched_matches_per_account_mode(self, accounts):
+        call_command("backfill_balance_history", "--clear-existing", stdout=StringIO())
+        expected = _history()
+        assert len(expected) == 60
+
+        AccountBalanceHistory.objects.all().delete()
+        out = StringIO()
+        call_command("backfill_balance_history", "--batched", "--batch-size", "2", stdout=out)
+
+        assert _history() == expected
+        assert "Shard 2/2" in out.getvalue()
+        assert "Created 60 balance history records for 4 accounts" in out.getvalue()
+
+    def test_batched_overwrites_existing_rows(self, accounts):
+        AccountBalanceHistory.objects.create(account=accounts[0], date=date(2024, 1, 1), balance=Decimal("1.00"))
+        call_command("backfill_balance_history", "--batched", stdout=StringIO())
+
+        row = AccountBalanceHistory.objects.get(account=accounts[0], date=date(2024, 1, 1))
+        assert row.balance != Decimal("1.00")
+        assert AccountBalanceHistory.objects.filter(account=accounts[0]).count() == 20
+
+    def test_dry_run_writes_nothing(self, accounts):
+        out = StringIO()
+        call_command("backfill_balance_history", "--batched", "--dry-run", stdout=out)
+
+        assert AccountBalanceHistory.objects.count() == 0
+        assert "[DRY RUN] Would create 60" in out.getvalue()
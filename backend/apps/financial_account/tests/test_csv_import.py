@@ -216,6 +216,77 @@ class TestCSVDuplicateDetection:
         assert result2.imported_count == 1
         assert result2.duplicate_count == 1
 
+    def test_import_stores_indexed_source_keys(self, account):
+        csv_text = "date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n"
+        result = _import_generic(account, _make_named_csv(csv_text))
+
+        txn = Transaction.objects.get(account=account)
+        assert txn.source_row_hash == result.rows[0].source_row_hash
+        assert txn.source_change_signature == Transaction.change_signature_for(date(2025, 6, 1), "Coffee")
+
+    def test_row_without_recorded_hash_is_still_a_duplicate(self, account):
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=date(2025, 6, 1),
+            amount=Decimal("50.00"),
+            description="Coffee",
+            transaction_type="debit",
+            sync_source="csv",
+        )
+
+        csv_text = "date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n"
+        result = _import_generic(account, _make_named_csv(csv_text))
+
+        assert result.imported_count == 0
+        assert result.duplicate_count == 1
+
+    def test_description_edit_updates_change_signature(self, account):
+        _import_generic(account, _make_named_csv("date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n"))
+        txn = Transaction.objects.get(account=account)
+
+        txn.description = "Morning  coffee"
+        txn.save(update_fields=["description"])
+
+        txn.refresh_from_db()
+        assert txn.source_change_signature == Transaction.change_signature_for(date(2025, 6, 1), "Morning coffee")
+
+    def test_row_with_edited_date_is_still_a_duplicate(self, account):
+        csv_text = "date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n"
+        _import_generic(account, _make_named_csv(csv_text))
+        txn = Transaction.objects.get(account=account)
+        txn.date = date(2025, 7, 15)
+        txn.save()
+
+        result = _import_generic(account, _make_named_csv(csv_text))
+
+        assert result.imported_count == 0
+        assert result.duplicate_count == 1
+
+    def test_bulk_update_refreshes_change_signature(self, account):
+        from apps.transaction.services.bulk_transaction_service import bulk_update_transactions
+
+        _import_generic(account, _make_named_csv("date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n"))
+        txn = Transaction.objects.get(account=account)
+
+        txn.date = date(2025, 6, 2)
+        bulk_update_transactions([txn], ["date"])
+
+        txn.refresh_from_db()
+        assert txn.source_change_signature == Transaction.change_signature_for(date(2025, 6, 2), "Coffee")
+
+    def test_classification_probes_only_the_file_keys(self, account, django_assert_num_queries):
+        history = "".join(f"2025-01-{day:02d},{day}.00,History {day},debit\n" for day in range(1, 29))
+        _import_generic(account, _make_named_csv("date,amount,description,type\n" + history))
+        service = StatementImportService()
+        csv_text = "date,amount,description,type\n2025-01-05,5.00,History 5,debit\n2025-07-01,9.00,New,debit\n"
+        result = service._parse_statement(account, _make_named_csv(csv_text), "generic", "", "provisional")
+
+        with django_assert_num_queries(2):
+            service._classify_rows(account, result)
+
+        assert [row.status for row in result.rows] == ["duplicate", "new"]
+
 
 class TestCSVInvalidFormat:
     """Invalid CSV formats produce appropriate errors."""
@@ -309,6 +380,29 @@ class TestBatchStatementImport:
         assert account.balance == Decimal("940.00")
         assert calls["count"] == 1
 
+    def test_import_reports_stage_timings(self, account):
+        result = _import_generic(account, _make_named_csv("date,amount,description\n2025-06-01,-10.00,One\n"))
+
+        assert set(result.timings) == {"read", "normalize", "rows", "classify", "validate", "insert"}
+        assert result.as_dict()["timings"] == result.timings
+
+    def test_parse_normalizes_columns_once_per_value(self, account):
+        csv_data = _make_named_csv(
+            "Date,Description,Amount,Running Balance,Balance\n"
+            "06/01/2025,  Coffee   Shop ,-4.50,95.50,\n"
+            "06/01/2025,Refund,4.50,,100.00\n"
+            "not a date,Broken,1.00,,\n"
+        )
+        result = StatementImportService()._parse_statement(account, csv_data, "generic", "", "provisional")
+
+        assert result.invalid_count == 1
+        assert [(row.posted_date, row.description, row.amount) for row in result.rows] == [
+            (date(2025, 6, 1), "Coffee Shop", Decimal("4.50")),
+            (date(2025, 6, 1), "Refund", Decimal("4.50")),
+        ]
+        assert [row.running_balance for row in result.rows] == ["95.50", "100.00"]
+        assert result.rows[0].raw_data["Description"] == "Coffee   Shop"
+
 
 class TestStatementImportService:
     """CSV/Excel statement import preview and commit behavior."""
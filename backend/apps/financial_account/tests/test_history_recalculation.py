@@ -4,10 +4,13 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
 from apps.richtato_user.models import User
 from apps.transaction.models import Transaction
+from apps.transaction.signals import recalculate_balance_for_date, update_balances_from_date
 
 
 @pytest.fixture
@@ -172,3 +175,68 @@ class TestHistorySourceTracking:
         )
         history = AccountBalanceHistory.objects.get(account=account, date=today)
         assert history.source == "transaction"
+
+
+def _seed_daily_transactions(account, start: date, days: int) -> None:
+    """Create alternating credits/debits on consecutive days without firing signals."""
+    Transaction.objects.bulk_create(
+        [
+            Transaction(
+                user=account.user,
+                account=account,
+                date=start + timedelta(days=i),
+                amount=Decimal(f"{(i % 7) * 10 + 5}.25"),
+                transaction_type="credit" if i % 3 == 0 else "debit",
+                description=f"Seed {i}",
+            )
+            for i in range(days)
+        ]
+    )
+
+
+class TestPrefixSumRecalculation:
+    """update_balances_from_date matches the per-date engine with constant query count."""
+
+    def test_matches_per_date_recalculation(self, account):
+        start = date(2024, 1, 1)
+        _seed_daily_transactions(account, start, 45)
+        # Same-day entries and a history-only date must both be handled.
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user=account.user,
+                    account=account,
+                    date=start + timedelta(days=10),
+                    amount=Decimal("99.99"),
+                    transaction_type="debit",
+                    description="Same day",
+                )
+            ]
+        )
+        orphan_date = start + timedelta(days=100)
+        AccountBalanceHistory.objects.create(account=account, date=orphan_date, balance=Decimal("1"), source="manual")
+
+        from_date = start + timedelta(days=5)
+        expected = {}
+        dates = set(Transaction.objects.filter(account=account, date__gte=from_date).values_list("date", flat=True))
+        for target_date in sorted(dates | {orphan_date}):
+            expected[target_date] = recalculate_balance_for_date(account, target_date, account.balance)
+
+        AccountBalanceHistory.objects.filter(account=account).update(balance=Decimal("0"))
+        update_balances_from_date(account, from_date)
+
+        actual = dict(
+            AccountBalanceHistory.objects.filter(account=account, date__gte=from_date).values_list("date", "balance")
+        )
+        assert actual == expected
+        assert AccountBalanceHistory.objects.get(account=account, date=orphan_date).source == "transaction"
+
+    @pytest.mark.parametrize("days", [10, 150])
+    def test_query_count_independent_of_history_length(self, account, days):
+        _seed_daily_transactions(account, date(2020, 1, 1), days)
+
+        with CaptureQueriesContext(connection) as ctx:
+            update_balances_from_date(account, date(2020, 1, 1))
+
+        assert AccountBalanceHistory.objects.filter(account=account).count() == days
+        assert len(ctx.captured_queries) == 4
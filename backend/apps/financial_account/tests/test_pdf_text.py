@@ -0,0 +1,127 @@
+"""Tests for shared, cached PDF statement text extraction."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from apps.financial_account.institutions.parsers import pdf_text
+from apps.financial_account.institutions.parsers.robinhood_bank_pdf import (
+    parse_robinhood_bank_balance_summary,
+    parse_robinhood_bank_pdf,
+)
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "robinhood_checking_april_2026.pdf"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    pdf_text.clear_pdf_text_cache()
+    yield
+    pdf_text.clear_pdf_text_cache()
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    calls = {"count": 0}
+    original = pdf_text._extract_pages
+
+    def counted_extract_pages(content):
+        calls["count"] += 1
+        return original(content)
+
+    monkeypatch.setattr(pdf_text, "_extract_pages", counted_extract_pages)
+    return calls
+
+
+def test_parallel_extraction_matches_serial(settings):
+    content = FIXTURE_PATH.read_bytes()
+    serial = pdf_text.extract_pdf_text(content)
+    pdf_text.clear_pdf_text_cache()
+
+    settings.PDF_TEXT_EXTRACTION_WORKERS = 2
+    settings.PDF_TEXT_PARALLEL_MIN_PAGES = 1
+    try:
+        parallel = pdf_text.extract_pdf_text(content)
+    finally:
+        pdf_text._reset_pool()
+
+    assert parallel == serial
+    assert "Robinhood" in serial
+
+
+def test_repeat_extraction_served_from_cache(extract_calls):
+    content = FIXTURE_PATH.read_bytes()
+
+    first = pdf_text.extract_pdf_text(content)
+    second = pdf_text.extract_pdf_text(content)
+
+    assert first == second
+    assert extract_calls["count"] == 1
+
+
+def test_parser_and_balance_summary_share_one_extraction(extract_calls):
+    content = FIXTURE_PATH.read_bytes()
+
+    frame = parse_robinhood_bank_pdf(content)
+    summary = parse_robinhood_bank_balance_summary(content)
+
+    assert not frame.empty
+    assert summary is not None
+    assert extract_calls["count"] == 1
+
+
+def test_cache_evicts_least_recently_used(settings, monkeypatch):
+    settings.PDF_TEXT_CACHE_SIZE = 2
+    monkeypatch.setattr(pdf_text, "_extract_pages", lambda content: [content.decode()])
+
+    pdf_text.extract_pdf_text(b"a")
+    pdf_text.extract_pdf_text(b"b")
+    pdf_text.extract_pdf_text(b"a")
+    pdf_text.extract_pdf_text(b"c")
+
+    assert list(pdf_text._cache.values()) == ["a", "c"]
+
+
+class _InlinePool:
+    """Executor stand-in that runs submissions in the calling thread."""
+
+    def __init__(self, cancel: bool = False):
+        self.cancel = cancel
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.cancel:
+            future.cancel()
+        else:
+            future.set_result(fn(*args))
+        return future
+
+
+def test_pool_sized_from_setting_not_page_count(settings, monkeypatch):
+    settings.PDF_TEXT_EXTRACTION_WORKERS = 4
+    settings.PDF_TEXT_PARALLEL_MIN_PAGES = 1
+    requested = []
+
+    def recording_get_pool(workers):
+        requested.append(workers)
+        return _InlinePool()
+
+    monkeypatch.setattr(pdf_text, "_get_pool", recording_get_pool)
+    pdf_text.extract_pdf_text(FIXTURE_PATH.read_bytes())
+    pdf_text.extract_pdf_text((FIXTURE_PATH.parent / "robinhood_credit_may_2026.pdf").read_bytes())
+
+    assert requested == [4, 4]
+
+
+def test_cancelled_extraction_falls_back_to_serial(settings, monkeypatch):
+    content = FIXTURE_PATH.read_bytes()
+    serial = pdf_text.extract_pdf_text(content)
+    pdf_text.clear_pdf_text_cache()
+    settings.PDF_TEXT_EXTRACTION_WORKERS = 2
+    settings.PDF_TEXT_PARALLEL_MIN_PAGES = 1
+    monkeypatch.setattr(pdf_text, "_get_pool", lambda workers: _InlinePool(cancel=True))
+
+    assert pdf_text.extract_pdf_text(content) == serial
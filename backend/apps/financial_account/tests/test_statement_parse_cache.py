@@ -0,0 +1,160 @@
+"""Tests for reusing parsed statements between import preview and commit."""
+
+import io
+from decimal import Decimal
+
+import pytest
+
+from apps.financial_account.models import FinancialAccount
+from apps.financial_account.services.statement_import_service import StatementImportService
+from apps.financial_account.services.statement_parse_cache import (
+    ParsedStatement,
+    StatementParseCache,
+    get_statement_parse_cache_stats,
+    statement_parse_cache,
+)
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction
+
+STATEMENT = "date,amount,description,type\n2025-06-01,50.00,Coffee,debit\n2025-06-02,100.00,Lunch,debit\n"
+
+BOFA_STATEMENT = (
+    "Description,,Summary Amt.\n"
+    'Beginning balance as of 05/13/2026,,"723.98"\n'
+    'Ending balance as of 05/23/2026,,"450.72"\n'
+    "\n"
+    "Date,Description,Amount,Running Bal.\n"
+    '05/13/2026,Beginning balance as of 05/13/2026,,"723.98"\n'
+    '05/13/2026,"Monthly Maintenance Fee","-12.00","711.98"\n'
+    '05/18/2026,"VENMO DES:PAYMENT","-261.26","450.72"\n'
+)
+
+
+@pytest.fixture(autouse=True)
+def enabled_cache(settings):
+    settings.STATEMENT_PARSE_CACHE_ENABLED = True
+    statement_parse_cache.clear()
+    statement_parse_cache.reset_stats()
+    yield
+    statement_parse_cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="parsecache", email="parse@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Parse Cache Checking",
+        account_type="checking",
+        balance=Decimal("1000.00"),
+    )
+
+
+@pytest.fixture
+def read_frame_calls(monkeypatch):
+    calls = {"count": 0}
+    original = StatementImportService._read_frame
+
+    def counted_read_frame(self, *args, **kwargs):
+        calls["count"] += 1
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(StatementImportService, "_read_frame", counted_read_frame)
+    return calls
+
+
+def _statement(text: str = STATEMENT, name: str = "statement.csv") -> io.BytesIO:
+    statement_file = io.BytesIO(text.encode())
+    statement_file.name = name
+    return statement_file
+
+
+def _parsed(row_count: int) -> ParsedStatement:
+    return ParsedStatement(
+        institution="generic",
+        rows=tuple((index,) for index in range(row_count)),
+        invalid_count=0,
+        errors=(),
+        balance_summary=None,
+        reconciliation={},
+        reconciliation_warnings=(),
+    )
+
+
+class TestPreviewCommitReuse:
+    def test_commit_reuses_preview_parse(self, account, read_frame_calls):
+        service = StatementImportService()
+
+        preview = service.preview_statement(account, _statement(), "generic", "2025-06")
+        result = service.import_statement(account, _statement(), "generic", "2025-06")
+
+        assert read_frame_calls["count"] == 1
+        assert get_statement_parse_cache_stats()["hits"] == 1
+        assert result.imported_count == preview.parsed_count == 2
+        assert [row.as_dict() for row in result.rows] == [row.as_dict() for row in preview.rows]
+
+    def test_commit_reclassifies_against_current_rows(self, account):
+        service = StatementImportService()
+
+        service.import_statement(account, _statement(), "generic", "2025-06")
+        again = service.import_statement(account, _statement(), "generic", "2025-06")
+
+        assert again.imported_count == 0
+        assert again.duplicate_count == 2
+        assert Transaction.objects.filter(account=account).count() == 2
+
+    def test_key_includes_period_and_account(self, account, user, read_frame_calls):
+        service = StatementImportService()
+        other = FinancialAccount.objects.create(user=user, name="Other", account_type="checking")
+
+        service.preview_statement(account, _statement(), "generic", "2025-06")
+        service.preview_statement(account, _statement(), "generic", "2025-07")
+        service.preview_statement(other, _statement(), "generic", "2025-06")
+
+        assert read_frame_calls["count"] == 3
+
+    def test_cached_balance_checks_match_fresh_ones(self, account, settings):
+        service = StatementImportService()
+        settings.STATEMENT_PARSE_CACHE_ENABLED = False
+        fresh = service.preview_statement(account, _statement(BOFA_STATEMENT), "bofa", "2026-05")
+        settings.STATEMENT_PARSE_CACHE_ENABLED = True
+
+        service.preview_statement(account, _statement(BOFA_STATEMENT), "bofa", "2026-05")
+        cached = service.preview_statement(account, _statement(BOFA_STATEMENT), "bofa", "2026-05")
+
+        assert get_statement_parse_cache_stats()["hits"] == 1
+        assert fresh.balance_summary is not None
+        assert cached.balance_summary == fresh.balance_summary
+        assert cached.reconciliation == fresh.reconciliation
+        assert cached.reconciliation_warnings == fresh.reconciliation_warnings
+
+
+class TestStatementParseCache:
+    def test_entries_expire_after_ttl(self):
+        cache = StatementParseCache(ttl_seconds=0, max_rows=10)
+        cache.set(("a",), _parsed(1))
+
+        assert cache.get(("a",)) is None
+        assert cache.stats.expirations == 1
+
+    def test_oldest_entries_evicted_past_row_budget(self):
+        cache = StatementParseCache(ttl_seconds=60, max_rows=5)
+        cache.set(("a",), _parsed(3))
+        cache.set(("b",), _parsed(2))
+        cache.get(("a",))
+
+        cache.set(("c",), _parsed(2))
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) is not None
+        assert cache.stats.evictions == 1
+
+    def test_oversized_statement_is_not_cached(self):
+        cache = StatementParseCache(ttl_seconds=60, max_rows=2)
+        cache.set(("a",), _parsed(3))
+
+        assert cache.get(("a",)) is None
@@ -0,0 +1,168 @@
+"""Tests for chunked (streaming) CSV statement import."""
+
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
+from apps.financial_account.services.statement_import_service import StatementImportService
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction
+
+STATEMENT = (
+    "date,amount,description,type\n"
+    "2025-06-01,50.00,Coffee,debit\n"
+    "2025-06-01,50.00,Coffee,debit\n"
+    "2025-06-02,100.00,Lunch,debit\n"
+    "not a date,1.00,Broken,debit\n"
+    "2025-06-03,1500.00,Paycheck,credit\n"
+)
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="streamtest", email="stream@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Stream Checking",
+        account_type="checking",
+        balance=Decimal("1000.00"),
+    )
+
+
+@pytest.fixture
+def other_account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Stream Savings",
+        account_type="checking",
+        balance=Decimal("1000.00"),
+    )
+
+
+def _statement(text: str = STATEMENT, name: str = "statement.csv") -> io.BytesIO:
+    statement_file = io.BytesIO(text.encode())
+    statement_file.name = name
+    return statement_file
+
+
+def _stream(account, statement_file, **kwargs):
+    kwargs.setdefault("chunk_rows", 2)
+    return StatementImportService().import_statement_streaming(account, statement_file, "generic", **kwargs)
+
+
+class TestStreamingImport:
+    def test_matches_in_memory_import(self, account, other_account):
+        streamed = _stream(account, _statement())
+        in_memory = StatementImportService().import_statement(other_account, _statement(), "generic")
+
+        for field in ("parsed_count", "imported_count", "duplicate_count", "invalid_count", "file_hash"):
+            assert getattr(streamed, field) == getattr(in_memory, field)
+        account.refresh_from_db()
+        other_account.refresh_from_db()
+        assert account.balance == other_account.balance == Decimal("2300.00")
+        assert streamed.rows == []
+
+    def test_rows_from_earlier_chunks_are_not_duplicates(self, account):
+        result = _stream(account, _statement(), chunk_rows=1)
+
+        assert result.imported_count == 4
+        assert Transaction.objects.filter(account=account, description="Coffee").count() == 2
+
+    def test_reimport_is_classified_against_existing_rows(self, account):
+        _stream(account, _statement())
+        again = _stream(account, _statement())
+
+        assert again.imported_count == 0
+        assert again.duplicate_count == 4
+
+    def test_reports_peak_rss_always_and_traced_peak_when_asked(self, account, other_account):
+        measured = _stream(account, _statement(), measure_memory=True)
+        unmeasured = _stream(other_account, _statement())
+
+        assert measured.peak_memory_bytes > 0
+        assert measured.as_dict()["peak_memory_bytes"] == measured.peak_memory_bytes
+        assert unmeasured.peak_memory_bytes is None
+        assert unmeasured.peak_rss_bytes > 0
+        assert unmeasured.as_dict()["peak_rss_bytes"] == unmeasured.peak_rss_bytes
+        assert {"read", "normalize", "rows", "classify", "insert", "history"} <= set(measured.timings)
+
+    def test_history_and_rollups_refreshed_once(self, account, monkeypatch):
+        from apps.transaction.services import bulk_transaction_service
+
+        calls = {"history": 0, "rollups": 0}
+        original_history = bulk_transaction_service.update_balances_from_date
+        original_rollups = bulk_transaction_service.refresh_slices
+
+        def counted_history(*args, **kwargs):
+            calls["history"] += 1
+            return original_history(*args, **kwargs)
+
+        def counted_rollups(*args, **kwargs):
+            calls["rollups"] += 1
+            return original_rollups(*args, **kwargs)
+
+        monkeypatch.setattr(bulk_transaction_service, "update_balances_from_date", counted_history)
+        monkeypatch.setattr(bulk_transaction_service, "refresh_slices", counted_rollups)
+
+        result = _stream(account, _statement(), chunk_rows=1)
+
+        assert result.imported_count == 4
+        assert calls == {"history": 1, "rollups": 1}
+        assert AccountBalanceHistory.objects.get(account=account, date=date(2025, 6, 3)).balance == Decimal("2300.00")
+
+    def test_failure_in_later_chunk_rolls_back_earlier_chunks(self, account, monkeypatch):
+        from apps.financial_account.services import statement_import_service
+
+        original = statement_import_service.insert_import_transactions
+        calls = {"count": 0}
+
+        def failing_insert(*args, **kwargs):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise RuntimeError("disk full")
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(statement_import_service, "insert_import_transactions", failing_insert)
+
+        with pytest.raises(RuntimeError):
+            _stream(account, _statement())
+
+        assert not Transaction.objects.filter(account=account).exists()
+
+    def test_missing_columns_reported(self, account):
+        result = _stream(account, _statement("when,what\n2025-06-01,Coffee\n"))
+
+        assert result.errors == ["Missing required columns: date, description, amount"]
+        assert result.imported_count == 0
+
+    def test_bofa_layout_lines_are_sanitized(self, account):
+        statement = _statement(
+            "Description,,Summary Amt.\n"
+            'Beginning balance as of 01/12/2026,,"1,830.69"\n'
+            "\n"
+            "Date,Description,Amount,Running Bal.\n"
+            '01/12/2026,"Zelle payment from A for "ribs, chicken"; Conf# abc","60.67","1,891.36"\n'
+        )
+
+        result = StatementImportService().import_statement_streaming(account, statement, "chase", chunk_rows=2)
+
+        assert result.errors == []
+        assert result.imported_count == 1
+        assert "ribs, chicken" in Transaction.objects.get(account=account).description
+
+    def test_large_uploads_are_streamed_automatically(self, account, settings):
+        settings.STATEMENT_STREAMING_THRESHOLD_BYTES = 10
+        upload = SimpleUploadedFile("statement.csv", STATEMENT.encode(), content_type="text/csv")
+
+        result = StatementImportService().import_statement(account, upload, "generic")
+
+        assert result.rows == []
+        assert result.imported_count == 4
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.utils.cursor_pagination import get_cached_count, is_cursor_mode, paginate_by_cursor
 from apps.financial_account.serializers import (
     FinancialAccountCreateSerializer,
     FinancialAccountSerializer,
@@ -522,20 +523,21 @@ class AccountTransactionsAPIView(APIView):
         page_size = int(request.query_params.get("page_size", 10))
 
         queryset = self.transaction_service.get_user_transactions(user=request.user, account=account)
-        total = queryset.count()
-
-        start = (page - 1) * page_size
-        end = start + page_size
-        transactions = queryset[start:end]
-        running_map: dict[int, Decimal] = {}
-        running_total = Decimal("0")
-        ordered_all = queryset.order_by("date", "created_at", "id").only()
-        for transaction in ordered_all:
-            signed = transaction.amount
-            if transaction.transaction_type == "debit":
-                signed = -signed
-            running_total = (running_total + signed).quantize(Decimal("0.01"))
-            running_map[transaction.id] = running_total
+        pagination = {}
+        if is_cursor_mode(request.query_params):
+            try:
+                cursor_page = paginate_by_cursor(queryset, request.query_params.get("cursor"), page_size)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            transactions = cursor_page.items
+            pagination = {"next_cursor": cursor_page.next_cursor, "has_next": cursor_page.has_next}
+            total = get_cached_count(queryset)
+        else:
+            total = queryset.count()
+            start = (page - 1) * page_size
+            end = start + page_size
+            transactions = list(queryset[start:end])
+        running_map = self.transaction_service.get_running_balances(account, transactions)
 
         columns = [
             {"field": "id", "title": "ID"},
@@ -593,6 +595,7 @@ class AccountTransactionsAPIView(APIView):
                 "page": page,
                 "page_size": page_size,
                 "total": total,
+                **pagination,
             }
         )
 
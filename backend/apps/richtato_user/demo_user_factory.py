@@ -7,6 +7,7 @@ from django.db.models.signals import post_delete, post_save
 from loguru import logger
 
 from apps.budget.models import Budget, BudgetCategory
+from apps.core.services.dashboard_cache import invalidate_dashboards
 from apps.financial_account.models import (
     AccountBalanceHistory,
     FinancialAccount,
@@ -14,7 +15,9 @@ from apps.financial_account.models import (
 )
 from apps.richtato_user.models import User
 from apps.transaction.models import Transaction, TransactionCategory
-from apps.transaction.signals import transaction_post_delete, transaction_post_save
+from apps.transaction.services.flow_class import assign_flow_classes
+from apps.transaction.services.monthly_rollup import rebuild_rollups
+from apps.transaction.signals import transaction_post_delete, transaction_post_save, transaction_rollup_post_delete
 
 
 class DemoUserFactory:
@@ -40,6 +43,8 @@ class DemoUserFactory:
         self._create_expense_transactions()
         self._create_budgets()
         self._set_category_priorities()
+        rebuild_rollups(self.user.id)
+        invalidate_dashboards([self.user.id])
         return self.user
 
     @transaction.atomic
@@ -61,6 +66,8 @@ class DemoUserFactory:
             self._create_expense_transactions()
             self._create_budgets()
             self._set_category_priorities()
+            rebuild_rollups(self.user.id)
+            invalidate_dashboards([self.user.id])
             logger.info(f"Created new demo user: {self.username}")
         else:
             # Set password in case it was changed (ensure consistency)
@@ -80,6 +87,7 @@ class DemoUserFactory:
         # Disconnect signals to avoid expensive balance history recalculations during bulk deletion
         post_save.disconnect(transaction_post_save, sender=Transaction)
         post_delete.disconnect(transaction_post_delete, sender=Transaction)
+        post_delete.disconnect(transaction_rollup_post_delete, sender=Transaction)
 
         try:
             # Delete transactions first (has FK to accounts and categories)
@@ -107,12 +115,15 @@ class DemoUserFactory:
             self._create_expense_transactions()
             self._create_budgets()
             self._set_category_priorities()
+            rebuild_rollups(self.user.id)
+            invalidate_dashboards([self.user.id])
 
             logger.info(f"Reset demo user data for: {self.username}")
         finally:
             # Re-enable signals
             post_save.connect(transaction_post_save, sender=Transaction)
             post_delete.connect(transaction_post_delete, sender=Transaction)
+            post_delete.connect(transaction_rollup_post_delete, sender=Transaction)
 
         return self.user
 
@@ -225,6 +236,7 @@ class DemoUserFactory:
                     ),
                 ]
             )
+        assign_flow_classes(income_entries)
         Transaction.objects.bulk_create(income_entries, ignore_conflicts=True)
 
     def _create_expense_transactions(self):
@@ -455,6 +467,7 @@ class DemoUserFactory:
             current_date += timedelta(days=1)
 
         # Bulk create all expense entries
+        assign_flow_classes(expense_entries)
         Transaction.objects.bulk_create(expense_entries, ignore_conflicts=True)
 
     def _create_budgets(self):
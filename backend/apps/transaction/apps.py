@@ -10,4 +10,5 @@ class TransactionConfig(AppConfig):
 
     def ready(self):
         """Register signals when the app is ready."""
+        import apps.transaction.services.keyword_rule_cache  # noqa: F401
         import apps.transaction.signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""Management command to benchmark keyword matching against a linear scan.
+
+Runs entirely in memory on synthetic keywords and descriptions; no database
+rows are read or written.
+"""
+
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.transaction.models import CategoryKeyword, TransactionCategory
+from apps.transaction.services.keyword_matching import compile_keywords
+
+
+def _linear_match(description, keywords):
+    haystack = (description or "").lower()
+    for keyword_obj in keywords:
+        kw = keyword_obj.keyword.strip().lower()
+        if kw and kw in haystack:
+            return keyword_obj.category
+    return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark compiled keyword matching vs. a per-keyword substring scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keywords", type=int, default=2000, help="Number of synthetic keywords")
+        parser.add_argument("--descriptions", type=int, default=100000, help="Number of synthetic descriptions")
+        parser.add_argument(
+            "--linear-sample",
+            type=int,
+            default=5000,
+            help="Descriptions to time with the linear scan (extrapolated to the full set)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        keyword_count = options["keywords"]
+        description_count = options["descriptions"]
+
+        categories = [TransactionCategory(id=i + 1, name=f"Category {i}") for i in range(50)]
+        words = set()
+        while len(words) < keyword_count:
+            words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+        keywords = [
+            CategoryKeyword(keyword=word, category=categories[i % len(categories)])
+            for i, word in enumerate(sorted(words))
+        ]
+        word_list = sorted(words)
+
+        descriptions = []
+        for _ in range(description_count):
+            parts = ["".join(rng.choices(string.ascii_uppercase + " *#0123456789", k=rng.randint(8, 24)))]
+            if rng.random() < 0.6:
+                parts.append(rng.choice(word_list).upper())
+            rng.shuffle(parts)
+            descriptions.append(" ".join(parts))
+
+        started = time.perf_counter()
+        matcher = compile_keywords(keywords)
+        compile_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        compiled_results = [matcher.match(description) for description in descriptions]
+        compiled_seconds = time.perf_counter() - started
+
+        sample = descriptions[: min(options["linear_sample"], description_count)]
+        started = time.perf_counter()
+        linear_results = [_linear_match(description, keywords) for description in sample]
+        linear_seconds = time.perf_counter() - started
+        linear_extrapolated = linear_seconds * description_count / max(len(sample), 1)
+
+        mismatches = sum(1 for a, b in zip(compiled_results, linear_results, strict=False) if a is not b)
+        matched = sum(1 for result in compiled_results if result is not None)
+
+        self.stdout.write(f"Keywords: {keyword_count}, descriptions: {description_count} ({matched} matched)")
+        self.stdout.write(f"  Compile automaton:    {compile_seconds:.3f}s")
+        self.stdout.write(
+            f"  Compiled matching:    {compiled_seconds:.3f}s "
+            f"({description_count / compiled_seconds:,.0f} descriptions/s)"
+        )
+        self.stdout.write(
+            f"  Linear scan:          {linear_extrapolated:.3f}s "
+            f"(extrapolated from {len(sample)} descriptions in {linear_seconds:.3f}s)"
+        )
+        self.stdout.write(f"  Speedup:              {linear_extrapolated / compiled_seconds:.1f}x")
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"  {mismatches} results differ from the linear scan"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"  Results identical on {len(sample)} sampled descriptions"))
@@ -0,0 +1,13 @@
+"""Management command to process pending deferred balance history recalculations."""
+
+from django.core.management.base import BaseCommand
+
+from apps.transaction.services.balance_recalculation_queue import flush_balance_recalculations
+
+
+class Command(BaseCommand):
+    help = "Recompute balance history for accounts with pending deferred recalculation markers"
+
+    def handle(self, *args, **options):
+        recalculated = flush_balance_recalculations()
+        self.stdout.write(self.style.SUCCESS(f"Recalculated balance history for {recalculated} account(s)"))
@@ -15,12 +15,16 @@ from typing import Any
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction as db_transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from apps.budget.models import Budget, BudgetCategory
+from apps.core.services.dashboard_cache import invalidate_dashboards
 from apps.financial_account.models import AccountBalanceHistory, FinancialAccount, FinancialInstitution
 from apps.richtato_user.models import User
 from apps.transaction.models import CategoryKeyword, Transaction, TransactionCategory
+from apps.transaction.services.flow_class import assign_flow_classes
+from apps.transaction.services.monthly_rollup import rebuild_rollups
 
 
 class Command(BaseCommand):
@@ -318,7 +322,9 @@ class Command(BaseCommand):
                     is_deleted=bool(row.get("is_deleted", False)),
                 )
                 if row.get("expense_priority") is None:
-                    TransactionCategory.objects.filter(pk=category.pk).update(expense_priority=None)
+                    TransactionCategory.objects.filter(pk=category.pk).update(
+                        expense_priority=None, updated_at=timezone.now()
+                    )
                     category.expense_priority = None
                 self._update_model_timestamps(category, created_at=row.get("created_at"))
                 category_map[row["id"]] = category
@@ -392,7 +398,12 @@ class Command(BaseCommand):
             )
             for row in rows
         ]
+        for txn in transactions:
+            txn.assign_source_keys()
+        assign_flow_classes(transactions)
         Transaction.objects.bulk_create(transactions, batch_size=500)
+        rebuild_rollups(user.id)
+        invalidate_dashboards([user.id])
         return len(transactions)
 
     def _import_budgets(self, user: User, rows: list[dict[str, Any]]) -> dict[int, Budget]:
@@ -16,6 +16,7 @@ from django.db.models.signals import post_save
 from django.utils.text import slugify
 
 from apps.budget.models import Budget, BudgetCategory
+from apps.core.services.dashboard_cache import invalidate_dashboards
 from apps.financial_account.models import (
     AccountBalanceHistory,
     FinancialAccount,
@@ -23,6 +24,8 @@ from apps.financial_account.models import (
 )
 from apps.richtato_user.models import User
 from apps.transaction.models import Transaction, TransactionCategory
+from apps.transaction.services.flow_class import assign_flow_classes
+from apps.transaction.services.monthly_rollup import rebuild_rollups
 from apps.transaction.signals import transaction_post_save
 
 
@@ -131,6 +134,9 @@ class Command(BaseCommand):
                 self.stdout.write("Step 5: Importing Transactions")
                 self.stdout.write("=" * 50)
                 self.import_transactions(source_dir, legacy_user_id)
+                if not self.dry_run:
+                    rebuild_rollups(self.new_user.id)
+                    invalidate_dashboards([self.new_user.id])
 
                 # Step 6: Import Account Balance History
                 self.stdout.write("\n" + "=" * 50)
@@ -455,6 +461,9 @@ class Command(BaseCommand):
             # Bulk create income transactions
             if income_transactions:
                 self.stdout.write(f"  Creating {len(income_transactions)} income transactions...")
+                for txn in income_transactions:
+                    txn.assign_source_keys()
+                assign_flow_classes(income_transactions)
                 Transaction.objects.bulk_create(income_transactions, batch_size=500)
             self.stdout.write(self.style.SUCCESS(f"Income transactions imported: {income_count}"))
 
@@ -519,6 +528,9 @@ class Command(BaseCommand):
             # Bulk create expense transactions
             if expense_transactions:
                 self.stdout.write(f"  Creating {len(expense_transactions)} expense transactions...")
+                for txn in expense_transactions:
+                    txn.assign_source_keys()
+                assign_flow_classes(expense_transactions)
                 Transaction.objects.bulk_create(expense_transactions, batch_size=500)
             self.stdout.write(self.style.SUCCESS(f"Expense transactions imported: {expense_count}"))
 
@@ -0,0 +1,64 @@
+"""Management command to rebuild or verify the monthly transaction rollup table."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.richtato_user.models import User
+from apps.transaction.services.monthly_rollup import check_rollup_consistency, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild TransactionMonthlyRollup from transactions, or check it for drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Only rebuild/check this user",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare rollups with transactions and report mismatches without writing",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="With --check, rebuild users whose rollups are inconsistent",
+        )
+
+    def handle(self, *args, **options):
+        user_id = options.get("user_id")
+        if user_id and not User.objects.filter(id=user_id).exists():
+            raise CommandError(f"User with ID {user_id} not found")
+
+        if not options["check"]:
+            rows = rebuild_rollups(user_id)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows"))
+            return
+
+        mismatches = check_rollup_consistency(user_id)
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Rollups are consistent with transactions"))
+            return
+
+        for mismatch in mismatches[:50]:
+            user, account, category, month, transaction_type, flow_class = mismatch.key
+            self.stdout.write(
+                self.style.WARNING(
+                    f"user={user} account={account} category={category} month={month:%Y-%m} "
+                    f"type={transaction_type} flow={flow_class}: "
+                    f"expected {mismatch.expected_amount} ({mismatch.expected_count}), "
+                    f"found {mismatch.actual_amount} ({mismatch.actual_count})"
+                )
+            )
+        if len(mismatches) > 50:
+            self.stdout.write(f"... and {len(mismatches) - 50} more")
+
+        affected_users = sorted({mismatch.key[0] for mismatch in mismatches})
+        if options["fix"]:
+            for affected_user in affected_users:
+                rebuild_rollups(affected_user)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {len(affected_users)} user(s)"))
+            return
+
+        raise CommandError(f"{len(mismatches)} inconsistent rollup rows across {len(affected_users)} user(s)")
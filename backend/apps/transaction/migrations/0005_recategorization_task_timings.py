@@ -0,0 +1,26 @@
+"""Record queue-wait and run time on RecategorizationTask."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0004_remove_plaid"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recategorizationtask",
+            name="queue_wait_seconds",
+            field=models.FloatField(
+                blank=True,
+                help_text="Time spent queued before a worker picked the task up",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="recategorizationtask",
+            name="run_seconds",
+            field=models.FloatField(blank=True, help_text="Time spent processing the task", null=True),
+        ),
+    ]
@@ -0,0 +1,100 @@
+"""Add the monthly transaction rollup table and populate it from existing transactions."""
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_rollups(apps, schema_editor):
+    Transaction = apps.get_model("transaction", "Transaction")
+    TransactionMonthlyRollup = apps.get_model("transaction", "TransactionMonthlyRollup")
+
+    rows = (
+        Transaction.objects.annotate(month=TruncMonth("date"))
+        .values("user_id", "account_id", "category_id", "month", "transaction_type")
+        .annotate(total=Sum("amount"), rows=Count("id"))
+        .order_by()
+    )
+    TransactionMonthlyRollup.objects.bulk_create(
+        (
+            TransactionMonthlyRollup(
+                user_id=row["user_id"],
+                account_id=row["account_id"],
+                category_id=row["category_id"],
+                month=row["month"],
+                transaction_type=row["transaction_type"],
+                amount=row["total"] or 0,
+                transaction_count=row["rows"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("financial_account", "0027_drop_legacy_bank_sync_tables"),
+        ("transaction", "0005_recategorization_task_timings"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransactionMonthlyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField(help_text="First day of the month")),
+                (
+                    "transaction_type",
+                    models.CharField(choices=[("debit", "Debit"), ("credit", "Credit")], max_length=10),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of transaction amounts",
+                        max_digits=17,
+                    ),
+                ),
+                ("transaction_count", models.IntegerField(default=0)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transaction_rollups",
+                        to="financial_account.financialaccount",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="transaction_rollups",
+                        to="transaction.transactioncategory",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transaction_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "transaction_monthly_rollup",
+                "indexes": [
+                    models.Index(fields=["user", "month"], name="transaction_user_id_150869_idx"),
+                    models.Index(fields=["account", "month"], name="transaction_account_a1e340_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+"""Add the denormalized flow_class column to transactions and rollups, backfilled in batches."""
+
+from django.db import migrations, models
+from django.db.models import Max, Q
+
+BACKFILL_BATCH_SIZE = 5000
+
+FLOW_CLASS_CHOICES = [
+    ("income", "Income"),
+    ("expense", "Expense"),
+    ("investment", "Investment"),
+    ("transfer", "Transfer"),
+    ("cc_payment", "Credit Card Payment"),
+    ("other", "Other"),
+]
+
+
+def _flow_class_conditions():
+    cc_payment = Q(category__slug="credit-card-payment")
+    return {
+        "cc_payment": cc_payment,
+        "income": (Q(category__type="income") & ~cc_payment) | Q(category__isnull=True, transaction_type="credit"),
+        "expense": (Q(category__type="expense") & ~cc_payment) | Q(category__isnull=True, transaction_type="debit"),
+        "investment": Q(category__type="investment") & ~cc_payment,
+        "transfer": Q(category__type="transfer") & ~cc_payment,
+    }
+
+
+def _backfill(queryset):
+    """Classify rows one primary-key window at a time so each UPDATE stays short."""
+    last_id = queryset.aggregate(last=Max("id"))["last"] or 0
+    for window_start in range(0, last_id + 1, BACKFILL_BATCH_SIZE):
+        window = queryset.filter(id__gte=window_start, id__lt=window_start + BACKFILL_BATCH_SIZE)
+        for flow_class, condition in _flow_class_conditions().items():
+            window.filter(condition).update(flow_class=flow_class)
+
+
+def populate_flow_class(apps, schema_editor):
+    _backfill(apps.get_model("transaction", "Transaction").objects.all())
+    _backfill(apps.get_model("transaction", "TransactionMonthlyRollup").objects.all())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0006_transaction_monthly_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="flow_class",
+            field=models.CharField(
+                choices=FLOW_CLASS_CHOICES,
+                default="other",
+                editable=False,
+                help_text="Denormalized cash-flow class derived from category and transaction type",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="transactionmonthlyrollup",
+            name="flow_class",
+            field=models.CharField(choices=FLOW_CLASS_CHOICES, default="other", max_length=20),
+        ),
+        migrations.RunPython(populate_flow_class, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "flow_class", "date"], name="transaction_user_id_793cdb_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transactionmonthlyrollup",
+            index=models.Index(fields=["user", "flow_class", "month"], name="transaction_user_id_c40344_idx"),
+        ),
+    ]
@@ -0,0 +1,87 @@
+"""Add indexed statement dedup columns to transactions, backfilled from raw_data in batches."""
+
+import hashlib
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Max
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _normalize_description(description):
+    return " ".join(str(description).split())
+
+
+def _legacy_row_hash(transaction):
+    """Row hash of a CSV row imported before raw_data recorded it (no activity/symbol/quantity)."""
+    base = ":".join(
+        [
+            str(transaction.account_id),
+            transaction.date.isoformat(),
+            str(abs(Decimal(str(transaction.amount))).quantize(Decimal("0.01"))),
+            _normalize_description(transaction.description),
+            "",
+            "",
+            "",
+        ]
+    )
+    return hashlib.sha256(base.encode()).hexdigest()
+
+
+def populate_source_keys(apps, schema_editor):
+    Transaction = apps.get_model("transaction", "Transaction")
+    imported = Transaction.objects.filter(sync_source="csv")
+    last_id = imported.aggregate(last=Max("id"))["last"] or 0
+    for window_start in range(0, last_id + 1, BACKFILL_BATCH_SIZE):
+        window = list(
+            imported.filter(id__gte=window_start, id__lt=window_start + BACKFILL_BATCH_SIZE).only(
+                "id", "account_id", "date", "amount", "description", "raw_data"
+            )
+        )
+        for transaction in window:
+            raw_data = transaction.raw_data or {}
+            transaction.source_row_hash = raw_data.get("source_row_hash") or _legacy_row_hash(transaction)
+            signature = f"{transaction.date}:{_normalize_description(transaction.description)}"
+            transaction.source_change_signature = hashlib.sha256(signature.encode()).hexdigest()
+        Transaction.objects.bulk_update(window, ["source_row_hash", "source_change_signature"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0007_transaction_flow_class"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="source_row_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Statement row hash used to skip re-imported rows",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="source_change_signature",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Hash of date and description used to flag re-imported rows whose amount changed",
+                max_length=64,
+            ),
+        ),
+        migrations.RunPython(populate_source_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["account", "source_row_hash"], name="transaction_account_56cc1e_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["account", "source_change_signature"], name="transaction_account_850c07_idx"),
+        ),
+    ]
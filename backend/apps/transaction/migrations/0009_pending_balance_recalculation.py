@@ -0,0 +1,41 @@
+"""Add durable dirty markers for deferred balance history recalculation."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("financial_account", "0027_drop_legacy_bank_sync_tables"),
+        ("transaction", "0008_transaction_source_row_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingBalanceRecalculation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("from_date", models.DateField(help_text="Earliest date whose balance may have changed")),
+                (
+                    "orphan_dates",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="ISO dates whose history row goes away if no transactions remain on them",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "account",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_balance_recalculation",
+                        to="financial_account.financialaccount",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "pending_balance_recalculation",
+            },
+        ),
+    ]
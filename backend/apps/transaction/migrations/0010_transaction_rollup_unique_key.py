@@ -0,0 +1,68 @@
+"""Enforce one rollup row per key, first rebuilding any (account, month) slice that already has duplicates."""
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+ROLLUP_KEY_FIELDS = ("account_id", "category_id", "month", "transaction_type", "flow_class")
+
+
+def rebuild_duplicated_slices(apps, schema_editor):
+    Transaction = apps.get_model("transaction", "Transaction")
+    TransactionMonthlyRollup = apps.get_model("transaction", "TransactionMonthlyRollup")
+
+    duplicated = {
+        (row["account_id"], row["month"])
+        for row in TransactionMonthlyRollup.objects.values(*ROLLUP_KEY_FIELDS)
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .order_by()
+    }
+    for account_id, month in duplicated:
+        TransactionMonthlyRollup.objects.filter(account_id=account_id, month=month).delete()
+        rows = (
+            Transaction.objects.filter(account_id=account_id, date__year=month.year, date__month=month.month)
+            .annotate(month=TruncMonth("date"))
+            .values("user_id", *ROLLUP_KEY_FIELDS)
+            .annotate(total=Sum("amount"), rows=Count("id"))
+            .order_by()
+        )
+        TransactionMonthlyRollup.objects.bulk_create(
+            TransactionMonthlyRollup(
+                user_id=row["user_id"],
+                account_id=row["account_id"],
+                category_id=row["category_id"],
+                month=row["month"],
+                transaction_type=row["transaction_type"],
+                flow_class=row["flow_class"],
+                amount=row["total"] or 0,
+                transaction_count=row["rows"],
+            )
+            for row in rows
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0009_pending_balance_recalculation"),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_duplicated_slices, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="transactionmonthlyrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("category__isnull", False)),
+                fields=("account", "category", "month", "transaction_type", "flow_class"),
+                name="transaction_rollup_unique_key",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="transactionmonthlyrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("category__isnull", True)),
+                fields=("account", "month", "transaction_type", "flow_class"),
+                name="transaction_rollup_unique_uncategorized",
+            ),
+        ),
+    ]
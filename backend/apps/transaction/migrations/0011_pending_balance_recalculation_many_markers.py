@@ -0,0 +1,23 @@
+"""Allow several dirty markers per account so recording one never waits on a running recompute."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("financial_account", "0027_drop_legacy_bank_sync_tables"),
+        ("transaction", "0010_transaction_rollup_unique_key"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pendingbalancerecalculation",
+            name="account",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="pending_balance_recalculations",
+                to="financial_account.financialaccount",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+"""Stamp keyword and category edits so per-process keyword rule caches can detect them."""
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0011_pending_balance_recalculation_many_markers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="categorykeyword",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="transactioncategory",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
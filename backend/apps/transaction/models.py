@@ -1,10 +1,13 @@
 """Transaction models."""
 
+import hashlib
 from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
 
+from apps.core.constants import FLOW_CLASS_CHOICES, flow_class_for
+
 
 class TransactionCategory(models.Model):
     """Hierarchical transaction categories."""
@@ -56,6 +59,7 @@ class TransactionCategory(models.Model):
         help_text="Soft delete - hidden from UI but preserves transaction assignments",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "transaction_category"
@@ -128,6 +132,7 @@ class CategoryKeyword(models.Model):
     )
     keyword = models.CharField(max_length=200, help_text="Case-insensitive keyword for matching")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     match_count = models.IntegerField(default=0, help_text="Number of times this keyword has matched")
 
@@ -150,7 +155,14 @@ class CategoryKeyword(models.Model):
 
 
 class Transaction(models.Model):
-    """Universal transaction model for all account types."""
+    """Universal transaction model for all account types.
+
+    Balance-affecting fields are snapshotted when an instance is loaded
+    (``from_db``) and after each save, so balance signals and bulk paths can
+    compute deltas without re-fetching the row.
+    """
+
+    BALANCE_TRACKED_FIELDS = ("account_id", "date", "amount", "transaction_type")
 
     TRANSACTION_TYPE_CHOICES = [
         ("debit", "Debit"),
@@ -199,6 +211,13 @@ class Transaction(models.Model):
         blank=True,
         related_name="transactions",
     )
+    flow_class = models.CharField(
+        max_length=20,
+        choices=FLOW_CLASS_CHOICES,
+        default="other",
+        editable=False,
+        help_text="Denormalized cash-flow class derived from category and transaction type",
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="posted")
     is_recurring = models.BooleanField(default=False)
     sync_source = models.CharField(max_length=20, choices=SYNC_SOURCE_CHOICES, default="manual")
@@ -208,6 +227,20 @@ class Transaction(models.Model):
         help_text="External ID from sync source",
     )
     raw_data = models.JSONField(null=True, blank=True, help_text="Raw transaction data from external source")
+    source_row_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Statement row hash used to skip re-imported rows",
+    )
+    source_change_signature = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Hash of date and description used to flag re-imported rows whose amount changed",
+    )
     categorization_status = models.CharField(
         max_length=20,
         choices=CATEGORIZATION_STATUS_CHOICES,
@@ -226,8 +259,11 @@ class Transaction(models.Model):
         indexes = [
             models.Index(fields=["user", "-date"]),
             models.Index(fields=["account", "-date"]),
+            models.Index(fields=["user", "flow_class", "date"]),
             models.Index(fields=["category"]),
             models.Index(fields=["external_id"]),
+            models.Index(fields=["account", "source_row_hash"]),
+            models.Index(fields=["account", "source_change_signature"]),
             models.Index(fields=["sync_source"]),
             models.Index(fields=["categorization_status"]),
         ]
@@ -235,6 +271,51 @@ class Transaction(models.Model):
     def __str__(self):
         return f"{self.date} - {self.description} ({self.amount})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Snapshot balance-affecting fields as loaded from the database."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values, strict=True))
+        instance._original_values = {
+            name: loaded[name]
+            for name in cls.BALANCE_TRACKED_FIELDS
+            if name in loaded and loaded[name] is not models.DEFERRED
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self.reset_original_values(fields)
+
+    def reset_original_values(self, fields=None) -> None:
+        """Record current values as the persisted originals (all, or just fields)."""
+        snapshot = getattr(self, "_original_values", None) or {}
+        for name in self.BALANCE_TRACKED_FIELDS:
+            if fields is None or name in fields or name.removesuffix("_id") in fields:
+                snapshot[name] = getattr(self, name)
+        self._original_values = snapshot
+
+    def get_original_values(self) -> dict | None:
+        """
+        Return persisted values of the balance-tracked fields.
+
+        Returns None when the instance has no complete snapshot (never saved,
+        or loaded with some tracked fields deferred).
+        """
+        original = getattr(self, "_original_values", None)
+        if self.pk is None or not original or len(original) != len(self.BALANCE_TRACKED_FIELDS):
+            return None
+        return original
+
+    @property
+    def original_signed_amount(self) -> Decimal | None:
+        """Signed amount as last persisted, or None when not tracked."""
+        original = self.get_original_values()
+        if original is None:
+            return None
+        amt = Decimal(str(original["amount"]))
+        return -amt if original["transaction_type"] == "debit" else amt
+
     @property
     def signed_amount(self):
         """Get amount with sign based on transaction type."""
@@ -249,7 +330,67 @@ class Transaction(models.Model):
             self.category = TransactionCategory.get_uncategorized_for_user(self.user)
             if not self.categorization_status or self.categorization_status == "pending_ai":
                 self.categorization_status = "uncategorized"
+        self.flow_class = self.resolve_flow_class()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"category", "category_id", "transaction_type"} & set(update_fields):
+            kwargs["update_fields"] = [*kwargs["update_fields"], "flow_class"]
+        self.assign_source_keys()
+        if update_fields is not None and {"date", "description"} & set(update_fields):
+            kwargs["update_fields"] = [*kwargs["update_fields"], "source_change_signature"]
         super().save(*args, **kwargs)
+        self.reset_original_values(kwargs.get("update_fields"))
+
+    def resolve_flow_class(self) -> str:
+        """Compute flow_class from the current category and transaction type."""
+        category = self.category if self.category_id else None
+        return flow_class_for(
+            category.type if category else None,
+            category.slug if category else None,
+            self.transaction_type,
+        )
+
+    @staticmethod
+    def row_hash_base(
+        account_id: int,
+        posted_date,
+        amount,
+        description: str,
+        activity_type: str = "",
+        symbol: str = "",
+        quantity: str = "",
+    ) -> str:
+        """Canonical statement-row identity that ``source_row_hash`` is the SHA-256 of."""
+        return ":".join(
+            [
+                str(account_id),
+                str(posted_date),
+                str(abs(Decimal(str(amount))).quantize(Decimal("0.01"))),
+                " ".join(str(description).split()),
+                activity_type.strip().lower(),
+                symbol.strip().upper(),
+                quantity.strip(),
+            ]
+        )
+
+    @staticmethod
+    def change_signature_for(posted_date, description: str) -> str:
+        """Hash of the date and whitespace-normalized description of a statement row."""
+        return hashlib.sha256(f"{posted_date}:{' '.join(str(description).split())}".encode()).hexdigest()
+
+    def assign_source_keys(self) -> None:
+        """
+        Fill the statement dedup columns of a CSV-sourced row.
+
+        The row hash comes from raw_data when the statement importer recorded
+        it, otherwise from the row's own account, date, amount and description.
+        """
+        if self.sync_source != "csv":
+            return
+        if not self.source_row_hash:
+            recorded = (self.raw_data or {}).get("source_row_hash")
+            base = self.row_hash_base(self.account_id, self.date, self.amount, self.description)
+            self.source_row_hash = recorded or hashlib.sha256(base.encode()).hexdigest()
+        self.source_change_signature = self.change_signature_for(self.date, self.description)
 
     @property
     def category_name(self):
@@ -284,6 +425,10 @@ class RecategorizationTask(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     keep_existing_for_unmatched = models.BooleanField(default=True)
+    queue_wait_seconds = models.FloatField(
+        null=True, blank=True, help_text="Time spent queued before a worker picked the task up"
+    )
+    run_seconds = models.FloatField(null=True, blank=True, help_text="Time spent processing the task")
 
     class Meta:
         db_table = "recategorization_task"
@@ -295,3 +440,94 @@ class RecategorizationTask(models.Model):
 
     def __str__(self):
         return f"Task {self.id} - {self.user.username} - {self.status}"
+
+
+class TransactionMonthlyRollup(models.Model):
+    """Per-month transaction totals maintained alongside Transaction.
+
+    One row per (account, category, month, transaction_type) with the summed
+    amount and row count. Field names mirror Transaction (``user``,
+    ``account``, ``category``, ``transaction_type``, ``flow_class``,
+    ``amount``) so the shared
+    Q filters in ``apps.core.constants`` apply to either model. Rows are
+    rebuilt per (account, month) slice by
+    ``apps.transaction.services.monthly_rollup``; never edit them directly.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="transaction_rollups",
+    )
+    account = models.ForeignKey(
+        "financial_account.FinancialAccount",
+        on_delete=models.CASCADE,
+        related_name="transaction_rollups",
+    )
+    category = models.ForeignKey(
+        TransactionCategory,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transaction_rollups",
+    )
+    month = models.DateField(help_text="First day of the month")
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPE_CHOICES)
+    flow_class = models.CharField(max_length=20, choices=FLOW_CLASS_CHOICES, default="other")
+    amount = models.DecimalField(max_digits=17, decimal_places=2, default=0, help_text="Sum of transaction amounts")
+    transaction_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "transaction_monthly_rollup"
+        indexes = [
+            models.Index(fields=["user", "month"]),
+            models.Index(fields=["user", "flow_class", "month"]),
+            models.Index(fields=["account", "month"]),
+        ]
+        # One row per rollup key; NULL categories need their own constraint since NULLs never collide.
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "category", "month", "transaction_type", "flow_class"],
+                condition=models.Q(category__isnull=False),
+                name="transaction_rollup_unique_key",
+            ),
+            models.UniqueConstraint(
+                fields=["account", "month", "transaction_type", "flow_class"],
+                condition=models.Q(category__isnull=True),
+                name="transaction_rollup_unique_uncategorized",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.month:%Y-%m} {self.transaction_type}: {self.amount} ({self.transaction_count})"
+
+
+class PendingBalanceRecalculation(models.Model):
+    """Durable dirty marker for deferred balance history recalculation.
+
+    Each row says an account's history must be recomputed from ``from_date``.
+    Edits normally fold into one row per account, but an edit that finds the
+    row locked by a running recompute files another rather than waiting; the
+    next recompute merges them. ``apps.transaction.services.balance_recalculation_queue``
+    writes and drains these rows, so markers survive worker restarts and can
+    be processed by any process.
+    """
+
+    account = models.ForeignKey(
+        "financial_account.FinancialAccount",
+        on_delete=models.CASCADE,
+        related_name="pending_balance_recalculations",
+    )
+    from_date = models.DateField(help_text="Earliest date whose balance may have changed")
+    orphan_dates = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="ISO dates whose history row goes away if no transactions remain on them",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "pending_balance_recalculation"
+
+    def __str__(self):
+        return f"{self.account_id} from {self.from_date}"
@@ -3,7 +3,7 @@
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Q, QuerySet
+from django.db.models import Case, DecimalField, F, Q, QuerySet, Sum, When, Window
 
 from apps.financial_account.models import FinancialAccount
 from apps.richtato_user.models import User
@@ -92,6 +92,60 @@ class TransactionRepository:
 
         return list(queryset.all())
 
+    def get_running_balances(self, account: FinancialAccount, transactions: list[Transaction]) -> dict[int, Decimal]:
+        """
+        Compute the account running balance for each given transaction.
+
+        The running balance is the cumulative signed amount in (date,
+        created_at, id) order. Only rows between the earliest and latest of
+        the given transactions are windowed; everything before them is folded
+        into a single aggregate, so cost depends on the page, not the account.
+        """
+        keys = [(txn.date, txn.created_at, txn.id) for txn in transactions if txn.account_id == account.id]
+        if not keys:
+            return {}
+        first, last = min(keys), max(keys)
+
+        signed_amount = Case(
+            When(transaction_type="debit", then=-F("amount")),
+            default=F("amount"),
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        )
+        account_qs = Transaction.objects.filter(user_id=account.user_id, account=account).order_by()
+        before_first = self._ordering_key_before(first)
+
+        opening = account_qs.filter(before_first).aggregate(total=Sum(signed_amount))["total"] or Decimal("0")
+        rows = (
+            account_qs.exclude(before_first)
+            .exclude(self._ordering_key_after(last))
+            .annotate(
+                running=Window(
+                    expression=Sum(signed_amount),
+                    order_by=[F("date").asc(), F("created_at").asc(), F("id").asc()],
+                )
+            )
+            .values_list("id", "running")
+        )
+        return {txn_id: (opening + (running or Decimal("0"))).quantize(Decimal("0.01")) for txn_id, running in rows}
+
+    @staticmethod
+    def _ordering_key_before(key) -> Q:
+        txn_date, created_at, txn_id = key
+        return (
+            Q(date__lt=txn_date)
+            | Q(date=txn_date, created_at__lt=created_at)
+            | Q(date=txn_date, created_at=created_at, id__lt=txn_id)
+        )
+
+    @staticmethod
+    def _ordering_key_after(key) -> Q:
+        txn_date, created_at, txn_id = key
+        return (
+            Q(date__gt=txn_date)
+            | Q(date=txn_date, created_at__gt=created_at)
+            | Q(date=txn_date, created_at=created_at, id__gt=txn_id)
+        )
+
     def get_by_external_id(self, user: User, external_id: str, sync_source: str) -> Transaction | None:
         """Get transaction by external ID and sync source."""
         try:
@@ -0,0 +1,236 @@
+"""Deferred, coalesced balance history recalculation.
+
+When ``settings.DEFER_BALANCE_RECALCULATION`` is enabled, transaction signals
+still adjust the ``FinancialAccount.balance`` anchor synchronously but only
+record a dirty ``(account_id, from_date)`` marker for history. A background
+thread drains the markers, coalescing them per account so that any number of
+edits results in a single recompute from the earliest dirty date.
+
+Markers are ``PendingBalanceRecalculation`` rows written in the same commit
+as the edit, so a worker process that exits or is recycled before draining
+them loses nothing: the next worker in any process picks them up, and
+``manage.py flush_balance_recalculations`` processes them at startup. A marker
+is deleted only in the transaction that rewrote the account's history.
+
+Recording a marker never waits on a lock: an edit folds into an existing
+marker only if it can lock it with ``skip_locked``, and otherwise inserts a
+second marker for the account. A recompute merges every unlocked marker for
+the account, so the extra rows cost nothing but a slightly larger drain.
+
+Tests (and callers that need history immediately) can call
+``flush_balance_recalculations()`` to process pending markers in the current
+thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from loguru import logger
+
+DEFAULT_INTERVAL_SECONDS = 2.0
+
+
+def is_deferred_balance_recalculation_enabled() -> bool:
+    """True when transaction signals should queue history recalculation."""
+    return getattr(settings, "DEFER_BALANCE_RECALCULATION", False)
+
+
+def should_run_balance_recalculation_worker() -> bool:
+    """The worker thread is unsafe in pytest's transactional DB setup; tests flush explicitly."""
+    return getattr(settings, "RUN_BALANCE_RECALC_WORKER", True)
+
+
+@dataclass
+class DirtyAccount:
+    """Pending recalculation state for one account."""
+
+    from_date: date
+    orphan_dates: set[date] = field(default_factory=set)
+
+
+class BalanceRecalculationQueue:
+    """Database-backed queue of dirty account markers with a per-process worker thread."""
+
+    def __init__(self, interval_seconds: float | None = None):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending_count(self) -> int:
+        from apps.transaction.models import PendingBalanceRecalculation
+
+        return PendingBalanceRecalculation.objects.values("account_id").distinct().count()
+
+    def mark_dirty(self, account_id: int, from_date: date, orphan_date: date | None = None) -> None:
+        """
+        Record that account history must be recalculated from from_date.
+
+        Args:
+            account_id: The account whose history is stale
+            from_date: Earliest date whose balance may have changed
+            orphan_date: Date whose history row should be removed if no
+                transactions remain on it (after a delete or re-date)
+        """
+        from apps.transaction.models import PendingBalanceRecalculation
+
+        orphan_dates = [orphan_date.isoformat()] if orphan_date is not None else []
+        with transaction.atomic():
+            # A marker locked by a running recompute is skipped, not waited on;
+            # the new marker is merged by the next recompute.
+            marker = (
+                PendingBalanceRecalculation.objects.select_for_update(skip_locked=True)
+                .filter(account_id=account_id)
+                .order_by("id")
+                .first()
+            )
+            if marker is None:
+                PendingBalanceRecalculation.objects.create(
+                    account_id=account_id, from_date=from_date, orphan_dates=orphan_dates
+                )
+                return
+            update_fields = []
+            if from_date < marker.from_date:
+                marker.from_date = from_date
+                update_fields.append("from_date")
+            if orphan_dates and orphan_dates[0] not in marker.orphan_dates:
+                marker.orphan_dates = [*marker.orphan_dates, *orphan_dates]
+                update_fields.append("orphan_dates")
+            if update_fields:
+                marker.save(update_fields=[*update_fields, "updated_at"])
+
+    def enqueue(self, account_id: int, from_date: date, orphan_date: date | None = None) -> None:
+        """Mark the account dirty with the surrounding DB transaction; wake the worker once it commits."""
+        self.mark_dirty(account_id, from_date, orphan_date)
+        if should_run_balance_recalculation_worker():
+            transaction.on_commit(self._wake_worker)
+
+    def _wake_worker(self) -> None:
+        self._ensure_worker()
+        self._wake.set()
+
+    def drain(self) -> dict[int, DirtyAccount]:
+        """Take and delete all pending markers without recalculating."""
+        from apps.transaction.models import PendingBalanceRecalculation
+
+        with transaction.atomic():
+            markers = list(PendingBalanceRecalculation.objects.select_for_update())
+            PendingBalanceRecalculation.objects.filter(pk__in=[marker.pk for marker in markers]).delete()
+        return _merge_markers(markers)
+
+    def flush(self) -> int:
+        """Process all pending markers in the calling thread. Returns accounts recalculated."""
+        from apps.transaction.models import PendingBalanceRecalculation
+
+        recalculated = 0
+        account_ids = list(
+            PendingBalanceRecalculation.objects.order_by("account_id").values_list("account_id", flat=True).distinct()
+        )
+        for account_id in account_ids:
+            try:
+                if self._recalculate(account_id):
+                    recalculated += 1
+            except Exception as e:
+                # The marker stays in place, so the recompute is retried on the next flush.
+                logger.error(f"Deferred balance recalculation failed for account {account_id}: {e}")
+        return recalculated
+
+    def _recalculate(self, account_id: int) -> bool:
+        from apps.core.services.dashboard_cache import invalidate_dashboards
+        from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
+        from apps.transaction.models import PendingBalanceRecalculation, Transaction
+        from apps.transaction.signals import update_balances_from_date
+
+        with transaction.atomic():
+            # Locked markers belong to a concurrent flush or an uncommitted edit;
+            # they are left for the next pass.
+            markers = list(
+                PendingBalanceRecalculation.objects.select_for_update(skip_locked=True).filter(account_id=account_id)
+            )
+            if not markers:
+                return False
+            entry = _merge_markers(markers)[account_id]
+            PendingBalanceRecalculation.objects.filter(pk__in=[marker.pk for marker in markers]).delete()
+
+            account = FinancialAccount.objects.filter(pk=account_id).first()
+            if account is None:
+                return False
+
+            update_balances_from_date(account, entry.from_date)
+
+            if entry.orphan_dates:
+                remaining_dates = set(
+                    Transaction.objects.filter(account=account, date__in=entry.orphan_dates).values_list(
+                        "date", flat=True
+                    )
+                )
+                orphaned = entry.orphan_dates - remaining_dates
+                if orphaned:
+                    AccountBalanceHistory.objects.filter(account=account, date__in=orphaned).delete()
+
+            # The write's own invalidation ran before history was rewritten.
+            invalidate_dashboards([account.user_id])
+
+        logger.debug(f"Deferred balance recalculation for account {account_id} from {entry.from_date}")
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="balance-recalculation", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        interval = self.interval_seconds
+        if interval is None:
+            interval = getattr(settings, "BALANCE_RECALC_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS)
+        while not self._stopping.is_set():
+            # Wait for the first marker, then linger so a burst of edits coalesces.
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping.wait(interval):
+                break
+            try:
+                close_old_connections()  # Ensure DB connection is usable in this thread
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error during deferred balance recalculation: {e}")
+            finally:
+                close_old_connections()
+
+    def stop(self) -> None:
+        """Stop the worker thread (for testing/shutdown). Pending markers are kept."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+
+
+def _merge_markers(markers) -> dict[int, DirtyAccount]:
+    """Coalesce markers per account: earliest from_date, union of orphan dates."""
+    dirty: dict[int, DirtyAccount] = {}
+    for marker in markers:
+        entry = dirty.setdefault(marker.account_id, DirtyAccount(from_date=marker.from_date))
+        entry.from_date = min(entry.from_date, marker.from_date)
+        entry.orphan_dates.update(date.fromisoformat(value) for value in marker.orphan_dates)
+    return dirty
+
+
+balance_recalculation_queue = BalanceRecalculationQueue()
+
+
+def flush_balance_recalculations() -> int:
+    """Synchronously process pending balance recalculations."""
+    return balance_recalculation_queue.flush()
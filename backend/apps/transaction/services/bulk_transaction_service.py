@@ -1,16 +1,21 @@
-"""Bulk transaction persistence helpers for statement import."""
+"""Bulk transaction persistence helpers for statement import and batch edits."""
 
 from __future__ import annotations
 
 from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
 from decimal import Decimal
 
 from django.db import transaction
 from django.db.models import F
 from django.db.models.signals import post_save
 
-from apps.financial_account.models import FinancialAccount
+from apps.core.services.dashboard_cache import invalidate_dashboards
+from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
 from apps.transaction.models import Transaction, TransactionCategory
+from apps.transaction.services.flow_class import FLOW_CLASS_SOURCE_FIELDS, assign_flow_classes, with_flow_class
+from apps.transaction.services.monthly_rollup import Slice, refresh_slices, slices_for
 from apps.transaction.signals import transaction_post_save, update_balances_from_date
 
 
@@ -32,26 +37,69 @@ def bulk_create_import_transactions(
     if not transactions:
         return 0
 
+    with transaction.atomic():
+        insert_import_transactions(account, transactions)
+        apply_import_side_effects(
+            account,
+            min(txn.date for txn in transactions),
+            slices_for(transactions, include_original=False),
+        )
+    return len(transactions)
+
+
+def insert_import_transactions(
+    account: FinancialAccount,
+    transactions: list[Transaction],
+) -> int:
+    """
+    Insert imported transactions and move the account balance anchor.
+
+    Balance history, rollups and dashboards are left to
+    ``apply_import_side_effects``, so a statement inserted in several batches
+    pays for them once.
+    """
+    if not transactions:
+        return 0
+
     uncategorized = TransactionCategory.get_uncategorized_for_user(account.user)
     for txn in transactions:
         if txn.category_id is None:
             txn.category = uncategorized
         txn.categorization_status = "uncategorized"
+        txn.assign_source_keys()
+    assign_flow_classes(transactions)
 
     net_signed = sum((txn.signed_amount for txn in transactions), Decimal("0"))
-    min_date = min(txn.date for txn in transactions)
 
     with suppress_transaction_balance_signals():
         with transaction.atomic():
             Transaction.objects.bulk_create(transactions, batch_size=500)
             if net_signed:
                 FinancialAccount.objects.filter(pk=account.pk).update(balance=F("balance") + net_signed)
-
-    account.refresh_from_db(fields=["balance"])
-    update_balances_from_date(account, min_date)
     return len(transactions)
 
 
+def apply_import_side_effects(
+    account: FinancialAccount,
+    from_date: date,
+    rollup_slices: set[Slice],
+) -> None:
+    """
+    Recompute balance history and rollups after imported rows were inserted.
+
+    Call inside the atomic block that inserted the rows, so a failed refresh
+    rolls the insert back with it.
+
+    Args:
+        account: The account the rows were imported into
+        from_date: Earliest imported transaction date
+        rollup_slices: (account, month) slices touched by the imported rows
+    """
+    refresh_slices(rollup_slices)
+    update_balances_from_date(account, from_date)
+    invalidate_dashboards([account.user_id])
+
+
 def bulk_create_restore_transactions(
     account: FinancialAccount,
     transactions: list[Transaction],
@@ -68,10 +116,122 @@ def bulk_create_restore_transactions(
             txn.category = uncategorized
             if not txn.categorization_status:
                 txn.categorization_status = "uncategorized"
+        txn.assign_source_keys()
+    assign_flow_classes(transactions)
 
     with suppress_transaction_balance_signals():
         with transaction.atomic():
             Transaction.objects.bulk_create(transactions, batch_size=500)
+            refresh_slices(slices_for(transactions, include_original=False))
 
     update_balances_from_date(account, min_date)
+    invalidate_dashboards([account.user_id])
     return len(transactions)
+
+
+@dataclass
+class AccountBalanceDelta:
+    """Pending balance effect of edited transactions on one account."""
+
+    net_change: Decimal = Decimal("0")
+    from_date: date | None = None
+    vacated_dates: set[date] = field(default_factory=set)
+
+    def touch(self, affected_date: date) -> None:
+        if self.from_date is None or affected_date < self.from_date:
+            self.from_date = affected_date
+
+
+def _signed(amount, transaction_type: str) -> Decimal:
+    amt = Decimal(str(amount))
+    return -amt if transaction_type == "debit" else amt
+
+
+def compute_balance_deltas(
+    transactions: list[Transaction],
+    fields: list[str] | None = None,
+) -> dict[int, AccountBalanceDelta]:
+    """
+    Compute per-account balance deltas for in-memory edits of loaded transactions.
+
+    Uses the original values tracked on each instance, so no rows are
+    re-fetched. Only changes to ``fields`` are considered when given, matching
+    what ``bulk_update`` would persist.
+
+    Raises:
+        ValueError: If a transaction has no tracked original values
+    """
+    deltas: dict[int, AccountBalanceDelta] = {}
+    for txn in transactions:
+        original = txn.get_original_values()
+        if original is None:
+            raise ValueError(f"Transaction {txn.pk} has no tracked original values; load it from the database first")
+
+        current = {
+            name: getattr(txn, name)
+            if fields is None or name in fields or name.removesuffix("_id") in fields
+            else value
+            for name, value in original.items()
+        }
+        old_signed = _signed(original["amount"], original["transaction_type"])
+        new_signed = _signed(current["amount"], current["transaction_type"])
+        if (
+            old_signed == new_signed
+            and original["date"] == current["date"]
+            and original["account_id"] == current["account_id"]
+        ):
+            continue
+
+        old_delta = deltas.setdefault(original["account_id"], AccountBalanceDelta())
+        old_delta.net_change -= old_signed
+        old_delta.touch(original["date"])
+        if original["date"] != current["date"] or original["account_id"] != current["account_id"]:
+            old_delta.vacated_dates.add(original["date"])
+
+        new_delta = deltas.setdefault(current["account_id"], AccountBalanceDelta())
+        new_delta.net_change += new_signed
+        new_delta.touch(current["date"])
+    return deltas
+
+
+def bulk_update_transactions(
+    transactions: list[Transaction],
+    fields: list[str],
+    batch_size: int = 500,
+) -> dict[int, AccountBalanceDelta]:
+    """Bulk-update transactions and apply balance side effects once per account."""
+    if not transactions:
+        return {}
+
+    if FLOW_CLASS_SOURCE_FIELDS & set(fields):
+        assign_flow_classes(transactions)
+        fields = with_flow_class(fields)
+    if {"date", "description"} & set(fields):
+        for txn in transactions:
+            txn.assign_source_keys()
+        if "source_change_signature" not in fields:
+            fields = [*fields, "source_change_signature"]
+    deltas = compute_balance_deltas(transactions, fields)
+    rollup_slices = slices_for(transactions)
+
+    with transaction.atomic():
+        Transaction.objects.bulk_update(transactions, fields, batch_size=batch_size)
+        for account_id, delta in deltas.items():
+            if delta.net_change:
+                FinancialAccount.objects.filter(pk=account_id).update(balance=F("balance") + delta.net_change)
+        refresh_slices(rollup_slices)
+
+    for txn in transactions:
+        txn.reset_original_values(fields)
+
+    for account in FinancialAccount.objects.filter(pk__in=deltas.keys()):
+        delta = deltas[account.pk]
+        update_balances_from_date(account, delta.from_date)
+        if delta.vacated_dates:
+            remaining = set(
+                Transaction.objects.filter(account=account, date__in=delta.vacated_dates).values_list("date", flat=True)
+            )
+            AccountBalanceHistory.objects.filter(account=account, date__in=delta.vacated_dates - remaining).delete()
+
+    invalidate_dashboards(txn.user_id for txn in transactions)
+    return deltas
@@ -0,0 +1,105 @@
+"""Maintenance for the denormalized ``flow_class`` column.
+
+``Transaction.flow_class`` (and the matching rollup column) caches
+``apps.core.constants.flow_class_for`` so the income/expense/investment
+filters need no join to ``transaction_category``. ``Transaction.save`` keeps
+single rows current; bulk writers call ``assign_flow_classes`` before
+inserting or updating, set-based writers call ``sync_flow_classes``
+afterwards, and category signals call ``sync_category_flow_class`` when a
+category's type or slug changes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db.models import Q, QuerySet
+
+from apps.core.constants import CC_PAYMENT_CATEGORY_SLUG, flow_class_for
+from apps.transaction.models import Transaction, TransactionCategory, TransactionMonthlyRollup
+
+FLOW_CLASS_SOURCE_FIELDS = {"category", "category_id", "transaction_type"}
+
+
+def flow_class_conditions() -> dict[str, Q]:
+    """SQL equivalent of flow_class_for: flow class to the Q selecting its rows."""
+    cc_payment = Q(category__slug=CC_PAYMENT_CATEGORY_SLUG)
+    return {
+        "cc_payment": cc_payment,
+        "income": (Q(category__type="income") & ~cc_payment) | Q(category__isnull=True, transaction_type="credit"),
+        "expense": (Q(category__type="expense") & ~cc_payment) | Q(category__isnull=True, transaction_type="debit"),
+        "investment": Q(category__type="investment") & ~cc_payment,
+        "transfer": Q(category__type="transfer") & ~cc_payment,
+        "other": Q(category__type="other") & ~cc_payment,
+    }
+
+
+def assign_flow_classes(transactions: Iterable[Transaction]) -> None:
+    """
+    Set flow_class on unsaved or about-to-be-updated instances in memory.
+
+    Categories that are not already cached on the instances are loaded with
+    one query.
+    """
+    transactions = list(transactions)
+    category_field = Transaction._meta.get_field("category")
+    missing = {txn.category_id for txn in transactions if txn.category_id and not category_field.is_cached(txn)}
+    categories = {}
+    if missing:
+        rows = TransactionCategory.objects.filter(id__in=missing).values_list("id", "type", "slug")
+        categories = {category_id: (category_type, slug) for category_id, category_type, slug in rows}
+
+    for txn in transactions:
+        if txn.category_id is None:
+            category_type, slug = None, None
+        elif category_field.is_cached(txn):
+            category_type, slug = txn.category.type, txn.category.slug
+        else:
+            category_type, slug = categories.get(txn.category_id, (None, None))
+        txn.flow_class = flow_class_for(category_type, slug, txn.transaction_type)
+
+
+def with_flow_class(fields: Iterable[str]) -> list[str]:
+    """Add flow_class to a bulk_update field list when a source field is being written."""
+    fields = list(fields)
+    if FLOW_CLASS_SOURCE_FIELDS & set(fields) and "flow_class" not in fields:
+        fields.append("flow_class")
+    return fields
+
+
+def sync_flow_classes(transactions: QuerySet | None = None) -> int:
+    """
+    Recompute flow_class in SQL, one UPDATE per class, touching only stale rows.
+
+    Args:
+        transactions: Transaction queryset to reconcile; defaults to all rows
+
+    Returns:
+        Number of rows updated
+    """
+    if transactions is None:
+        transactions = Transaction.objects.all()
+    updated = 0
+    for flow_class, condition in flow_class_conditions().items():
+        updated += transactions.filter(condition).exclude(flow_class=flow_class).update(flow_class=flow_class)
+    return updated
+
+
+def sync_category_flow_class(category: TransactionCategory) -> int:
+    """Propagate a category's current flow class to its transactions and rollup rows."""
+    flow_class = flow_class_for(category.type, category.slug, "debit")
+    updated = Transaction.objects.filter(category=category).exclude(flow_class=flow_class).update(flow_class=flow_class)
+    TransactionMonthlyRollup.objects.filter(category=category).exclude(flow_class=flow_class).update(
+        flow_class=flow_class
+    )
+    return updated
+
+
+def detach_category_flow_class(category: TransactionCategory) -> None:
+    """Reclassify a category's rows as uncategorized before the category is deleted (SET_NULL)."""
+    for model in (Transaction, TransactionMonthlyRollup):
+        rows = model.objects.filter(category=category)
+        for transaction_type in ("debit", "credit"):
+            rows.filter(transaction_type=transaction_type).update(
+                flow_class=flow_class_for(None, None, transaction_type)
+            )
@@ -1,10 +1,24 @@
-"""Keyword-based transaction category matching."""
+"""Keyword-based transaction category matching.
+
+Keyword rules are compiled into an Aho–Corasick automaton so matching a
+description costs time proportional to its length, not to the number of
+keywords. When several keywords occur in a description, the one that sorts
+first in ``load_user_keywords`` order (``-match_count, keyword``) wins.
+
+Compiled matchers are cached per user in ``keyword_rule_cache``; code matching
+on a user's behalf should get one from ``get_user_keyword_matcher`` rather than
+compiling its own.
+"""
 
 from __future__ import annotations
 
+from collections import deque
+
 from apps.richtato_user.models import User
 from apps.transaction.models import CategoryKeyword, TransactionCategory
 
+NO_MATCH = -1
+
 
 def load_user_keywords(user: User) -> list[CategoryKeyword]:
     """Load all keyword rules for a user (call once per bulk job)."""
@@ -13,14 +27,81 @@ def load_user_keywords(user: User) -> list[CategoryKeyword]:
     )
 
 
-def match_category_from_keywords(
-    description: str | None,
-    keywords: list[CategoryKeyword],
-) -> TransactionCategory | None:
-    """Match a description against preloaded keyword rules."""
-    haystack = (description or "").lower()
-    for keyword_obj in keywords:
-        kw = keyword_obj.keyword.strip().lower()
-        if kw and kw in haystack:
-            return keyword_obj.category
-    return None
+class KeywordMatcher:
+    """Aho–Corasick automaton over a user's keyword rules."""
+
+    def __init__(self, keywords: list[CategoryKeyword]):
+        self.keywords = keywords
+        # Trie as parallel arrays: goto transitions, failure links, and the
+        # best (lowest) keyword rank reachable through the output links.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._best: list[int] = [NO_MATCH]
+
+        for rank, keyword_obj in enumerate(keywords):
+            kw = keyword_obj.keyword.strip().lower()
+            if kw:
+                self._insert(kw, rank)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _insert(self, kw: str, rank: int) -> None:
+        state = 0
+        for char in kw:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(NO_MATCH)
+            state = next_state
+        if self._best[state] == NO_MATCH or rank < self._best[state]:
+            self._best[state] = rank
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                # Fold in matches that end here via the suffix chain (BFS order
+                # guarantees the link target is already final).
+                inherited = self._best[self._fail[next_state]]
+                if inherited != NO_MATCH and (self._best[next_state] == NO_MATCH or inherited < self._best[next_state]):
+                    self._best[next_state] = inherited
+
+    def match_rank(self, description: str | None) -> int:
+        """Return the rank of the winning keyword, or NO_MATCH."""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        winner = NO_MATCH
+        for char in (description or "").lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            rank = best[state]
+            if rank != NO_MATCH and (winner == NO_MATCH or rank < winner):
+                winner = rank
+                if winner == 0:
+                    break
+        return winner
+
+    def match(self, description: str | None) -> TransactionCategory | None:
+        """Return the category of the highest-priority keyword in description."""
+        rank = self.match_rank(description)
+        if rank == NO_MATCH:
+            return None
+        return self.keywords[rank].category
+
+
+def compile_keywords(keywords: list[CategoryKeyword]) -> KeywordMatcher:
+    """Compile preloaded keyword rules into a matcher (once per bulk job)."""
+    return KeywordMatcher(keywords)
@@ -0,0 +1,190 @@
+"""Per-user cache of compiled keyword rule sets.
+
+Each user's compiled ``KeywordMatcher`` is held in a process-local LRU keyed by
+``(user_id, version)``. The version is bumped by signals whenever one of the
+user's ``CategoryKeyword`` or ``TransactionCategory`` rows changes, so stale
+entries are simply never looked up again and age out of the LRU.
+
+Set ``KEYWORD_RULE_CACHE_ALIAS`` to a shared Django cache (e.g. Redis) to keep
+versions and compiled rule sets there as well; other processes then see
+invalidations without touching the database. Without a shared alias the
+version also includes a one-query fingerprint of the user's keywords (count,
+max id, and the latest keyword and category ``updated_at``) so additions,
+deletions and edits made in other processes are still picked up.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.richtato_user.models import User
+from apps.transaction.models import CategoryKeyword, TransactionCategory
+from apps.transaction.services.keyword_matching import KeywordMatcher, compile_keywords, load_user_keywords
+
+DEFAULT_MAX_USERS = 256
+CACHE_TIMEOUT_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class KeywordRuleCacheStats:
+    """Hit/miss counters for the keyword rule cache."""
+
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class KeywordRuleCache:
+    """Version-stamped LRU of compiled keyword matchers, one per user."""
+
+    def __init__(self, max_users: int | None = None, shared_alias: str | None = None):
+        self._max_users = max_users
+        self._shared_alias = shared_alias
+        self._entries: OrderedDict[int, tuple[object, KeywordMatcher]] = OrderedDict()
+        self._local_versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.stats = KeywordRuleCacheStats()
+
+    @property
+    def max_users(self) -> int:
+        if self._max_users is not None:
+            return self._max_users
+        return getattr(settings, "KEYWORD_RULE_CACHE_SIZE", DEFAULT_MAX_USERS)
+
+    @property
+    def shared_alias(self) -> str | None:
+        if self._shared_alias is not None:
+            return self._shared_alias
+        return getattr(settings, "KEYWORD_RULE_CACHE_ALIAS", None)
+
+    def _version_key(self, user_id: int) -> str:
+        return f"keyword_rules:version:{user_id}"
+
+    def _rules_key(self, user_id: int, version) -> str:
+        return f"keyword_rules:compiled:{user_id}:{version}"
+
+    def get_version(self, user_id: int):
+        """Current version stamp for a user's rule set."""
+        alias = self.shared_alias
+        if alias:
+            shared = caches[alias]
+            shared.add(self._version_key(user_id), 1, CACHE_TIMEOUT_SECONDS)
+            return shared.get(self._version_key(user_id))
+
+        stats = CategoryKeyword.objects.filter(user_id=user_id).aggregate(
+            count=Count("id"),
+            max_id=Max("id"),
+            keywords_updated=Max("updated_at"),
+            categories_updated=Max("category__updated_at"),
+        )
+        return (
+            self._local_versions.get(user_id, 0),
+            stats["count"],
+            stats["max_id"],
+            stats["keywords_updated"],
+            stats["categories_updated"],
+        )
+
+    def get(self, user: User) -> KeywordMatcher:
+        """Return the user's compiled matcher, compiling it on a miss."""
+        version = self.get_version(user.id)
+
+        with self._lock:
+            entry = self._entries.get(user.id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user.id)
+                self.stats.hits += 1
+                return entry[1]
+
+        alias = self.shared_alias
+        matcher = caches[alias].get(self._rules_key(user.id, version)) if alias else None
+        if matcher is not None:
+            self.stats.shared_hits += 1
+        else:
+            self.stats.misses += 1
+            matcher = compile_keywords(load_user_keywords(user))
+            if alias:
+                caches[alias].set(self._rules_key(user.id, version), matcher, CACHE_TIMEOUT_SECONDS)
+
+        self._store(user.id, version, matcher)
+        return matcher
+
+    def _store(self, user_id: int, version, matcher: KeywordMatcher) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, matcher)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Bump the user's version so cached rule sets are no longer used."""
+        with self._lock:
+            self._local_versions[user_id] = self._local_versions.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+            self.stats.invalidations += 1
+
+        alias = self.shared_alias
+        if alias:
+            shared = caches[alias]
+            try:
+                shared.incr(self._version_key(user_id))
+            except ValueError:
+                shared.add(self._version_key(user_id), 1, CACHE_TIMEOUT_SECONDS)
+
+    def clear(self) -> None:
+        """Drop all local entries and reset counters (for tests)."""
+        with self._lock:
+            self._entries.clear()
+            self._local_versions.clear()
+            self.stats = KeywordRuleCacheStats()
+
+
+keyword_rule_cache = KeywordRuleCache()
+
+
+def get_user_keyword_matcher(user: User) -> KeywordMatcher:
+    """Return the user's compiled keyword matcher from the shared rule cache."""
+    return keyword_rule_cache.get(user)
+
+
+def get_keyword_rule_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for this process's keyword rule cache."""
+    return keyword_rule_cache.stats.as_dict()
+
+
+def _invalidate_now_and_on_commit(user_id: int | None) -> None:
+    if user_id is None:
+        return
+    keyword_rule_cache.invalidate(user_id)
+    # Bump again once committed so a concurrent reload of pre-commit rows
+    # cannot stay cached under the new version.
+    transaction.on_commit(lambda: keyword_rule_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=CategoryKeyword)
+@receiver(post_delete, sender=CategoryKeyword)
+def category_keyword_changed(sender, instance: CategoryKeyword, **kwargs):
+    """Keyword rules changed; the user's compiled rule set is stale."""
+    _invalidate_now_and_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=TransactionCategory)
+@receiver(post_delete, sender=TransactionCategory)
+def transaction_category_changed(sender, instance: TransactionCategory, **kwargs):
+    """Compiled rule sets hold category instances; refresh them on change."""
+    _invalidate_now_and_on_commit(instance.user_id)
@@ -0,0 +1,334 @@
+"""Maintenance and queries for the monthly transaction rollup table.
+
+``TransactionMonthlyRollup`` holds per (account, category, month,
+transaction_type) sums so dashboard aggregates scale with months x categories
+instead of transaction count.
+
+Maintenance is slice-based: whenever transactions change, the affected
+(account, month) slices are recomputed from ``Transaction`` with one grouped
+query and replaced. That keeps the table exact no matter which fields changed,
+and makes every refresh idempotent. ``rebuild_rollups`` and
+``check_rollup_consistency`` back the ``rebuild_transaction_rollups`` command.
+
+Reads go through ``aggregate_amounts`` and ``aggregate_buckets``: whole months come from the rollup
+table and any partial months at either end of the range from ``Transaction``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from loguru import logger
+
+from apps.financial_account.models import FinancialAccount
+from apps.transaction.models import Transaction, TransactionMonthlyRollup
+
+ROLLUP_KEY_FIELDS = ("user_id", "account_id", "category_id", "month", "transaction_type", "flow_class")
+
+Slice = tuple[int, date]  # (account_id, first day of month)
+
+
+def month_start(value: date) -> date:
+    """First day of value's month."""
+    return value.replace(day=1)
+
+
+def slices_for(transactions: Iterable[Transaction], include_original: bool = True) -> set[Slice]:
+    """
+    Rollup slices touched by transactions, as currently set and (optionally) as last persisted.
+
+    Args:
+        transactions: Transaction instances (saved, about to be saved or deleted)
+        include_original: Also include each instance's tracked original account/date
+
+    Returns:
+        Set of (account_id, month) slices
+    """
+    slices: set[Slice] = set()
+    for txn in transactions:
+        if txn.account_id and txn.date:
+            slices.add((txn.account_id, month_start(txn.date)))
+        if include_original:
+            original = getattr(txn, "_original_values", None) or {}
+            if original.get("account_id") and original.get("date"):
+                slices.add((original["account_id"], month_start(original["date"])))
+    return slices
+
+
+def _account_spans(slices: Iterable[Slice]) -> dict[int, tuple[date, date]]:
+    spans: dict[int, tuple[date, date]] = {}
+    for account_id, month in slices:
+        first, last = spans.get(account_id, (month, month))
+        spans[account_id] = (min(first, month), max(last, month))
+    return spans
+
+
+def _grouped_transactions(queryset) -> list[TransactionMonthlyRollup]:
+    rows = (
+        queryset.annotate(month=TruncMonth("date"))
+        .values(*ROLLUP_KEY_FIELDS)
+        .annotate(total=Sum("amount"), rows=Count("id"))
+        .order_by()
+    )
+    return [
+        TransactionMonthlyRollup(
+            user_id=row["user_id"],
+            account_id=row["account_id"],
+            category_id=row["category_id"],
+            month=row["month"],
+            transaction_type=row["transaction_type"],
+            flow_class=row["flow_class"],
+            amount=row["total"] or Decimal("0"),
+            transaction_count=row["rows"],
+        )
+        for row in rows
+    ]
+
+
+def _lock_accounts(accounts) -> None:
+    """Row-lock accounts in id order so overlapping refreshes queue instead of deadlocking."""
+    list(accounts.select_for_update().order_by("id").values_list("id", flat=True))
+
+
+def refresh_slices(slices: Iterable[Slice]) -> int:
+    """
+    Recompute rollup rows for the given (account, month) slices.
+
+    Slices are merged into one month span per account, so a refresh costs a
+    grouped select, a delete and a bulk insert regardless of slice count.
+    The touched accounts are row-locked first, so concurrent writers to the
+    same account refresh one after another instead of both re-inserting a slice.
+
+    Returns:
+        Number of rollup rows written
+    """
+    spans = _account_spans(slices)
+    if not spans:
+        return 0
+
+    transaction_scope = Q()
+    rollup_scope = Q()
+    for account_id, (first_month, last_month) in spans.items():
+        transaction_scope |= Q(
+            account_id=account_id,
+            date__gte=first_month,
+            date__lt=last_month + relativedelta(months=1),
+        )
+        rollup_scope |= Q(account_id=account_id, month__gte=first_month, month__lte=last_month)
+
+    # No savepoint: called inside the writer's atomic block, a failed refresh rolls back the write with it.
+    with transaction.atomic(savepoint=False):
+        _lock_accounts(FinancialAccount.objects.filter(id__in=spans))
+        # Grouped after the lock so the select sees whatever the previous holder committed.
+        rollups = _grouped_transactions(Transaction.objects.filter(transaction_scope))
+        TransactionMonthlyRollup.objects.filter(rollup_scope).delete()
+        TransactionMonthlyRollup.objects.bulk_create(rollups, batch_size=500)
+    return len(rollups)
+
+
+def refresh_for_transactions(transactions: Iterable[Transaction]) -> int:
+    """Recompute the rollup slices touched by transactions (current and original values)."""
+    return refresh_slices(slices_for(transactions))
+
+
+def rebuild_rollups(user_id: int | None = None) -> int:
+    """
+    Rebuild the rollup table from scratch for one user, or for everyone.
+
+    Returns:
+        Number of rollup rows written
+    """
+    accounts = FinancialAccount.objects.all()
+    transactions = Transaction.objects.all()
+    rollups = TransactionMonthlyRollup.objects.all()
+    if user_id is not None:
+        accounts = accounts.filter(user_id=user_id)
+        transactions = transactions.filter(user_id=user_id)
+        rollups = rollups.filter(user_id=user_id)
+
+    with transaction.atomic():
+        _lock_accounts(accounts)
+        rows = _grouped_transactions(transactions)
+        rollups.delete()
+        TransactionMonthlyRollup.objects.bulk_create(rows, batch_size=1000)
+    logger.info(f"Rebuilt {len(rows)} transaction rollup rows" + (f" for user {user_id}" if user_id else ""))
+    return len(rows)
+
+
+@dataclass
+class RollupMismatch:
+    """A rollup key whose stored totals differ from the transactions."""
+
+    key: tuple
+    expected_amount: Decimal
+    expected_count: int
+    actual_amount: Decimal
+    actual_count: int
+
+
+def check_rollup_consistency(user_id: int | None = None) -> list[RollupMismatch]:
+    """
+    Compare rollup totals with a fresh aggregation of transactions.
+
+    Returns:
+        Mismatched keys (empty when the table is consistent)
+    """
+    transactions = Transaction.objects.all()
+    rollups = TransactionMonthlyRollup.objects.all()
+    if user_id is not None:
+        transactions = transactions.filter(user_id=user_id)
+        rollups = rollups.filter(user_id=user_id)
+
+    expected = {
+        tuple(getattr(row, name) for name in ROLLUP_KEY_FIELDS): (row.amount, row.transaction_count)
+        for row in _grouped_transactions(transactions)
+    }
+    # Rows may repeat a key after a category is deleted (SET_NULL), so sum them.
+    actual: dict[tuple, tuple[Decimal, int]] = {}
+    for row in rollups.values(*ROLLUP_KEY_FIELDS).annotate(total=Sum("amount"), rows=Sum("transaction_count")):
+        actual[tuple(row[name] for name in ROLLUP_KEY_FIELDS)] = (row["total"], row["rows"])
+
+    zero = (Decimal("0"), 0)
+    return [
+        RollupMismatch(key, *expected.get(key, zero), *actual.get(key, zero))
+        for key in sorted(expected.keys() | actual.keys(), key=str)
+        if expected.get(key, zero) != actual.get(key, zero)
+    ]
+
+
+def split_month_range(start_date: date, end_date: date) -> tuple[tuple[date, date] | None, list[tuple[date, date]]]:
+    """
+    Split a date range into whole months and partial edges.
+
+    Returns:
+        (first and last whole month, or None; list of partial (start, end) ranges)
+    """
+    first_full = start_date if start_date.day == 1 else month_start(start_date) + relativedelta(months=1)
+    end_is_month_end = (end_date + timedelta(days=1)).day == 1
+    last_full = month_start(end_date) if end_is_month_end else month_start(end_date) - relativedelta(months=1)
+
+    if first_full > last_full:
+        return None, [(start_date, end_date)] if start_date <= end_date else []
+
+    partials = []
+    if start_date < first_full:
+        partials.append((start_date, first_full - timedelta(days=1)))
+    if not end_is_month_end:
+        partials.append((month_start(end_date), end_date))
+    return (first_full, last_full), partials
+
+
+def _aggregate(
+    scope: Q,
+    start_date: date,
+    end_date: date,
+    filter_q: Q | None,
+    group_by: tuple[str, ...],
+    annotations: Callable[[bool], dict],
+) -> dict[tuple, dict[str, Decimal | int]]:
+    """Run the rollup (whole months) and transaction (partial months) sides and merge their sums."""
+    full_months, partials = split_month_range(start_date, end_date)
+    totals: dict[tuple, dict[str, Decimal | int]] = {}
+
+    def collect(queryset, from_rollup: bool):
+        if filter_q is not None:
+            queryset = queryset.filter(filter_q)
+        aggregates = annotations(from_rollup)
+        if group_by:
+            rows = queryset.values(*group_by).annotate(**aggregates).order_by()
+        else:
+            rows = [queryset.aggregate(**aggregates)]
+        for row in rows:
+            bucket = totals.setdefault(tuple(row[name] for name in group_by), dict.fromkeys(aggregates, 0))
+            for name in aggregates:
+                bucket[name] += row[name] or 0
+
+    if full_months:
+        collect(
+            TransactionMonthlyRollup.objects.filter(scope, month__gte=full_months[0], month__lte=full_months[1]),
+            from_rollup=True,
+        )
+
+    if partials:
+        date_scope = Q()
+        for partial_start, partial_end in partials:
+            date_scope |= Q(date__gte=partial_start, date__lte=partial_end)
+        transactions = Transaction.objects.filter(scope).filter(date_scope)
+        if "month" in group_by:
+            transactions = transactions.annotate(month=TruncMonth("date"))
+        collect(transactions, from_rollup=False)
+
+    return totals
+
+
+def aggregate_amounts(
+    scope: Q,
+    start_date: date,
+    end_date: date,
+    filter_q: Q | None = None,
+    group_by: tuple[str, ...] = (),
+) -> dict[tuple, tuple[Decimal, int]]:
+    """
+    Sum amounts and counts over a date range, reading whole months from the rollup table.
+
+    ``scope`` and ``filter_q`` must only use lookups both models share (user,
+    account, category, transaction_type, flow_class). ``group_by`` may include those
+    fields and ``"month"``.
+
+    Args:
+        scope: Ownership filter, e.g. Q(user=user)
+        start_date: Range start (inclusive)
+        end_date: Range end (inclusive)
+        filter_q: Optional classification filter such as get_expense_filter()
+        group_by: Fields to group by; () for a single total
+
+    Returns:
+        Dict keyed by tuples of group_by values to (amount, count); () holds the
+        total when group_by is empty
+    """
+
+    def annotations(from_rollup: bool) -> dict:
+        return {
+            "total": Sum("amount"),
+            "rows": Sum("transaction_count") if from_rollup else Count("id"),
+        }
+
+    totals = _aggregate(scope, start_date, end_date, filter_q, group_by, annotations)
+    if not group_by and not totals:
+        return {(): (Decimal("0"), 0)}
+    return {key: (Decimal(row["total"]), row["rows"]) for key, row in totals.items()}
+
+
+def aggregate_buckets(
+    scope: Q,
+    start_date: date,
+    end_date: date,
+    buckets: dict[str, Q],
+    group_by: tuple[str, ...] = (),
+) -> dict[tuple, dict[str, Decimal]]:
+    """
+    Sum amounts into several filtered buckets at once (conditional aggregation).
+
+    Args:
+        scope: Ownership filter, e.g. Q(user=user)
+        start_date: Range start (inclusive)
+        end_date: Range end (inclusive)
+        buckets: Bucket name to classification filter, e.g. {"income": get_income_filter()}
+        group_by: Fields to group by, as for aggregate_amounts
+
+    Returns:
+        Dict keyed by tuples of group_by values to {bucket name: amount}
+    """
+
+    def annotations(from_rollup: bool) -> dict:
+        return {name: Sum("amount", filter=q) for name, q in buckets.items()}
+
+    totals = _aggregate(scope, start_date, end_date, None, group_by, annotations)
+    return {key: {name: Decimal(row[name]) for name in buckets} for key, row in totals.items()}
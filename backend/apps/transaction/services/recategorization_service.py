@@ -1,12 +1,22 @@
 """Service for bulk recategorization of transactions."""
 
+import time
 from collections.abc import Callable
 
+from django.db import connection
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains
 from django.utils import timezone
 from loguru import logger
 
-from apps.transaction.models import RecategorizationTask, Transaction, TransactionCategory
-from apps.transaction.services.keyword_matching import load_user_keywords, match_category_from_keywords
+from apps.core.services.background_jobs import BackgroundJob
+from apps.core.services.dashboard_cache import invalidate_dashboards
+from apps.transaction.models import CategoryKeyword, RecategorizationTask, Transaction, TransactionCategory
+from apps.transaction.services.flow_class import assign_flow_classes, sync_flow_classes
+from apps.transaction.services.keyword_rule_cache import get_user_keyword_matcher
+from apps.transaction.services.monthly_rollup import rebuild_rollups, refresh_for_transactions
 
 
 class RecategorizationService:
@@ -14,11 +24,14 @@ class RecategorizationService:
 
     BATCH_SIZE = 500
     PROGRESS_INTERVAL = 50
+    # Above this many uncategorized rows, PostgreSQL users are matched in SQL.
+    SET_BASED_THRESHOLD = 5000
 
     def recategorize_all_transactions(
         self,
         task: RecategorizationTask,
         progress_callback: Callable[[int, int], None] | None = None,
+        set_based: bool | None = None,
     ) -> dict[str, int]:
         """
         Recategorize all transactions for a user based on their current keywords.
@@ -26,6 +39,9 @@ class RecategorizationService:
         Args:
             task: RecategorizationTask instance to track progress
             progress_callback: Optional callback for progress updates (processed, total)
+            set_based: Match keywords in the database with a few set-based
+                statements instead of row-by-row in Python. None picks it
+                automatically for large users on PostgreSQL.
 
         Returns:
             Dict with statistics: {
@@ -43,7 +59,6 @@ class RecategorizationService:
         task.save(update_fields=["status"])
 
         try:
-            keywords = load_user_keywords(user)
             uncategorized_category = None
             if not keep_existing:
                 uncategorized_category = TransactionCategory.get_uncategorized_for_user(user)
@@ -57,8 +72,24 @@ class RecategorizationService:
             task.total_count = total_count
             task.save(update_fields=["total_count"])
 
-            logger.info(f"Starting recategorization for user {user.id}: {total_count} transactions")
+            if set_based is None:
+                set_based = connection.vendor == "postgresql" and total_count >= self.SET_BASED_THRESHOLD
 
+            logger.info(
+                f"Starting {'set-based ' if set_based else ''}recategorization for user {user.id}: "
+                f"{total_count} transactions"
+            )
+
+            if set_based:
+                stats = self._recategorize_set_based(transactions, user, uncategorized_category)
+                if stats["updated"]:
+                    rebuild_rollups(user.id)
+                    invalidate_dashboards([user.id])
+                if progress_callback:
+                    progress_callback(stats["processed"], total_count)
+                return self._complete_task(task, user, stats)
+
+            matcher = get_user_keyword_matcher(user)
             stats = {
                 "total": total_count,
                 "processed": 0,
@@ -71,7 +102,7 @@ class RecategorizationService:
 
             for txn in transactions.iterator(chunk_size=self.BATCH_SIZE):
                 old_category_id = txn.category_id
-                new_category = match_category_from_keywords(txn.description, keywords)
+                new_category = matcher.match(txn.description)
 
                 if new_category:
                     if old_category_id != new_category.id:
@@ -108,26 +139,7 @@ class RecategorizationService:
             if pending_updates:
                 self._bulk_update_categories(pending_updates)
 
-            task.status = "completed"
-            task.processed_count = stats["processed"]
-            task.updated_count = stats["updated"]
-            task.completed_at = timezone.now()
-            task.save(
-                update_fields=[
-                    "status",
-                    "processed_count",
-                    "updated_count",
-                    "completed_at",
-                ]
-            )
-
-            logger.info(
-                f"Recategorization completed for user {user.id}: "
-                f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
-                f"{stats['unmatched']} unmatched"
-            )
-
-            return stats
+            return self._complete_task(task, user, stats)
 
         except Exception as e:
             logger.error(f"Recategorization failed for user {user.id}: {str(e)}")
@@ -137,15 +149,116 @@ class RecategorizationService:
             task.save(update_fields=["status", "error_message", "completed_at"])
             raise
 
+    def _complete_task(self, task: RecategorizationTask, user, stats: dict[str, int]) -> dict[str, int]:
+        task.status = "completed"
+        task.processed_count = stats["processed"]
+        task.updated_count = stats["updated"]
+        task.completed_at = timezone.now()
+        task.save(
+            update_fields=[
+                "status",
+                "processed_count",
+                "updated_count",
+                "completed_at",
+            ]
+        )
+
+        logger.info(
+            f"Recategorization completed for user {user.id}: "
+            f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['unmatched']} unmatched"
+        )
+
+        return stats
+
+    def _recategorize_set_based(
+        self,
+        transactions,
+        user,
+        uncategorized_category: TransactionCategory | None,
+    ) -> dict[str, int]:
+        """
+        Match and update categories with set-based SQL.
+
+        The winning keyword per transaction is a correlated subquery over the
+        user's keywords contained in LOWER(description), ordered like
+        load_user_keywords so the first row wins. Outcomes match the Python
+        path row for row.
+        """
+        winning_category = Subquery(
+            CategoryKeyword.objects.filter(user=user)
+            .exclude(keyword="")
+            .filter(Contains(Lower(OuterRef("description")), F("keyword")))
+            .order_by("-match_count", "keyword")
+            .values("category_id")[:1]
+        )
+        annotated = transactions.order_by().annotate(new_category_id=winning_category)
+
+        matched = Q(new_category_id__isnull=False)
+        changed = matched & (Q(category_id__isnull=True) | ~Q(category_id=F("new_category_id")))
+        aggregates = {
+            "processed": Count("id"),
+            "changed": Count("id", filter=changed),
+            "unmatched": Count("id", filter=~matched),
+        }
+        if uncategorized_category is not None:
+            reset = ~matched & Q(category_id__isnull=False) & ~Q(category_id=uncategorized_category.id)
+            aggregates["reset"] = Count("id", filter=reset)
+
+        counts = annotated.aggregate(**aggregates)
+        counts.setdefault("reset", 0)
+
+        with db_transaction.atomic():
+            if counts["changed"]:
+                transactions.filter(pk__in=annotated.filter(changed).values("pk")).update(
+                    category_id=winning_category,
+                    categorization_status="categorized",
+                )
+            if counts["reset"]:
+                transactions.filter(pk__in=annotated.filter(reset).values("pk")).update(
+                    category_id=uncategorized_category.id,
+                    categorization_status="uncategorized",
+                )
+            if counts["changed"] or counts["reset"]:
+                # Not `transactions`: its status filter no longer sees rows just marked categorized.
+                sync_flow_classes(Transaction.objects.filter(user=user))
+
+        updated = counts["changed"] + counts["reset"]
+        return {
+            "total": counts["processed"],
+            "processed": counts["processed"],
+            "updated": updated,
+            "unchanged": counts["processed"] - updated,
+            "unmatched": counts["unmatched"],
+        }
+
     def _bulk_update_categories(self, transactions: list[Transaction]) -> None:
         """Persist category changes without per-row save/signal overhead."""
-        Transaction.objects.bulk_update(
-            transactions,
-            ["category_id", "categorization_status"],
-            batch_size=self.BATCH_SIZE,
-        )
+        assign_flow_classes(transactions)
+        with db_transaction.atomic():
+            Transaction.objects.bulk_update(
+                transactions,
+                ["category_id", "categorization_status", "flow_class"],
+                batch_size=self.BATCH_SIZE,
+            )
+            refresh_for_transactions(transactions)
+        invalidate_dashboards(txn.user_id for txn in transactions)
 
     def _update_task_progress(self, task: RecategorizationTask, stats: dict[str, int]) -> None:
         task.processed_count = stats["processed"]
         task.updated_count = stats["updated"]
         task.save(update_fields=["processed_count", "updated_count"])
+
+
+def run_recategorization_job(task_id: int, job: BackgroundJob) -> None:
+    """Background job entry point: run a queued task and record its timings."""
+    task = RecategorizationTask.objects.select_related("user").get(pk=task_id)
+    task.queue_wait_seconds = job.queue_wait_seconds
+    task.save(update_fields=["queue_wait_seconds"])
+
+    started = time.monotonic()
+    try:
+        RecategorizationService().recategorize_all_transactions(task)
+    finally:
+        task.run_seconds = time.monotonic() - started
+        task.save(update_fields=["run_seconds"])
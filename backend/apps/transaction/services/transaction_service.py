@@ -57,6 +57,10 @@ class TransactionService:
             transaction_type=transaction_type,
         )
 
+    def get_running_balances(self, account: FinancialAccount, transactions: list[Transaction]) -> dict[int, Decimal]:
+        """Get computed running balances for a page of an account's transactions."""
+        return self.transaction_repository.get_running_balances(account, transactions)
+
     def get_transaction_by_id(self, transaction_id: int, user: User) -> Transaction | None:
         """Get transaction by ID, ensuring it belongs to the user."""
         transaction = self.transaction_repository.get_by_id(transaction_id)
@@ -293,9 +297,6 @@ class TransactionService:
 
     def _match_category_via_keywords(self, user: User, description: str) -> TransactionCategory | None:
         """Try to match a category using user keyword rules."""
-        from apps.transaction.services.keyword_matching import (
-            load_user_keywords,
-            match_category_from_keywords,
-        )
+        from apps.transaction.services.keyword_rule_cache import get_user_keyword_matcher
 
-        return match_category_from_keywords(description, load_user_keywords(user))
+        return get_user_keyword_matcher(user).match(description)
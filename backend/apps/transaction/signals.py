@@ -3,20 +3,36 @@
 When a transaction is created, updated, or deleted, these signals:
 1. Adjust FinancialAccount.balance (the anchor) to reflect the change
 2. Recalculate AccountBalanceHistory entries from that anchor
+
+With ``settings.DEFER_BALANCE_RECALCULATION`` enabled, step 2 is queued on
+``balance_recalculation_queue`` and coalesced per account instead of running
+inside the request.
+
+Separate receivers keep ``TransactionMonthlyRollup`` in sync for every save
+and delete, including category-only edits that skip the balance work, and
+push ``TransactionCategory`` type/slug changes into the denormalized
+``flow_class`` column.
 """
 
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import F, Sum
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models import Case, DecimalField, F, QuerySet, Sum, When
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from loguru import logger
 
 from apps.financial_account.models import AccountBalanceHistory, FinancialAccount
-from apps.transaction.models import Transaction
+from apps.transaction.models import Transaction, TransactionCategory
+from apps.transaction.services.balance_recalculation_queue import (
+    balance_recalculation_queue,
+    is_deferred_balance_recalculation_enabled,
+)
+from apps.transaction.services.flow_class import detach_category_flow_class, sync_category_flow_class
+from apps.transaction.services.monthly_rollup import month_start, refresh_slices, slices_for
 
-CATEGORY_ONLY_UPDATE_FIELDS = frozenset({"category", "category_id", "categorization_status"})
+CATEGORY_ONLY_UPDATE_FIELDS = frozenset({"category", "category_id", "categorization_status", "flow_class"})
+CATEGORY_FLOW_FIELDS = frozenset({"type", "slug"})
 
 
 def _is_category_only_update(kwargs) -> bool:
@@ -71,12 +87,63 @@ def recalculate_balance_for_date(
     return balance_at_date
 
 
+def _daily_net_changes(account: FinancialAccount, from_date: date) -> dict[date, Decimal]:
+    """Return the signed net change per transaction date on or after from_date, in one grouped query."""
+    rows = (
+        Transaction.objects.filter(account=account, date__gte=from_date)
+        .order_by()
+        .values("date")
+        .annotate(
+            net=Sum(
+                Case(
+                    When(transaction_type="credit", then=F("amount")),
+                    default=-F("amount"),
+                    output_field=DecimalField(max_digits=15, decimal_places=2),
+                )
+            )
+        )
+    )
+    return {row["date"]: row["net"] or Decimal("0") for row in rows}
+
+
+def compute_balances_from_anchor(
+    current_balance: Decimal,
+    net_by_date: dict[date, Decimal],
+    dates,
+) -> dict[date, Decimal]:
+    """
+    Walk dates backwards from the anchor balance and return the balance at each date.
+
+    The balance on a date is the anchor minus the net change of every
+    transaction dated strictly after it, so a single descending pass with a
+    running total replaces one aggregate query per date.
+
+    Args:
+        current_balance: The account's current balance (the anchor)
+        net_by_date: Signed net change per transaction date; must cover every
+            transaction dated after the earliest date in ``dates``
+        dates: The dates to compute balances for
+
+    Returns:
+        Mapping of date to balance at the end of that date
+    """
+    all_dates = set(dates) | set(net_by_date)
+    balances: dict[date, Decimal] = {}
+    net_after = Decimal("0")
+    for target_date in sorted(all_dates, reverse=True):
+        balances[target_date] = current_balance - net_after
+        net_after += net_by_date.get(target_date, Decimal("0"))
+    return {target_date: balances[target_date] for target_date in dates}
+
+
 def update_balances_from_date(account: FinancialAccount, from_date: date) -> None:
     """
     Update balance history for all dates >= from_date that have transactions.
 
     This handles cascading updates when a transaction is modified or deleted,
-    ensuring all subsequent balance snapshots remain accurate.
+    ensuring all subsequent balance snapshots remain accurate. Query count is
+    constant regardless of history length: one grouped query for daily net
+    changes, one for existing history dates, and one bulk upsert.
 
     Args:
         account: The financial account to update
@@ -85,38 +152,59 @@ def update_balances_from_date(account: FinancialAccount, from_date: date) -> Non
     account.refresh_from_db(fields=["balance"])
     current_balance = account.balance
 
-    affected_dates = (
-        Transaction.objects.filter(account=account, date__gte=from_date)
-        .values_list("date", flat=True)
-        .distinct()
-        .order_by("date")
-    )
+    net_by_date = _daily_net_changes(account, from_date)
 
-    existing_history_dates = (
-        AccountBalanceHistory.objects.filter(account=account, date__gte=from_date)
-        .values_list("date", flat=True)
-        .distinct()
+    existing_history_dates = AccountBalanceHistory.objects.filter(account=account, date__gte=from_date).values_list(
+        "date", flat=True
     )
 
-    all_dates = set(affected_dates) | set(existing_history_dates)
+    all_dates = set(net_by_date) | set(existing_history_dates)
+    if not all_dates:
+        return
 
-    for target_date in sorted(all_dates):
-        recalculate_balance_for_date(account, target_date, current_balance)
+    balances = compute_balances_from_anchor(current_balance, net_by_date, all_dates)
+
+    AccountBalanceHistory.objects.bulk_create(
+        [
+            AccountBalanceHistory(account=account, date=target_date, balance=balance, source="transaction")
+            for target_date, balance in sorted(balances.items())
+        ],
+        update_conflicts=True,
+        unique_fields=["account", "date"],
+        update_fields=["balance", "source"],
+    )
+
+    logger.debug(
+        f"Updated {len(balances)} balance history entries for account {account.id} ({account.name}) from {from_date}"
+    )
 
 
 @receiver(pre_save, sender=Transaction)
 def transaction_pre_save(sender, instance: Transaction, **kwargs):
-    """Capture old values before update so post_save can compute the delta."""
+    """Capture old values before update so post_save can compute the delta.
+
+    Uses the values tracked since the instance was loaded; only falls back to
+    a database read for instances built without a complete snapshot.
+    """
     if _is_category_only_update(kwargs):
         return
-    if instance.pk:
-        try:
-            old = Transaction.objects.get(pk=instance.pk)
-            instance._old_signed_amount = old.signed_amount
-            instance._old_date = old.date
-            instance._old_account_id = old.account_id
-        except Transaction.DoesNotExist:
-            pass
+    if not instance.pk:
+        return
+
+    original = instance.get_original_values()
+    if original is not None:
+        instance._old_signed_amount = instance.original_signed_amount
+        instance._old_date = original["date"]
+        instance._old_account_id = original["account_id"]
+        return
+
+    try:
+        old = Transaction.objects.get(pk=instance.pk)
+        instance._old_signed_amount = old.signed_amount
+        instance._old_date = old.date
+        instance._old_account_id = old.account_id
+    except Transaction.DoesNotExist:
+        pass
 
 
 @receiver(post_save, sender=Transaction)
@@ -148,6 +236,13 @@ def transaction_post_save(sender, instance: Transaction, created: bool, **kwargs
     )
 
     old_date = getattr(instance, "_old_date", None)
+    if is_deferred_balance_recalculation_enabled():
+        if not created and old_date and old_date != instance.date:
+            balance_recalculation_queue.enqueue(account.pk, min(old_date, instance.date), orphan_date=old_date)
+        else:
+            balance_recalculation_queue.enqueue(account.pk, instance.date)
+        return
+
     if not created and old_date and old_date != instance.date:
         update_balances_from_date(account, min(old_date, instance.date))
 
@@ -159,6 +254,14 @@ def transaction_post_save(sender, instance: Transaction, created: bool, **kwargs
         update_balances_from_date(account, instance.date)
 
 
+def _deleted_directly(origin) -> bool:
+    """True unless the delete started from another model and cascaded to transactions."""
+    if origin is None:
+        return True
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, Transaction)
+
+
 @receiver(post_delete, sender=Transaction)
 def transaction_post_delete(sender, instance: Transaction, **kwargs):
     """
@@ -178,6 +281,12 @@ def transaction_post_delete(sender, instance: Transaction, **kwargs):
         f"for account {account.name} (balance now {account.balance})"
     )
 
+    if is_deferred_balance_recalculation_enabled():
+        # A delete cascading from the account (or its owner) takes the history with it.
+        if _deleted_directly(kwargs.get("origin")):
+            balance_recalculation_queue.enqueue(account.pk, transaction_date, orphan_date=transaction_date)
+        return
+
     update_balances_from_date(account, transaction_date)
 
     remaining_transactions = Transaction.objects.filter(account=account, date=transaction_date).exists()
@@ -187,3 +296,44 @@ def transaction_post_delete(sender, instance: Transaction, **kwargs):
         logger.debug(
             f"Removed balance history entry for account {account.id} on {transaction_date} (no remaining transactions)"
         )
+
+
+@receiver(pre_save, sender=Transaction)
+def transaction_rollup_pre_save(sender, instance: Transaction, **kwargs):
+    """Remember the rollup slice the row occupied before this save."""
+    if not instance.pk:
+        return
+    if instance.get_original_values() is not None:
+        instance._rollup_slices = slices_for([instance])
+        return
+    old = Transaction.objects.filter(pk=instance.pk).values("account_id", "date").first()
+    instance._rollup_slices = {(old["account_id"], month_start(old["date"]))} if old else set()
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_rollup_post_save(sender, instance: Transaction, **kwargs):
+    """Recompute the monthly rollup for the row's old and new (account, month)."""
+    slices = getattr(instance, "_rollup_slices", set()) | slices_for([instance], include_original=False)
+    instance._rollup_slices = set()
+    refresh_slices(slices)
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_rollup_post_delete(sender, instance: Transaction, **kwargs):
+    """Drop the deleted row from its monthly rollup."""
+    refresh_slices(slices_for([instance], include_original=False))
+
+
+@receiver(post_save, sender=TransactionCategory)
+def category_flow_class_post_save(sender, instance: TransactionCategory, created: bool, **kwargs):
+    """Re-derive flow_class for the category's transactions when its type or slug may have changed."""
+    update_fields = kwargs.get("update_fields")
+    if created or (update_fields is not None and not CATEGORY_FLOW_FIELDS & set(update_fields)):
+        return
+    sync_category_flow_class(instance)
+
+
+@receiver(pre_delete, sender=TransactionCategory)
+def category_flow_class_pre_delete(sender, instance: TransactionCategory, **kwargs):
+    """Reclassify rows as uncategorized ahead of the SET_NULL cascade."""
+    detach_category_flow_class(instance)
@@ -0,0 +1,119 @@
+"""Tests for keyset (cursor) pagination of transaction lists."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.financial_account.models import FinancialAccount
+from apps.household.models import Household, HouseholdMember
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="cursor_a", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Cursor Checking",
+        account_type="checking",
+        shared_with_household=True,
+    )
+
+
+@pytest.fixture
+def client(user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def _seed(user, account, count, start=date(2024, 1, 1)):
+    # Several rows per day so the created_at/id tie-breakers are exercised.
+    Transaction.objects.bulk_create(
+        [
+            Transaction(
+                user=user,
+                account=account,
+                date=start + timedelta(days=i // 4),
+                amount=Decimal(f"{i + 1}.00"),
+                transaction_type="debit",
+                description=f"Row {i}",
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def _walk(client, url, key):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = f"pagination=cursor&page_size=7{f'&cursor={cursor}' if cursor else ''}"
+        payload = client.get(f"{url}{'&' if '?' in url else '?'}{params}").json()
+        ids.extend(row["id"] for row in payload[key])
+        pages += 1
+        if not payload["has_next"]:
+            assert payload["next_cursor"] is None
+            return ids, pages, payload
+        cursor = payload["next_cursor"]
+
+
+class TestTransactionListCursorMode:
+    def test_walks_every_row_once_in_offset_order(self, client, user, account):
+        _seed(user, account, 30)
+        expected = list(
+            Transaction.objects.filter(user=user).order_by("-date", "-created_at", "-id").values_list("id", flat=True)
+        )
+
+        ids, pages, last_payload = _walk(client, "/api/v1/transactions/", "transactions")
+
+        assert ids == expected
+        assert pages == 5
+        assert last_payload["total_count"] == 30
+
+    def test_account_filter_includes_running_balances(self, client, user, account):
+        _seed(user, account, 9)
+        payload = client.get(f"/api/v1/transactions/?account_id={account.id}&pagination=cursor&page_size=5").json()
+
+        assert [row["computed_running_balance"] for row in payload["transactions"]][:2] == ["-45.00", "-36.00"]
+
+    def test_invalid_cursor_is_rejected(self, client, user, account):
+        response = client.get("/api/v1/transactions/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_household_scope(self, client, user, account):
+        other = User.objects.create_user(username="cursor_b", password="testpass123")
+        household = Household.objects.create(name="Cursor", created_by=user)
+        HouseholdMember.objects.create(household=household, user=user)
+        HouseholdMember.objects.create(household=household, user=other)
+        other_account = FinancialAccount.objects.create(
+            user=other, name="B Shared", account_type="checking", shared_with_household=True
+        )
+        _seed(user, account, 10)
+        _seed(other, other_account, 10, start=date(2024, 1, 2))
+
+        ids, _, _ = _walk(client, "/api/v1/transactions/?scope=household", "transactions")
+
+        assert sorted(ids) == sorted(Transaction.objects.values_list("id", flat=True))
+
+
+class TestAccountTransactionsCursorMode:
+    def test_walks_account_rows(self, client, user, account):
+        _seed(user, account, 16)
+        ids, pages, last_payload = _walk(client, f"/api/v1/accounts/{account.id}/transactions/", "rows")
+
+        assert len(ids) == len(set(ids)) == 16
+        assert pages == 3
+        assert last_payload["total"] == 16
@@ -0,0 +1,130 @@
+"""Tests for the denormalized Transaction.flow_class column."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from apps.core.constants import flow_class_for, get_expense_filter, get_income_filter
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory, TransactionMonthlyRollup
+from apps.transaction.services.bulk_transaction_service import bulk_update_transactions
+from apps.transaction.services.flow_class import sync_flow_classes
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="flowtest", email="flow@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Flow Checking",
+        account_type="checking",
+        balance=Decimal("5000.00"),
+    )
+
+
+@pytest.fixture
+def food(user):
+    return TransactionCategory.objects.create(user=user, name="Flow Food", slug="flow-food", type="expense")
+
+
+@pytest.fixture
+def salary(user):
+    return TransactionCategory.objects.create(user=user, name="Flow Salary", slug="flow-salary", type="income")
+
+
+def _txn(account, category, transaction_type="debit", amount="25.00"):
+    return Transaction.objects.create(
+        user=account.user,
+        account=account,
+        category=category,
+        amount=Decimal(amount),
+        date=date(2024, 3, 5),
+        description="Flow test",
+        transaction_type=transaction_type,
+    )
+
+
+class TestFlowClassFor:
+    @pytest.mark.parametrize(
+        "category_type, slug, transaction_type, expected",
+        [
+            ("expense", "groceries", "debit", "expense"),
+            ("income", "salary", "credit", "income"),
+            ("investment", "brokerage", "debit", "investment"),
+            ("transfer", "credit-card-payment", "debit", "cc_payment"),
+            ("expense", "credit-card-payment", "debit", "cc_payment"),
+            (None, None, "debit", "expense"),
+            (None, None, "credit", "income"),
+            ("other", "uncategorized", "debit", "other"),
+        ],
+    )
+    def test_classification(self, category_type, slug, transaction_type, expected):
+        assert flow_class_for(category_type, slug, transaction_type) == expected
+
+
+class TestSaveMaintenance:
+    def test_save_sets_flow_class(self, account, food, salary):
+        assert _txn(account, food).flow_class == "expense"
+        assert _txn(account, salary, "credit").flow_class == "income"
+        cc_payment = TransactionCategory.objects.get(user=account.user, slug="credit-card-payment")
+        assert _txn(account, cc_payment).flow_class == "cc_payment"
+
+    def test_category_only_update_fields_includes_flow_class(self, account, food, salary):
+        txn = _txn(account, food)
+
+        txn.category = salary
+        txn.save(update_fields=["category"])
+
+        assert Transaction.objects.get(pk=txn.pk).flow_class == "income"
+
+    def test_bulk_update_reclassifies(self, account, food, salary):
+        transactions = [_txn(account, food), _txn(account, food)]
+        for txn in transactions:
+            txn.category_id = salary.id
+
+        bulk_update_transactions(transactions, ["category"])
+
+        assert set(Transaction.objects.filter(account=account).values_list("flow_class", flat=True)) == {"income"}
+
+
+class TestCategoryMaintenance:
+    def test_type_change_propagates_to_transactions_and_rollups(self, account, food):
+        txn = _txn(account, food)
+
+        food.type = "investment"
+        food.save()
+
+        assert Transaction.objects.get(pk=txn.pk).flow_class == "investment"
+        assert TransactionMonthlyRollup.objects.get(category=food).flow_class == "investment"
+
+    def test_delete_falls_back_to_transaction_direction(self, account, food):
+        debit = _txn(account, food)
+        credit = _txn(account, food, "credit")
+
+        food.delete()
+
+        assert Transaction.objects.get(pk=debit.pk).flow_class == "expense"
+        assert Transaction.objects.get(pk=credit.pk).flow_class == "income"
+        assert set(TransactionMonthlyRollup.objects.filter(account=account).values_list("flow_class", flat=True)) == {
+            "expense",
+            "income",
+        }
+
+
+class TestFilters:
+    def test_filters_do_not_join_categories(self):
+        for filter_q in (get_expense_filter(), get_income_filter()):
+            assert "transaction_category" not in str(Transaction.objects.filter(filter_q).query)
+
+    def test_sync_repairs_stale_rows(self, account, food):
+        txn = _txn(account, food)
+        Transaction.objects.filter(pk=txn.pk).update(flow_class="other")
+
+        assert sync_flow_classes(Transaction.objects.filter(account=account)) == 1
+        assert Transaction.objects.get(pk=txn.pk).flow_class == "expense"
@@ -0,0 +1,150 @@
+"""Tests for the compiled keyword matcher."""
+
+import random
+
+import pytest
+
+from apps.richtato_user.models import User
+from apps.transaction.models import CategoryKeyword, TransactionCategory
+from apps.transaction.services.keyword_matching import compile_keywords, load_user_keywords
+from apps.transaction.services.keyword_rule_cache import (
+    KeywordRuleCache,
+    get_keyword_rule_cache_stats,
+    get_user_keyword_matcher,
+    keyword_rule_cache,
+)
+
+
+def _naive_match(description, keywords):
+    haystack = (description or "").lower()
+    for keyword_obj in keywords:
+        kw = keyword_obj.keyword.strip().lower()
+        if kw and kw in haystack:
+            return keyword_obj.category
+    return None
+
+
+def _unsaved_keywords(words):
+    categories = [TransactionCategory(id=i + 1, name=f"Cat {i}") for i in range(len(words))]
+    return [CategoryKeyword(keyword=word, category=category) for word, category in zip(words, categories, strict=True)]
+
+
+class TestKeywordMatcher:
+    def test_first_keyword_in_priority_order_wins(self):
+        keywords = _unsaved_keywords(["coffee", "starbucks coffee", "bucks"])
+        matcher = compile_keywords(keywords)
+
+        assert matcher.match("STARBUCKS COFFEE #123").name == "Cat 0"
+        assert matcher.match("Bucks county").name == "Cat 2"
+        assert matcher.match("tea house") is None
+        assert matcher.match(None) is None
+
+    def test_overlapping_and_suffix_keywords(self):
+        keywords = _unsaved_keywords(["she", "he", "hers", "his"])
+        matcher = compile_keywords(keywords)
+
+        assert matcher.match("ushers").name == "Cat 0"
+        assert matcher.match("ahishers").name == "Cat 0"
+        assert matcher.match("xhex").name == "Cat 1"
+
+    def test_blank_keywords_never_match(self):
+        matcher = compile_keywords(_unsaved_keywords(["  ", "uber"]))
+        assert matcher.match("anything") is None
+        assert matcher.match("UBER *TRIP").name == "Cat 1"
+
+    def test_matches_naive_scan_on_random_inputs(self):
+        rng = random.Random(7)
+        alphabet = "abcde *"
+        words = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)})
+        rng.shuffle(words)
+        keywords = _unsaved_keywords(words)
+        matcher = compile_keywords(keywords)
+
+        for _ in range(500):
+            description = "".join(rng.choice(alphabet.upper() + alphabet) for _ in range(rng.randint(0, 30)))
+            assert matcher.match(description) is _naive_match(description, keywords)
+
+
+@pytest.fixture
+def keyword_user(db):
+    keyword_rule_cache.clear()
+    user = User.objects.create_user(username="kwcache", password="testpass123")
+    yield user
+    keyword_rule_cache.clear()
+
+
+@pytest.fixture
+def dining(keyword_user):
+    category = TransactionCategory.objects.create(user=keyword_user, name="Dining", slug="dining-kw", type="expense")
+    CategoryKeyword.objects.create(user=keyword_user, category=category, keyword="zzqpie")
+    return category
+
+
+class TestKeywordRuleCache:
+    def test_cache_reused_until_keywords_change(self, keyword_user, dining, django_assert_num_queries):
+        assert get_user_keyword_matcher(keyword_user).match("ZZQPIE HUT") == dining
+        with django_assert_num_queries(1):
+            assert get_user_keyword_matcher(keyword_user).match("zzqpie place") == dining
+
+        travel = TransactionCategory.objects.create(user=keyword_user, name="Travel", slug="travel-kw", type="expense")
+        CategoryKeyword.objects.create(user=keyword_user, category=travel, keyword="zzqtrip")
+        assert get_user_keyword_matcher(keyword_user).match("ZZQTRIP 42") == travel
+        assert len(get_user_keyword_matcher(keyword_user)) == len(load_user_keywords(keyword_user))
+
+        stats = get_keyword_rule_cache_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert stats["invalidations"] >= 2
+
+    def test_category_change_invalidates(self, keyword_user, dining):
+        get_user_keyword_matcher(keyword_user)
+        dining.name = "Restaurants"
+        dining.save()
+
+        assert get_user_keyword_matcher(keyword_user).match("ZZQPIE").name == "Restaurants"
+
+    def test_edits_from_another_process_invalidate_without_shared_backend(self, keyword_user, dining):
+        # Signals only bump the module-level cache, so this instance sees the edits the
+        # way another worker process would: through the database fingerprint alone.
+        other_process = KeywordRuleCache()
+        assert other_process.get(keyword_user).match("ZZQPIE") == dining
+
+        keyword = CategoryKeyword.objects.get(user=keyword_user, keyword="zzqpie")
+        keyword.keyword = "zzqtart"
+        keyword.save()
+        assert other_process.get(keyword_user).match("ZZQTART") == dining
+
+        dining.name = "Restaurants"
+        dining.save()
+        assert other_process.get(keyword_user).match("ZZQTART").name == "Restaurants"
+        assert other_process.stats.misses == 3
+
+    def test_lru_evicts_least_recently_used_user(self, keyword_user, dining):
+        other = User.objects.create_user(username="kwcache2", password="testpass123")
+        cache = KeywordRuleCache(max_users=1)
+
+        cache.get(keyword_user)
+        cache.get(other)
+        cache.get(keyword_user)
+
+        assert cache.stats.evictions == 2
+        assert cache.stats.misses == 3
+
+    def test_shared_backend_skips_database_on_hit(self, keyword_user, dining, settings, django_assert_num_queries):
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "keyword_rules": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "kw-test"},
+        }
+        first_process = KeywordRuleCache(shared_alias="keyword_rules")
+        second_process = KeywordRuleCache(shared_alias="keyword_rules")
+
+        first_process.get(keyword_user)
+        with django_assert_num_queries(0):
+            assert second_process.get(keyword_user).match("zzqpie") == dining
+            assert second_process.get(keyword_user).match("zzqpie") == dining
+        assert second_process.stats.shared_hits == 1
+        assert second_process.stats.hits == 1
+
+        first_process.invalidate(keyword_user.id)
+        second_process.get(keyword_user)
+        assert second_process.stats.misses == 1
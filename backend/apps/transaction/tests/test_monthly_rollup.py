@@ -0,0 +1,247 @@
+"""Tests for the monthly transaction rollup table and its maintenance."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from apps.core.constants import get_expense_filter
+from apps.financial_account.models import FinancialAccount
+from apps.richtato_user.models import User
+from apps.transaction.models import Transaction, TransactionCategory, TransactionMonthlyRollup
+from apps.transaction.services import monthly_rollup
+from apps.transaction.services.bulk_transaction_service import (
+    bulk_create_import_transactions,
+    bulk_update_transactions,
+)
+from apps.transaction.services.monthly_rollup import (
+    aggregate_amounts,
+    check_rollup_consistency,
+    refresh_slices,
+    split_month_range,
+)
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="rolluptest", email="rollup@test.com", password="testpass123")
+
+
+@pytest.fixture
+def account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Rollup Checking",
+        account_type="checking",
+        balance=Decimal("5000.00"),
+    )
+
+
+@pytest.fixture
+def other_account(user):
+    return FinancialAccount.objects.create(
+        user=user,
+        name="Rollup Savings",
+        account_type="savings",
+        balance=Decimal("1000.00"),
+    )
+
+
+@pytest.fixture
+def food(user):
+    return TransactionCategory.objects.create(user=user, name="Rollup Food", slug="rollup-food", type="expense")
+
+
+@pytest.fixture
+def travel(user):
+    return TransactionCategory.objects.create(user=user, name="Rollup Travel", slug="rollup-travel", type="expense")
+
+
+def _txn(account, category, amount, txn_date, transaction_type="debit"):
+    return Transaction.objects.create(
+        user=account.user,
+        account=account,
+        category=category,
+        amount=Decimal(amount),
+        date=txn_date,
+        description=f"Rollup {amount}",
+        transaction_type=transaction_type,
+    )
+
+
+def _rollup(account, category, month):
+    return TransactionMonthlyRollup.objects.get(account=account, category=category, month=month)
+
+
+class TestSignalMaintenance:
+    def test_create_adds_to_month(self, account, food):
+        _txn(account, food, "10.00", date(2024, 3, 5))
+        _txn(account, food, "15.50", date(2024, 3, 20))
+
+        row = _rollup(account, food, date(2024, 3, 1))
+        assert row.amount == Decimal("25.50")
+        assert row.transaction_count == 2
+        assert check_rollup_consistency(account.user_id) == []
+
+    def test_update_moves_between_slices(self, account, other_account, food, travel):
+        txn = _txn(account, food, "40.00", date(2024, 3, 5))
+
+        txn.category = travel
+        txn.date = date(2024, 4, 2)
+        txn.account = other_account
+        txn.save()
+
+        assert not TransactionMonthlyRollup.objects.filter(account=account).exists()
+        assert _rollup(other_account, travel, date(2024, 4, 1)).amount == Decimal("40.00")
+        assert check_rollup_consistency(account.user_id) == []
+
+    def test_delete_removes_amount(self, account, food):
+        keep = _txn(account, food, "10.00", date(2024, 3, 5))
+        _txn(account, food, "30.00", date(2024, 3, 6)).delete()
+
+        row = _rollup(account, food, date(2024, 3, 1))
+        assert row.amount == keep.amount
+        assert row.transaction_count == 1
+
+
+class TestBulkMaintenance:
+    def test_bulk_import(self, account, food):
+        transactions = [
+            Transaction(
+                user=account.user,
+                account=account,
+                category=food,
+                amount=Decimal("5.00"),
+                date=date(2024, month, 10),
+                description=f"Import {month}",
+                transaction_type="debit",
+            )
+            for month in (1, 1, 2)
+        ]
+        bulk_create_import_transactions(account, transactions)
+
+        assert _rollup(account, food, date(2024, 1, 1)).transaction_count == 2
+        assert _rollup(account, food, date(2024, 2, 1)).amount == Decimal("5.00")
+        assert check_rollup_consistency(account.user_id) == []
+
+    def test_bulk_update(self, account, food, travel):
+        transactions = [_txn(account, food, "20.00", date(2024, 5, day)) for day in (1, 2)]
+        for txn in transactions:
+            txn.category = travel
+            txn.date = date(2024, 6, 1)
+
+        bulk_update_transactions(transactions, ["category", "date"])
+
+        assert not TransactionMonthlyRollup.objects.filter(month=date(2024, 5, 1)).exists()
+        assert _rollup(account, travel, date(2024, 6, 1)).amount == Decimal("40.00")
+        assert check_rollup_consistency(account.user_id) == []
+
+    def test_failed_refresh_rolls_back_bulk_import(self, account, food, monkeypatch):
+        from apps.transaction.services import bulk_transaction_service
+
+        def failing_refresh(slices):
+            raise RuntimeError("rollup refresh failed")
+
+        monkeypatch.setattr(bulk_transaction_service, "refresh_slices", failing_refresh)
+        txn = Transaction(
+            user=account.user,
+            account=account,
+            category=food,
+            amount=Decimal("5.00"),
+            date=date(2024, 1, 10),
+            description="Import",
+            transaction_type="debit",
+        )
+
+        with pytest.raises(RuntimeError):
+            bulk_create_import_transactions(account, [txn])
+
+        account.refresh_from_db()
+        assert not Transaction.objects.filter(account=account).exists()
+        assert account.balance == Decimal("5000.00")
+
+
+class TestRollupConcurrency:
+    def test_refresh_locks_touched_accounts_before_regrouping(self, account, other_account, food, monkeypatch):
+        _txn(account, food, "10.00", date(2024, 3, 5))
+        locked = []
+        monkeypatch.setattr(
+            monthly_rollup, "_lock_accounts", lambda accounts: locked.append(sorted(a.id for a in accounts))
+        )
+
+        refresh_slices([(account.id, date(2024, 3, 1)), (other_account.id, date(2024, 3, 1))])
+
+        assert locked == [sorted([account.id, other_account.id])]
+        assert _rollup(account, food, date(2024, 3, 1)).amount == Decimal("10.00")
+
+    @pytest.mark.parametrize("categorized", [True, False])
+    def test_duplicate_rollup_key_rejected(self, account, food, categorized):
+        category = food if categorized else None
+        _txn(account, category, "10.00", date(2024, 3, 5))
+        existing = TransactionMonthlyRollup.objects.get(account=account, month=date(2024, 3, 1))
+        existing.pk = None
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            existing.save()
+
+
+class TestSplitMonthRange:
+    def test_whole_months_only(self):
+        assert split_month_range(date(2024, 1, 1), date(2024, 3, 31)) == ((date(2024, 1, 1), date(2024, 3, 1)), [])
+
+    def test_partial_edges(self):
+        assert split_month_range(date(2024, 1, 15), date(2024, 4, 10)) == (
+            (date(2024, 2, 1), date(2024, 3, 1)),
+            [(date(2024, 1, 15), date(2024, 1, 31)), (date(2024, 4, 1), date(2024, 4, 10))],
+        )
+
+    def test_within_one_month(self):
+        assert split_month_range(date(2024, 2, 3), date(2024, 2, 20)) == (None, [(date(2024, 2, 3), date(2024, 2, 20))])
+
+
+class TestAggregateAmounts:
+    def test_matches_transactions_for_partial_range(self, account, food, travel):
+        for month in (1, 2, 3, 4):
+            _txn(account, food, "10.00", date(2024, month, 5))
+            _txn(account, travel, "7.25", date(2024, month, 25))
+            _txn(account, food, "99.00", date(2024, month, 6), transaction_type="credit")
+
+        start, end = date(2024, 1, 20), date(2024, 4, 10)
+        scope = Q(user=account.user)
+        expected = Transaction.objects.filter(scope, date__gte=start, date__lte=end).filter(get_expense_filter())
+
+        total, count = aggregate_amounts(scope, start, end, get_expense_filter())[()]
+
+        assert total == sum(txn.amount for txn in expected)
+        assert count == expected.count()
+
+    def test_group_by_month_uses_single_query_for_whole_months(self, account, food, django_assert_num_queries):
+        _txn(account, food, "10.00", date(2024, 1, 5))
+        _txn(account, food, "12.00", date(2024, 2, 5))
+
+        with django_assert_num_queries(1):
+            rows = aggregate_amounts(
+                Q(user=account.user), date(2024, 1, 1), date(2024, 2, 29), get_expense_filter(), group_by=("month",)
+            )
+
+        assert rows == {
+            (date(2024, 1, 1),): (Decimal("10.00"), 1),
+            (date(2024, 2, 1),): (Decimal("12.00"), 1),
+        }
+
+
+class TestRebuildCommand:
+    def test_check_reports_drift_and_fix_repairs(self, account, food):
+        txn = _txn(account, food, "10.00", date(2024, 3, 5))
+        Transaction.objects.filter(pk=txn.pk).update(amount=Decimal("11.00"))
+
+        with pytest.raises(CommandError):
+            call_command("rebuild_transaction_rollups", "--check", user_id=account.user_id)
+
+        call_command("rebuild_transaction_rollups", "--check", "--fix", user_id=account.user_id)
+
+        assert check_rollup_consistency(account.user_id) == []
+        assert _rollup(account, food, date(2024, 3, 1)).amount == Decimal("11.00")
@@ -4,10 +4,19 @@ from datetime import date
 from decimal import Decimal
 
 import pytest
+from rest_framework.test import APIClient
 
+from apps.core.services.background_jobs import background_jobs
 from apps.financial_account.models import FinancialAccount
 from apps.richtato_user.models import User
-from apps.transaction.models import CategoryKeyword, RecategorizationTask, Transaction, TransactionCategory
+from apps.transaction.models import (
+    CategoryKeyword,
+    RecategorizationTask,
+    Transaction,
+    TransactionCategory,
+    TransactionMonthlyRollup,
+)
+from apps.transaction.services.monthly_rollup import check_rollup_consistency
 from apps.transaction.services.recategorization_service import RecategorizationService
 
 
@@ -88,3 +97,131 @@ class TestRecategorizationService:
         assert stats["unmatched"] == 1
         txn.refresh_from_db()
         assert txn.categorization_status == "uncategorized"
+
+
+class TestSetBasedRecategorization:
+    @pytest.fixture
+    def rules(self, user):
+        CategoryKeyword.objects.filter(user=user).delete()
+        coffee = TransactionCategory.objects.create(user=user, name="Coffee", slug="coffee-recat", type="expense")
+        dining = TransactionCategory.objects.create(user=user, name="Dining", slug="dining-recat", type="expense")
+        other = TransactionCategory.objects.create(user=user, name="Other", slug="other-recat", type="expense")
+        CategoryKeyword.objects.create(user=user, category=coffee, keyword="zzqbean", match_count=5)
+        CategoryKeyword.objects.create(user=user, category=dining, keyword="zzqcafe", match_count=1)
+        CategoryKeyword.objects.create(user=user, category=other, keyword="50%_off")
+        return {"coffee": coffee, "dining": dining, "other": other}
+
+    def _seed(self, user, account, rules):
+        descriptions = [
+            "ZZQBEAN ZZQCAFE DOWNTOWN",  # both match; higher match_count wins
+            "zzqcafe corner",
+            "Store 50%_OFF sale",
+            "Store 50x off sale",  # LIKE wildcards in keywords must be literal
+            "UNKNOWN MERCHANT",
+        ]
+        txns = [_create_uncategorized_txn(user, account, d) for d in descriptions]
+        # Already on the winning category: counted as unchanged.
+        Transaction.objects.filter(pk=txns[1].pk).update(category=rules["dining"])
+        # Unmatched with a real category: reset only when keep_existing is off.
+        Transaction.objects.filter(pk=txns[4].pk).update(category=rules["other"])
+        return txns
+
+    def _snapshot(self, user):
+        return list(
+            Transaction.objects.filter(user=user)
+            .order_by("id")
+            .values_list("description", "category_id", "categorization_status")
+        )
+
+    @pytest.mark.parametrize("keep_existing", [True, False])
+    def test_matches_python_path(self, user, account, rules, keep_existing):
+        self._seed(user, account, rules)
+
+        seeded = list(Transaction.objects.filter(user=user).values_list("id", "category_id", "categorization_status"))
+
+        python_task = RecategorizationTask.objects.create(user=user, keep_existing_for_unmatched=keep_existing)
+        python_stats = RecategorizationService().recategorize_all_transactions(python_task, set_based=False)
+        python_rows = self._snapshot(user)
+
+        for pk, category_id, status in seeded:
+            Transaction.objects.filter(pk=pk).update(category_id=category_id, categorization_status=status)
+
+        sql_task = RecategorizationTask.objects.create(user=user, keep_existing_for_unmatched=keep_existing)
+        sql_stats = RecategorizationService().recategorize_all_transactions(sql_task, set_based=True)
+
+        assert sql_stats == python_stats
+        assert self._snapshot(user) == python_rows
+
+        sql_task.refresh_from_db()
+        assert sql_task.status == "completed"
+        assert sql_task.processed_count == 5
+        assert sql_task.updated_count == sql_stats["updated"]
+
+    def test_priority_and_literal_wildcards(self, user, account, rules):
+        txns = self._seed(user, account, rules)
+
+        task = RecategorizationTask.objects.create(user=user, keep_existing_for_unmatched=True)
+        stats = RecategorizationService().recategorize_all_transactions(task, set_based=True)
+
+        categories = dict(Transaction.objects.filter(user=user).values_list("id", "category_id"))
+        assert categories[txns[0].pk] == rules["coffee"].id
+        assert categories[txns[2].pk] == rules["other"].id
+        assert categories[txns[3].pk] != rules["other"].id
+        assert stats == {"total": 5, "processed": 5, "updated": 2, "unchanged": 3, "unmatched": 2}
+
+    def test_updates_flow_class_and_rollups(self, user, account):
+        CategoryKeyword.objects.filter(user=user).delete()
+        brokerage = TransactionCategory.objects.create(
+            user=user, name="Brokerage", slug="brokerage-recat", type="investment"
+        )
+        CategoryKeyword.objects.create(user=user, category=brokerage, keyword="zzqinvest")
+        txn = _create_uncategorized_txn(user, account, "ZZQINVEST TRANSFER")
+
+        task = RecategorizationTask.objects.create(user=user, keep_existing_for_unmatched=True)
+        RecategorizationService().recategorize_all_transactions(task, set_based=True)
+
+        txn.refresh_from_db()
+        assert txn.category_id == brokerage.id
+        assert txn.flow_class == "investment"
+        rollup = TransactionMonthlyRollup.objects.get(account=account, category=brokerage)
+        assert rollup.flow_class == "investment"
+        assert check_rollup_consistency(user.id) == []
+
+
+class TestRecategorizeEndpoint:
+    @pytest.fixture(autouse=True)
+    def _clear_background_jobs(self):
+        background_jobs.clear()
+        yield
+        background_jobs.clear()
+
+    @pytest.fixture
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_queues_task_and_reports_timings(self, api_client, user, account, grocery_category, grocery_keyword):
+        _create_uncategorized_txn(user, account, "XYZZY_RECATEGORIZE_TEST STORE")
+
+        response = api_client.post("/api/v1/transactions/recategorize/", {}, format="json")
+        assert response.status_code == 201
+        task_id = response.data["task_id"]
+        assert background_jobs.pending_count == 1
+
+        assert background_jobs.run_pending() == 1
+
+        progress = api_client.get(f"/api/v1/transactions/recategorize/{task_id}/").data
+        assert progress["status"] == "completed"
+        assert progress["updated"] == 1
+        assert progress["queue_wait_seconds"] >= 0
+        assert progress["run_seconds"] >= 0
+
+    def test_rejects_when_pool_is_full(self, api_client, user, settings):
+        settings.BACKGROUND_JOB_QUEUE_SIZE = 0
+
+        response = api_client.post("/api/v1/transactions/recategorize/", {}, format="json")
+
+        assert response.status_code == 503
+        task = RecategorizationTask.objects.get(pk=response.data["task_id"])
+        assert task.status == "failed"
@@ -496,3 +496,301 @@ class TestCrossAccountSignals:
         second_account.refresh_from_db()
         assert account.balance == Decimal("4500.00")
         assert second_account.balance == Decimal("3000.00")
+
+
+class TestDeferredRecalculation:
+    """With deferred recalculation, signals only queue markers until flushed."""
+
+    @pytest.fixture(autouse=True)
+    def deferred(self, db, settings):
+        from apps.transaction.services.balance_recalculation_queue import balance_recalculation_queue
+
+        settings.DEFER_BALANCE_RECALCULATION = True
+        balance_recalculation_queue.drain()
+        yield
+        balance_recalculation_queue.drain()
+
+    def test_anchor_updates_immediately_history_after_flush(self, account, django_capture_on_commit_callbacks):
+        from apps.transaction.services.balance_recalculation_queue import flush_balance_recalculations
+
+        d = date(2025, 3, 1)
+        with django_capture_on_commit_callbacks(execute=True):
+            Transaction.objects.create(
+                user=account.user,
+                account=account,
+                date=d,
+                amount=Decimal("100.00"),
+                transaction_type="debit",
+                description="Deferred",
+            )
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("4900.00")
+        assert not AccountBalanceHistory.objects.filter(account=account).exists()
+
+        assert flush_balance_recalculations() == 1
+        assert AccountBalanceHistory.objects.get(account=account, date=d).balance == Decimal("4900.00")
+
+    def test_many_edits_coalesce_into_one_recompute(self, account, django_capture_on_commit_callbacks, monkeypatch):
+        from apps.transaction import signals
+        from apps.transaction.services.balance_recalculation_queue import (
+            balance_recalculation_queue,
+            flush_balance_recalculations,
+        )
+
+        base = date(2025, 3, 1)
+        with django_capture_on_commit_callbacks(execute=True):
+            txns = [
+                Transaction.objects.create(
+                    user=account.user,
+                    account=account,
+                    date=base + timedelta(days=i),
+                    amount=Decimal("10.00"),
+                    transaction_type="debit",
+                    description=f"Edit {i}",
+                )
+                for i in range(5)
+            ]
+            for txn in txns:
+                txn.amount = Decimal("20.00")
+                txn.save()
+
+        assert balance_recalculation_queue.pending_count == 1
+
+        calls = []
+        original = signals.update_balances_from_date
+
+        def counted(acct, from_date):
+            calls.append(from_date)
+            return original(acct, from_date)
+
+        monkeypatch.setattr(signals, "update_balances_from_date", counted)
+        flush_balance_recalculations()
+
+        assert calls == [base]
+        assert AccountBalanceHistory.objects.get(account=account, date=base).balance == Decimal("4980.00")
+        assert AccountBalanceHistory.objects.get(account=account, date=base + timedelta(days=4)).balance == Decimal(
+            "4900.00"
+        )
+
+    def test_follow_up_markers_merge_into_one_recompute(self, account, monkeypatch):
+        from apps.transaction import signals
+        from apps.transaction.models import PendingBalanceRecalculation
+        from apps.transaction.services.balance_recalculation_queue import (
+            balance_recalculation_queue,
+            flush_balance_recalculations,
+        )
+
+        early = date(2025, 3, 1)
+        late = date(2025, 3, 10)
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=late,
+            amount=Decimal("10.00"),
+            transaction_type="debit",
+            description="First marker",
+        )
+        AccountBalanceHistory.objects.create(account=account, date=date(2025, 3, 5), balance=Decimal("1.00"))
+        # What an edit files when the account's marker is locked by a running recompute.
+        PendingBalanceRecalculation.objects.create(
+            account=account, from_date=early, orphan_dates=[date(2025, 3, 5).isoformat()]
+        )
+        assert balance_recalculation_queue.pending_count == 1
+
+        calls = []
+        original = signals.update_balances_from_date
+
+        def counted(acct, from_date):
+            calls.append(from_date)
+            return original(acct, from_date)
+
+        monkeypatch.setattr(signals, "update_balances_from_date", counted)
+
+        assert flush_balance_recalculations() == 1
+        assert calls == [early]
+        assert not PendingBalanceRecalculation.objects.filter(account=account).exists()
+        assert not AccountBalanceHistory.objects.filter(account=account, date=date(2025, 3, 5)).exists()
+
+    def test_delete_removes_orphaned_history_on_flush(self, account, django_capture_on_commit_callbacks):
+        from apps.transaction.services.balance_recalculation_queue import flush_balance_recalculations
+
+        d1 = date(2025, 3, 1)
+        d2 = date(2025, 3, 2)
+        with django_capture_on_commit_callbacks(execute=True):
+            Transaction.objects.create(
+                user=account.user,
+                account=account,
+                date=d1,
+                amount=Decimal("50.00"),
+                transaction_type="debit",
+                description="Keep",
+            )
+            doomed = Transaction.objects.create(
+                user=account.user,
+                account=account,
+                date=d2,
+                amount=Decimal("25.00"),
+                transaction_type="debit",
+                description="Delete",
+            )
+        flush_balance_recalculations()
+        assert AccountBalanceHistory.objects.filter(account=account, date=d2).exists()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            doomed.delete()
+        flush_balance_recalculations()
+
+        assert not AccountBalanceHistory.objects.filter(account=account, date=d2).exists()
+        assert AccountBalanceHistory.objects.get(account=account, date=d1).balance == Decimal("4950.00")
+
+    def test_markers_survive_a_worker_restart(self, account):
+        from apps.transaction.services.balance_recalculation_queue import BalanceRecalculationQueue
+
+        d = date(2025, 3, 1)
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=d,
+            amount=Decimal("100.00"),
+            transaction_type="debit",
+            description="Before restart",
+        )
+
+        assert BalanceRecalculationQueue().flush() == 1
+        assert AccountBalanceHistory.objects.get(account=account, date=d).balance == Decimal("4900.00")
+
+    def test_management_command_processes_markers(self, account):
+        from django.core.management import call_command
+
+        from apps.transaction.services.balance_recalculation_queue import balance_recalculation_queue
+
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=date(2025, 3, 1),
+            amount=Decimal("100.00"),
+            transaction_type="debit",
+            description="Startup flush",
+        )
+
+        call_command("flush_balance_recalculations")
+
+        assert balance_recalculation_queue.pending_count == 0
+        assert AccountBalanceHistory.objects.filter(account=account, date=date(2025, 3, 1)).exists()
+
+    def test_failed_recompute_keeps_marker(self, account, monkeypatch):
+        from apps.transaction import signals
+        from apps.transaction.services.balance_recalculation_queue import (
+            balance_recalculation_queue,
+            flush_balance_recalculations,
+        )
+
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=date(2025, 3, 1),
+            amount=Decimal("100.00"),
+            transaction_type="debit",
+            description="Retry",
+        )
+
+        def failing_update(acct, from_date):
+            raise RuntimeError("database went away")
+
+        monkeypatch.setattr(signals, "update_balances_from_date", failing_update)
+
+        assert flush_balance_recalculations() == 0
+        assert balance_recalculation_queue.pending_count == 1
+
+    def test_account_delete_leaves_no_marker(self, account):
+        from apps.transaction.services.balance_recalculation_queue import balance_recalculation_queue
+
+        Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=date(2025, 3, 1),
+            amount=Decimal("100.00"),
+            transaction_type="debit",
+            description="Cascade",
+        )
+        balance_recalculation_queue.drain()
+
+        account.delete()
+
+        assert balance_recalculation_queue.pending_count == 0
+
+
+class TestTrackedOriginalValues:
+    """Loaded transactions carry original values so updates skip the re-fetch."""
+
+    def _create(self, account, day, amount="100.00", txn_type="debit"):
+        return Transaction.objects.create(
+            user=account.user,
+            account=account,
+            date=day,
+            amount=Decimal(amount),
+            transaction_type=txn_type,
+            description="Tracked",
+        )
+
+    def test_update_does_not_refetch_row(self, account):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        created = self._create(account, date(2025, 4, 1))
+        txn = Transaction.objects.get(pk=created.pk)
+        txn.amount = Decimal("250.00")
+
+        with CaptureQueriesContext(connection) as ctx:
+            txn.save()
+
+        refetches = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "transaction"' in q["sql"] and '"transaction"."id" =' in q["sql"]
+        ]
+        assert refetches == []
+        account.refresh_from_db()
+        assert account.balance == Decimal("4750.00")
+
+    def test_repeated_saves_on_same_instance_use_latest_values(self, account):
+        txn = self._create(account, date(2025, 4, 1))
+        txn.amount = Decimal("300.00")
+        txn.save()
+        txn.amount = Decimal("50.00")
+        txn.save()
+
+        account.refresh_from_db()
+        assert account.balance == Decimal("4950.00")
+        assert txn.original_signed_amount == Decimal("-50.00")
+
+    def test_bulk_update_applies_deltas_without_per_row_lookups(self, account):
+        from apps.transaction.services.bulk_transaction_service import bulk_update_transactions
+
+        d1, d2, d3 = date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)
+        first = self._create(account, d1)
+        second = self._create(account, d2, amount="40.00", txn_type="credit")
+        account.refresh_from_db()
+        assert account.balance == Decimal("4940.00")
+
+        txns = list(Transaction.objects.filter(pk__in=[first.pk, second.pk]).order_by("date"))
+        txns[0].amount = Decimal("150.00")
+        txns[1].date = d3
+
+        deltas = bulk_update_transactions(txns, ["amount", "date"])
+
+        assert deltas[account.pk].net_change == Decimal("-50.00")
+        assert deltas[account.pk].from_date == d1
+        account.refresh_from_db()
+        assert account.balance == Decimal("4890.00")
+        assert not AccountBalanceHistory.objects.filter(account=account, date=d2).exists()
+        assert AccountBalanceHistory.objects.get(account=account, date=d1).balance == Decimal("4850.00")
+        assert AccountBalanceHistory.objects.get(account=account, date=d3).balance == Decimal("4890.00")
+
+    def test_compute_balance_deltas_requires_loaded_instances(self, account):
+        from apps.transaction.services.bulk_transaction_service import compute_balance_deltas
+
+        unsaved = Transaction(user=account.user, account=account, date=date(2025, 4, 1), amount=Decimal("1.00"))
+        with pytest.raises(ValueError):
+            compute_balance_deltas([unsaved])
@@ -159,3 +159,58 @@ class TestDeleteTransaction:
 
         service.delete_transaction(tx)
         assert not AccountBalanceHistory.objects.filter(account=account, date=today).exists()
+
+
+class TestRunningBalances:
+    """Running balances are windowed over the page instead of the whole account."""
+
+    def _seed(self, account, count):
+        from datetime import timedelta
+
+        from apps.transaction.models import Transaction
+
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user=account.user,
+                    account=account,
+                    date=date(2024, 1, 1) + timedelta(days=i // 3),
+                    amount=Decimal(f"{i + 1}.{i % 100:02d}"),
+                    transaction_type="credit" if i % 4 == 0 else "debit",
+                    description=f"Row {i}",
+                )
+                for i in range(count)
+            ]
+        )
+
+    def _expected(self, account):
+        from apps.transaction.models import Transaction
+
+        running = Decimal("0")
+        expected = {}
+        for txn in Transaction.objects.filter(account=account).order_by("date", "created_at", "id"):
+            running += txn.signed_amount
+            expected[txn.id] = running
+        return expected
+
+    def test_matches_full_cumulative_sum_for_every_page(self, service, account):
+        self._seed(account, 37)
+        expected = self._expected(account)
+        queryset = service.get_user_transactions(user=account.user, account=account)
+
+        for start in range(0, 37, 10):
+            page = list(queryset[start : start + 10])
+            assert service.get_running_balances(account, page) == {txn.id: expected[txn.id] for txn in page}
+
+    def test_query_count_independent_of_account_size(self, service, account):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._seed(account, 300)
+        page = list(service.get_user_transactions(user=account.user, account=account)[100:150])
+
+        with CaptureQueriesContext(connection) as ctx:
+            balances = service.get_running_balances(account, page)
+
+        assert len(balances) == 50
+        assert len(ctx.captured_queries) == 2
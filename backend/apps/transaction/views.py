@@ -2,7 +2,9 @@
 
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import partial
 
+from django.utils import timezone
 from loguru import logger
 from rest_framework import status
 from rest_framework.authentication import BasicAuthentication, SessionAuthentication
@@ -10,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.utils.cursor_pagination import get_cached_count, is_cursor_mode, paginate_by_cursor
 from apps.core.utils.date_params import parse_date_range_params
 from apps.financial_account.services.account_service import AccountService
 from apps.transaction.models import CategoryKeyword
@@ -164,7 +167,11 @@ class TransactionListCreateAPIView(APIView):
         self.account_service = AccountService()
 
     def get(self, request):
-        """List transactions with optional filters and pagination."""
+        """List transactions with optional filters and pagination.
+
+        Pass ``pagination=cursor`` (and then ``cursor=<next_cursor>``) for
+        keyset pagination; otherwise ``page``/``page_size`` offsets are used.
+        """
         from apps.household.scope import get_scope_user_ids
 
         account_id = request.query_params.get("account_id")
@@ -215,15 +222,20 @@ class TransactionListCreateAPIView(APIView):
                 category=category,
                 transaction_type=transaction_type,
             )
+
+        if is_cursor_mode(request.query_params):
+            return self._cursor_page_response(request, queryset, account, page_size)
+
         total_count = queryset.count()
         start = (page - 1) * page_size
         end = start + page_size
-        page_slice = queryset[start:end]
-        serializer = TransactionSerializer(page_slice, many=True)
+        page_transactions = list(queryset[start:end])
+        serializer = TransactionSerializer(page_transactions, many=True)
         rows = serializer.data
         if account is not None:
             rows = self._attach_account_running_balances(
                 account=account,
+                transactions=page_transactions,
                 rows=list(rows),
             )
 
@@ -237,8 +249,32 @@ class TransactionListCreateAPIView(APIView):
             }
         )
 
-    def _attach_account_running_balances(self, *, account, rows: list[dict]) -> list[dict]:
-        running_map = self._compute_running_balance_map(account)
+    def _cursor_page_response(self, request, queryset, account, page_size: int) -> Response:
+        try:
+            cursor_page = paginate_by_cursor(queryset, request.query_params.get("cursor"), page_size)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = TransactionSerializer(cursor_page.items, many=True).data
+        if account is not None:
+            rows = self._attach_account_running_balances(
+                account=account,
+                transactions=cursor_page.items,
+                rows=list(rows),
+            )
+
+        return Response(
+            {
+                "transactions": rows,
+                "page_size": page_size,
+                "next_cursor": cursor_page.next_cursor,
+                "has_next": cursor_page.has_next,
+                "total_count": get_cached_count(queryset),
+            }
+        )
+
+    def _attach_account_running_balances(self, *, account, transactions, rows: list[dict]) -> list[dict]:
+        running_map = self.transaction_service.get_running_balances(account, transactions)
         for row in rows:
             transaction_id = row.get("id")
             if transaction_id is None:
@@ -255,20 +291,6 @@ class TransactionListCreateAPIView(APIView):
             row["running_balance_diff"] = str(diff)
         return rows
 
-    def _compute_running_balance_map(self, account) -> dict[int, Decimal]:
-        running_map: dict[int, Decimal] = {}
-        running_total = Decimal("0")
-        transactions = self.transaction_service.get_user_transactions(user=account.user, account=account).order_by(
-            "date", "created_at", "id"
-        )
-        for transaction in transactions:
-            signed_amount = transaction.amount
-            if transaction.transaction_type == "debit":
-                signed_amount = -signed_amount
-            running_total = (running_total + signed_amount).quantize(Decimal("0.01"))
-            running_map[transaction.id] = running_total
-        return running_map
-
     @staticmethod
     def _parse_optional_decimal(value) -> Decimal | None:
         if value in (None, ""):
@@ -740,12 +762,9 @@ class RecategorizeTransactionsAPIView(APIView):
 
     def post(self, request):
         """Start a bulk recategorization task."""
-        import threading
-
+        from apps.core.services.background_jobs import BackgroundJobQueueFull, background_jobs
         from apps.transaction.models import RecategorizationTask
-        from apps.transaction.services.recategorization_service import (
-            RecategorizationService,
-        )
+        from apps.transaction.services.recategorization_service import run_recategorization_job
 
         keep_existing = request.data.get("keep_existing_for_unmatched", True)
 
@@ -767,17 +786,22 @@ class RecategorizeTransactionsAPIView(APIView):
             # Create new task
             task = RecategorizationTask.objects.create(user=request.user, keep_existing_for_unmatched=keep_existing)
 
-            # Start async processing in a background thread
-            def process_recategorization():
-                service = RecategorizationService()
-                try:
-                    service.recategorize_all_transactions(task)
-                except Exception as e:
-                    logger.error(f"Background recategorization failed: {str(e)}")
-
-            thread = threading.Thread(target=process_recategorization)
-            thread.daemon = True
-            thread.start()
+            # Run on the shared, bounded background pool
+            try:
+                background_jobs.submit(
+                    request.user.id,
+                    partial(run_recategorization_job, task.id),
+                    name=f"recategorize:{task.id}",
+                )
+            except BackgroundJobQueueFull as e:
+                task.status = "failed"
+                task.error_message = str(e)
+                task.completed_at = timezone.now()
+                task.save(update_fields=["status", "error_message", "completed_at"])
+                return Response(
+                    {"error": str(e), "task_id": task.id},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
 
             return Response({"task_id": task.id}, status=status.HTTP_201_CREATED)
 
@@ -804,6 +828,8 @@ class RecategorizeTransactionsAPIView(APIView):
                     "updated": task.updated_count,
                     "progress_percent": round(progress_percent, 2),
                     "error": task.error_message if task.error_message else None,
+                    "queue_wait_seconds": task.queue_wait_seconds,
+                    "run_seconds": task.run_seconds,
                 }
             )
 
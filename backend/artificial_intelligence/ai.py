@@ -1,5 +1,7 @@
 import os
+import random
 import re
+import time
 from abc import ABC, abstractmethod
 
 import httpx
@@ -8,6 +10,7 @@ from dotenv import load_dotenv
 from loguru import logger
 
 # Optional imports
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
 from openai import OpenAI as OpenAIClient
 
 from apps.richtato_user.models import User
@@ -26,22 +29,54 @@ class BaseAI(ABC):
         pass
 
 
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx.
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
 class OpenAI(BaseAI):
     def __init__(self):
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("Missing OPENAI_API_KEY in environment or .env file")
-        # Use a custom httpx.Client to avoid environment-specific 'proxies' kw issues
-        self.client = OpenAIClient(api_key=api_key, http_client=httpx.Client())
+        # OPENAI_BASE_URL points at a proxy or a local stub server for offline testing
+        base_url = os.environ.get("OPENAI_BASE_URL") or None
+        # Use a custom httpx.Client to avoid environment-specific 'proxies' kw issues.
+        # The client is thread-safe, so concurrent batch dispatch shares it.
+        self.client = OpenAIClient(api_key=api_key, base_url=base_url, http_client=httpx.Client(), max_retries=0)
         self.model_name = "gpt-4o-mini"
+        self.max_retries = int(os.environ.get("OPENAI_MAX_RETRIES", "4"))
+        self.backoff_base_seconds = float(os.environ.get("OPENAI_BACKOFF_SECONDS", "1"))
+        self.backoff_max_seconds = 30.0
 
     def _ask(self, prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        content = response.choices[0].message.content or ""
-        return content.strip()
+        attempt = 0
+        while True:
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+                content = response.choices[0].message.content or ""
+                return content.strip()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                attempt += 1
+                logger.warning(f"OpenAI request failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Honor Retry-After when the server sends one, else exponential backoff with jitter."""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max_seconds)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base_seconds * (2**attempt), self.backoff_max_seconds)
+        return delay * random.uniform(0.5, 1.0)
 
     def one_shot_prompt(self, prompt: str) -> str:
         """Execute a single prompt and return the response."""
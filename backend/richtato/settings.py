@@ -46,6 +46,61 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 RESEND_FROM_EMAIL = os.getenv("RESEND_FROM_EMAIL", "")
 
+# Balance history recalculation. When deferred, transaction signals write a
+# dirty marker row per account and a background thread coalesces the recomputes.
+# Markers are stored in the database, so a recycled worker's pending recomputes
+# are picked up by the next worker or by `manage.py flush_balance_recalculations`
+# (run at container start).
+DEFER_BALANCE_RECALCULATION = os.getenv("DEFER_BALANCE_RECALCULATION", "False").lower() in ("true", "1", "yes")
+BALANCE_RECALC_INTERVAL_SECONDS = float(os.getenv("BALANCE_RECALC_INTERVAL_SECONDS", "2"))
+
+# Compiled keyword rule cache. Point KEYWORD_RULE_CACHE_ALIAS at a shared cache
+# (e.g. Redis) to share rule sets and invalidations across processes.
+KEYWORD_RULE_CACHE_SIZE = int(os.getenv("KEYWORD_RULE_CACHE_SIZE", "256"))
+KEYWORD_RULE_CACHE_ALIAS = os.getenv("KEYWORD_RULE_CACHE_ALIAS") or None
+
+# Dashboard response cache. Entries are keyed by per-user data versions that
+# writes bump, so the timeout only bounds memory. Versions must be visible to
+# every worker process, so the cache is off unless DASHBOARD_CACHE_ALIAS names
+# a shared cache (e.g. Redis); the default locmem cache is per process.
+DASHBOARD_CACHE_ALIAS = os.getenv("DASHBOARD_CACHE_ALIAS") or "default"
+_DASHBOARD_CACHE_DEFAULT = "True" if os.getenv("DASHBOARD_CACHE_ALIAS") else "False"
+DASHBOARD_CACHE_ENABLED = os.getenv("DASHBOARD_CACHE_ENABLED", _DASHBOARD_CACHE_DEFAULT).lower() in ("true", "1", "yes")
+DASHBOARD_CACHE_TIMEOUT_SECONDS = int(os.getenv("DASHBOARD_CACHE_TIMEOUT_SECONDS", "3600"))
+
+# Parsed statements reused between import preview and commit (per process).
+# Entries expire after the TTL; the oldest are evicted past the total row budget.
+STATEMENT_PARSE_CACHE_ENABLED = os.getenv("STATEMENT_PARSE_CACHE_ENABLED", "True").lower() in ("true", "1", "yes")
+STATEMENT_PARSE_CACHE_TTL_SECONDS = int(os.getenv("STATEMENT_PARSE_CACHE_TTL_SECONDS", "900"))
+STATEMENT_PARSE_CACHE_MAX_ROWS = int(os.getenv("STATEMENT_PARSE_CACHE_MAX_ROWS", "200000"))
+
+# CSV statements at least this large are imported chunk by chunk in one transaction.
+STATEMENT_STREAMING_THRESHOLD_BYTES = int(os.getenv("STATEMENT_STREAMING_THRESHOLD_BYTES", str(25 * 1024 * 1024)))
+STATEMENT_IMPORT_CHUNK_ROWS = int(os.getenv("STATEMENT_IMPORT_CHUNK_ROWS", "10000"))
+
+# PDF statement text extraction: page ranges of longer statements are extracted in
+# a process pool; extracted text is kept per file hash for the parser's helpers.
+PDF_TEXT_EXTRACTION_WORKERS = int(os.getenv("PDF_TEXT_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_TEXT_PARALLEL_MIN_PAGES = int(os.getenv("PDF_TEXT_PARALLEL_MIN_PAGES", "4"))
+PDF_TEXT_CACHE_SIZE = int(os.getenv("PDF_TEXT_CACHE_SIZE", "16"))
+
+# Shared pool for long-running per-user jobs (recategorization, AI, backups).
+# Workers bound concurrent DB connections; the queue rejects work beyond its limits.
+BACKGROUND_JOB_WORKERS = int(os.getenv("BACKGROUND_JOB_WORKERS", "4"))
+BACKGROUND_JOB_QUEUE_SIZE = int(os.getenv("BACKGROUND_JOB_QUEUE_SIZE", "100"))
+BACKGROUND_JOB_MAX_PER_USER = int(os.getenv("BACKGROUND_JOB_MAX_PER_USER", "3"))
+
+# Concurrent OpenAI requests per batch AI categorization run.
+AI_CATEGORIZATION_MAX_IN_FLIGHT = int(os.getenv("AI_CATEGORIZATION_MAX_IN_FLIGHT", "4"))
+# Prompts are filled up to this many estimated tokens, capped at MAX_BATCH_SIZE transactions.
+AI_CATEGORIZATION_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_CATEGORIZATION_PROMPT_TOKEN_BUDGET", "6000"))
+AI_CATEGORIZATION_MAX_BATCH_SIZE = int(os.getenv("AI_CATEGORIZATION_MAX_BATCH_SIZE", "200"))
+
+# Shared cache of AI answers keyed on normalized description + category set.
+AI_CATEGORIZATION_CACHE_ENABLED = os.getenv("AI_CATEGORIZATION_CACHE_ENABLED", "True").lower() in ("true", "1", "yes")
+AI_CATEGORIZATION_CACHE_TTL_DAYS = int(os.getenv("AI_CATEGORIZATION_CACHE_TTL_DAYS", "90"))
+AI_CATEGORIZATION_CACHE_MAX_ENTRIES = int(os.getenv("AI_CATEGORIZATION_CACHE_MAX_ENTRIES", "50000"))
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG", "True").lower() in ("true", "1", "yes")
 
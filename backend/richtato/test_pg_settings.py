@@ -7,3 +7,5 @@ PASSWORD_HASHERS = [
 ]
 
 RUN_DEMO_MAINTENANCE_THREADS = False
+RUN_BALANCE_RECALC_WORKER = False
+RUN_BACKGROUND_JOB_WORKERS = False
@@ -14,3 +14,11 @@ PASSWORD_HASHERS = [
 ]
 
 RUN_DEMO_MAINTENANCE_THREADS = False
+RUN_BALANCE_RECALC_WORKER = False
+RUN_BACKGROUND_JOB_WORKERS = False
+# Cached responses would outlive the per-test database; cache tests enable it explicitly.
+DASHBOARD_CACHE_ENABLED = False
+# Parsed statements would outlive monkeypatched parsers; parse cache tests enable it explicitly.
+STATEMENT_PARSE_CACHE_ENABLED = False
+# Spawning extraction processes per test is slow; parallel extraction tests opt in.
+PDF_TEXT_EXTRACTION_WORKERS = 1
@@ -10,6 +10,7 @@ service nginx start
 cd /app/backend
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
+python manage.py flush_balance_recalculations
 
 exec gunicorn richtato.wsgi:application \
   --bind 127.0.0.1:8000 \